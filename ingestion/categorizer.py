@@ -0,0 +1,285 @@
+"""
+Motor de categorización por palabras clave compilado a partir de master_mapping.csv.
+
+Replica la macro `categorize_transaction` (un `WHEN concepto_norm LIKE '%kw%'` por regla)
+con un autómata Aho-Corasick: una sola pasada por el concepto devuelve todas las
+palabras clave que aparecen y se elige la de mayor prioridad que cumpla la
+regla de signo. El resultado es el mismo string "grupo|categoria|subcategoria|entidad"
+que produce la macro.
+
+Uso:
+    python ingestion/categorizer.py check
+    python ingestion/categorizer.py explain "COMPRA MERCADONA CASTELLON" -23.5
+    python ingestion/categorizer.py version
+"""
+
+import re
+import sys
+import hashlib
+import logging
+import argparse
+import unicodedata
+from collections import deque
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+MAPPING_CSV = BASE_DIR / "transformation" / "seeds" / "master_mapping.csv"
+GOLDEN_CSV = BASE_DIR / "transformation" / "seeds" / "categorization_golden.csv"
+
+# Mismo conjunto que \s en RE2 (BigQuery), para colapsar espacios igual que SQL
+WHITESPACE_RE = re.compile(r"[\t\n\f\r ]+")
+
+INCOME_GROUP = "Ingresos"
+FALLBACK_INCOME = "Ingresos|Otros Ingresos|Sin Clasificar|Desconocido"
+FALLBACK_EXPENSE = "Gastos Variables|Otros Gastos|Sin Clasificar|Desconocido"
+
+RULE_COLUMNS = [
+    "keyword",
+    "priority",
+    "grupo_categoria",
+    "categoria",
+    "subcategoria",
+    "entity_name",
+]
+
+
+def clean_text(value) -> str:
+    """Equivalente a la macro normalize_concepto (concepto_norm en Bronze)."""
+    decomposed = unicodedata.normalize("NFD", str(value).upper())
+    stripped = "".join(
+        ch for ch in decomposed if not unicodedata.category(ch).startswith("M")
+    )
+    return WHITESPACE_RE.sub(" ", stripped).strip()
+
+
+def load_rules(path: Path = MAPPING_CSV) -> pd.DataFrame:
+    """
+    Lee el seed y ordena las reglas como la macro: prioridad ascendente y,
+    a igual prioridad, por keyword (orden determinista en ambos lados).
+    """
+    rules = pd.read_csv(path, dtype=str, keep_default_na=False)
+    rules = rules[rules["keyword"].str.strip() != ""].copy()
+    rules["priority"] = pd.to_numeric(rules["priority"], errors="coerce").fillna(50)
+    rules["priority"] = rules["priority"].astype(int)
+    return rules.sort_values(["priority", "keyword"], kind="stable").reset_index(
+        drop=True
+    )
+
+
+def mapping_version(rules: pd.DataFrame) -> str:
+    """
+    Huella del mapeo. La macro `mapping_version()` de dbt calcula la misma a
+    partir del seed cargado, así Silver sabe si la categoría calculada en la
+    ingesta sigue vigente o hay que recalcularla con la macro.
+    """
+    lines = []
+    for row in rules[RULE_COLUMNS].itertuples(index=False):
+        lines.append("|".join(str(v).strip() for v in row))
+    return hashlib.md5("\n".join(lines).encode("utf-8")).hexdigest()[:16]
+
+
+def _render(value: str) -> str:
+    # En BigQuery las celdas vacías del seed son NULL y Jinja las pinta como 'None'
+    return value if value != "" else "None"
+
+
+class KeywordCategorizer:
+    def __init__(self, rules: pd.DataFrame):
+        self.rules = rules
+        self.version = mapping_version(rules)
+        self.labels = [
+            "|".join(
+                _render(row[col])
+                for col in (
+                    "grupo_categoria",
+                    "categoria",
+                    "subcategoria",
+                    "entity_name",
+                )
+            )
+            for _, row in rules.iterrows()
+        ]
+        self.is_income = (rules["grupo_categoria"] == INCOME_GROUP).to_numpy()
+        self._build([clean_text(kw) for kw in rules["keyword"]])
+
+    @classmethod
+    def from_csv(cls, path: Path = MAPPING_CSV) -> "KeywordCategorizer":
+        return cls(load_rules(path))
+
+    # --- Autómata Aho-Corasick ---
+
+    def _build(self, keywords: list):
+        # Cada nodo: transiciones, enlace de fallo y reglas que terminan en él
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        for rank, keyword in enumerate(keywords):
+            node = 0
+            for ch in keyword:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append(rank)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(ch, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def matches(self, concepto) -> set:
+        """Rangos (posición en el orden de prioridad) de las reglas que aparecen en el texto."""
+        found = set()
+        node = 0
+        for ch in clean_text(concepto):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            if self._out[node]:
+                found.update(self._out[node])
+        return found
+
+    def _best(self, ranks: set) -> tuple[int, int, int]:
+        """Mejor regla para importe > 0, < 0 y = 0 (-1 si ninguna aplica)."""
+        positive = negative = zero = -1
+        for rank in sorted(ranks):
+            if zero < 0:
+                zero = rank
+            if self.is_income[rank]:
+                if positive < 0:
+                    positive = rank
+            elif negative < 0:
+                negative = rank
+            if positive >= 0 and negative >= 0:
+                break
+        return positive, negative, zero
+
+    def categorize(self, concepto, importe) -> str:
+        if concepto is None or (isinstance(concepto, float) and np.isnan(concepto)):
+            ranks = set()
+        else:
+            ranks = self.matches(concepto)
+        positive, negative, zero = self._best(ranks)
+        rank = positive if importe > 0 else negative if importe < 0 else zero
+        if rank >= 0:
+            return self.labels[rank]
+        return FALLBACK_INCOME if importe > 0 else FALLBACK_EXPENSE
+
+    def categorize_series(self, conceptos: pd.Series, importes: pd.Series) -> pd.Series:
+        """
+        Categoriza una columna entera recorriendo cada concepto distinto una sola
+        vez; el signo del importe elige después entre las tres variantes.
+        """
+        codes, uniques = pd.factorize(conceptos, use_na_sentinel=True)
+        labels = np.array(
+            self.labels + [FALLBACK_INCOME, FALLBACK_EXPENSE], dtype=object
+        )
+        fallback_income = len(self.labels)
+        fallback_expense = fallback_income + 1
+
+        # best[i] = (importe > 0, importe < 0, importe = 0) para el concepto i;
+        # la última fila es para conceptos nulos (la macro nunca hace match)
+        best = np.empty((len(uniques) + 1, 3), dtype=np.int64)
+        for i, concepto in enumerate(uniques):
+            best[i] = self._best(self.matches(concepto))
+        best[-1] = (-1, -1, -1)
+        best[:, 0] = np.where(best[:, 0] < 0, fallback_income, best[:, 0])
+        best[:, 1] = np.where(best[:, 1] < 0, fallback_expense, best[:, 1])
+        best[:, 2] = np.where(best[:, 2] < 0, fallback_expense, best[:, 2])
+
+        amounts = importes.to_numpy(dtype=float)
+        sign_col = np.where(amounts > 0, 0, np.where(amounts < 0, 1, 2))
+        chosen = best[codes, sign_col]
+        return pd.Series(labels[chosen], index=conceptos.index, dtype=object)
+
+
+def reference_categorize(rules: pd.DataFrame, concepto, importe) -> str:
+    """Traducción literal del CASE de la macro (regla a regla), para contrastar."""
+    text = clean_text(concepto) if concepto is not None else None
+    for _, row in rules.iterrows():
+        if text is None or clean_text(row["keyword"]) not in text:
+            continue
+        is_income = row["grupo_categoria"] == INCOME_GROUP
+        if (
+            (is_income and importe > 0)
+            or (not is_income and importe < 0)
+            or importe == 0
+        ):
+            return "|".join(
+                _render(row[col])
+                for col in (
+                    "grupo_categoria",
+                    "categoria",
+                    "subcategoria",
+                    "entity_name",
+                )
+            )
+    return FALLBACK_INCOME if importe > 0 else FALLBACK_EXPENSE
+
+
+def check(golden_path: Path = GOLDEN_CSV, mapping_path: Path = MAPPING_CSV) -> int:
+    """Compara motor, referencia y valores esperados del set dorado. Devuelve nº de fallos."""
+    engine = KeywordCategorizer.from_csv(mapping_path)
+    golden = pd.read_csv(golden_path, dtype={"concepto": str}, keep_default_na=False)
+    golden["importe"] = golden["importe"].astype(float)
+
+    wildcards = engine.rules[engine.rules["keyword"].str.contains(r"[%_]", regex=True)]
+    for kw in wildcards["keyword"]:
+        logging.warning(f"⚠️ La keyword '{kw}' contiene comodines de LIKE (% o _)")
+
+    actual = engine.categorize_series(golden["concepto"], golden["importe"])
+    failures = 0
+    for i, row in golden.iterrows():
+        reference = reference_categorize(engine.rules, row["concepto"], row["importe"])
+        if actual[i] != row["expected"] or reference != row["expected"]:
+            failures += 1
+            logging.error(
+                f"❌ '{row['concepto']}' ({row['importe']}): esperado '{row['expected']}', "
+                f"motor '{actual[i]}', referencia '{reference}'"
+            )
+    logging.info(
+        f"🧪 {len(golden) - failures}/{len(golden)} casos OK "
+        f"({len(engine.rules)} reglas, versión {engine.version})"
+    )
+    return failures
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    parser = argparse.ArgumentParser(description="Motor de categorización por keywords")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("check", help="Valida el motor contra el set dorado")
+    explain = sub.add_parser(
+        "explain", help="Muestra las reglas que casan con un concepto"
+    )
+    explain.add_argument("concepto")
+    explain.add_argument("importe", type=float)
+    sub.add_parser("version", help="Huella del mapeo actual")
+    args = parser.parse_args()
+
+    if args.command == "check":
+        sys.exit(1 if check() else 0)
+
+    engine = KeywordCategorizer.from_csv()
+    if args.command == "version":
+        print(engine.version)
+    else:
+        for rank in sorted(engine.matches(args.concepto)):
+            rule = engine.rules.iloc[rank]
+            print(f"  [{rule['priority']}] {rule['keyword']} -> {engine.labels[rank]}")
+        print(engine.categorize(args.concepto, args.importe))
@@ -0,0 +1,287 @@
+"""
+Compactación de la zona de aterrizaje de GCS.
+
+La ingesta deja un objeto pequeño por extracto en `{banco}/{cuenta}/`. Este
+paso los funde en un objeto por banco/cuenta/mes
+(`{banco}/{cuenta}/compacted/AAAA-MM.jsonl|.parquet`), ordenado por fecha y
+sin hash_id repetidos, y borra los deltas ya fundidos.
+
+Al terminar reescribe `_state/landing_manifest.jsonl`, una línea por objeto
+vivo (particiones compactadas y deltas pendientes) con su rango de fechas.
+Bronze lo lee como tabla externa (`bronze_raw.landing_manifest`) para que las
+ejecuciones incrementales solo escaneen los meses de la ventana de lookback
+y los deltas nuevos (macro `landing_files`).
+
+Uso:
+    python ingestion/compaction.py
+    python ingestion/compaction.py --bank BANKINTER --account CARD --dry-run
+    python ingestion/compaction.py --min-age-minutes 30
+"""
+
+import io
+import json
+import logging
+import argparse
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pyarrow.parquet as pq
+from google.api_core.exceptions import NotFound, PreconditionFailed
+
+from main import (
+    GCS_BUCKET_NAME,
+    LANDING_FORMATS,
+    SPOOL_MAX_BYTES,
+    get_storage_client,
+    load_configs,
+    write_landing_file,
+)
+from scheduler import gcs_scheduler
+
+COMPACTED_DIR = "compacted"
+LANDING_MANIFEST_BLOB = "_state/landing_manifest.jsonl"
+
+LANDING_COLUMNS = [
+    "hash_id",
+    "fecha",
+    "concepto",
+    "importe",
+    "entidad",
+    "origen",
+    "categoria_ingesta",
+    "mapping_version",
+]
+FORMAT_BY_EXTENSION = {ext: fmt for fmt, (ext, _) in LANDING_FORMATS.items()}
+
+
+def table_name(bank: str, account: str) -> str:
+    """Nombre de la tabla de bronze_raw (y del modelo bronze) de la cuenta."""
+    return f"{bank}_{account}".lower()
+
+
+def landing_format(blob_name: str):
+    for ext, fmt in FORMAT_BY_EXTENSION.items():
+        if blob_name.endswith(ext):
+            return fmt
+    return None
+
+
+def partition_name(bank, account, month, fmt) -> str:
+    extension, _ = LANDING_FORMATS[fmt]
+    return f"{bank}/{account}/{COMPACTED_DIR}/{month}{extension}"
+
+
+def read_landed(data: bytes, fmt: str) -> pd.DataFrame:
+    """Objeto aterrizado a DataFrame con las columnas de aterrizaje y fecha en texto."""
+    if fmt == "parquet":
+        df = pq.read_table(io.BytesIO(data)).to_pandas()
+        # Columnas de diccionario (categorías) y fecha DATE a texto plano
+        for col in df.columns:
+            if isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype(object)
+        df["fecha"] = pd.to_datetime(df["fecha"]).dt.strftime("%Y-%m-%d")
+    else:
+        df = pd.read_json(io.BytesIO(data), lines=True, dtype=False)
+        if df.empty:
+            return pd.DataFrame(columns=LANDING_COLUMNS)
+    # Los deltas anteriores a la categorización en ingesta no traen sus columnas
+    return df.reindex(columns=LANDING_COLUMNS)
+
+
+def compact_rows(frames) -> pd.DataFrame:
+    """
+    Une los bloques (primero la partición existente, después los deltas en
+    orden de llegada), se queda con la última versión de cada hash_id y
+    ordena por fecha.
+    """
+    df = pd.concat(frames, ignore_index=True)
+    df = df.drop_duplicates("hash_id", keep="last")
+    return df.sort_values(["fecha", "hash_id"], kind="stable", ignore_index=True)
+
+
+def download(blob) -> bytes:
+    return gcs_scheduler.call(blob.download_as_bytes, "download")
+
+
+def upload_partition(bucket, name, df, fmt, generation) -> bool:
+    """Sube la partición solo si nadie la ha cambiado desde que se leyó."""
+    _, content_type = LANDING_FORMATS[fmt]
+    blob = bucket.blob(name)
+    blob.metadata = {
+        "rows": str(len(df)),
+        "min_fecha": df["fecha"].iloc[0],
+        "max_fecha": df["fecha"].iloc[-1],
+    }
+    with tempfile.SpooledTemporaryFile(SPOOL_MAX_BYTES) as out:
+        write_landing_file([df], out, fmt)
+        try:
+            gcs_scheduler.call(
+                lambda: blob.upload_from_file(
+                    out,
+                    content_type=content_type,
+                    rewind=True,
+                    if_generation_match=generation,
+                ),
+                "upload",
+            )
+        except PreconditionFailed:
+            logging.warning(f"⚠️ {name} cambió durante la compactación, se reintentará")
+            return False
+    return True
+
+
+def compact_account(bucket, bank, account, min_age=None, dry_run=False) -> dict:
+    """Funde los deltas de una cuenta en sus particiones mensuales."""
+    prefix = f"{bank}/{account}/"
+    compacted_prefix = f"{prefix}{COMPACTED_DIR}/"
+    blobs = gcs_scheduler.call(lambda: list(bucket.list_blobs(prefix=prefix)), "list")
+
+    partitions = {b.name: b for b in blobs if b.name.startswith(compacted_prefix)}
+    cutoff = datetime.now(timezone.utc) - min_age if min_age else None
+    deltas = sorted(
+        (
+            b
+            for b in blobs
+            if not b.name.startswith(compacted_prefix)
+            and landing_format(b.name)
+            and (cutoff is None or b.updated is None or b.updated <= cutoff)
+        ),
+        # Orden de llegada: ante un hash_id repetido gana el delta más reciente
+        key=lambda b: (b.updated or datetime.min.replace(tzinfo=timezone.utc), b.name),
+    )
+    stats = {"deltas": len(deltas), "partitions": 0, "rows": 0, "duplicates": 0}
+    if not deltas:
+        return stats
+
+    # Filas de los deltas agrupadas por formato y mes
+    by_month = {}
+    for blob in deltas:
+        fmt = landing_format(blob.name)
+        df = read_landed(download(blob), fmt)
+        for month, rows in df.groupby(df["fecha"].str.slice(0, 7), sort=False):
+            by_month.setdefault((fmt, month), []).append(rows)
+
+    merged = []
+    for (fmt, month), frames in sorted(by_month.items()):
+        name = partition_name(bank, account, month, fmt)
+        existing = partitions.get(name)
+        if existing is not None:
+            frames = [read_landed(download(existing), fmt), *frames]
+        rows_in = sum(len(f) for f in frames)
+        df = compact_rows(frames)
+        stats["duplicates"] += rows_in - len(df)
+        stats["rows"] += len(df)
+        stats["partitions"] += 1
+        if dry_run:
+            continue
+        generation = existing.generation if existing is not None else 0
+        if not upload_partition(bucket, name, df, fmt, generation):
+            # Sin todas las particiones escritas no se borra ningún delta
+            return stats
+        merged.append(name)
+
+    if dry_run:
+        return stats
+
+    # Los deltas solo se borran cuando todas sus filas están ya en particiones
+    for blob in deltas:
+        try:
+            gcs_scheduler.call(
+                lambda: blob.delete(if_generation_match=blob.generation), "delete"
+            )
+        except (NotFound, PreconditionFailed):
+            # Ya borrado, o reescrito por una ingesta: se fundirá la próxima vez
+            pass
+    logging.info(
+        f"🗜️ {bank}/{account}: {len(deltas)} deltas -> {len(merged)} particiones "
+        f"({stats['rows']} filas, {stats['duplicates']} duplicadas descartadas)"
+    )
+    return stats
+
+
+def manifest_entries(bucket, bank, account) -> list:
+    """Una entrada por objeto vivo de la cuenta (particiones y deltas pendientes)."""
+    prefix = f"{bank}/{account}/"
+    compacted_prefix = f"{prefix}{COMPACTED_DIR}/"
+    entries = []
+    blobs = gcs_scheduler.call(lambda: list(bucket.list_blobs(prefix=prefix)), "list")
+    for blob in blobs:
+        if not landing_format(blob.name):
+            continue
+        meta = blob.metadata or {}
+        compacted = blob.name.startswith(compacted_prefix)
+        entries.append(
+            {
+                "table_name": table_name(bank, account),
+                "uri": f"gs://{bucket.name}/{blob.name}",
+                "kind": "compacted" if compacted else "delta",
+                "min_fecha": meta.get("min_fecha"),
+                "max_fecha": meta.get("max_fecha"),
+                "rows": int(meta["rows"]) if meta.get("rows") else None,
+                "updated_at": blob.updated.isoformat() if blob.updated else None,
+            }
+        )
+    return entries
+
+
+def write_manifest(bucket, entries: list):
+    payload = "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in entries)
+    blob = bucket.blob(LANDING_MANIFEST_BLOB)
+    gcs_scheduler.call(
+        lambda: blob.upload_from_string(payload, content_type="application/jsonl"),
+        "upload",
+    )
+    logging.info(f"📒 Manifiesto de aterrizaje: {len(entries)} objetos")
+
+
+def compact(bucket, configs, bank=None, account=None, min_age=None, dry_run=False):
+    totals = {"deltas": 0, "partitions": 0, "rows": 0, "duplicates": 0}
+    entries = []
+    for bank_name, accounts in configs.items():
+        for acc_name in accounts:
+            selected = (not bank or bank == bank_name) and (
+                not account or account == acc_name
+            )
+            if selected:
+                stats = compact_account(bucket, bank_name, acc_name, min_age, dry_run)
+                for key, value in stats.items():
+                    totals[key] += value
+            # El manifiesto siempre cubre todas las cuentas
+            entries += manifest_entries(bucket, bank_name, acc_name)
+
+    if dry_run:
+        logging.info(f"🧪 Dry run: {totals}")
+    else:
+        write_manifest(bucket, entries)
+    return totals
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compactación de la zona de aterrizaje"
+    )
+    parser.add_argument("--bank", help="Solo este banco (por defecto, todos)")
+    parser.add_argument("--account", help="Solo esta cuenta (por defecto, todas)")
+    parser.add_argument(
+        "--min-age-minutes",
+        type=float,
+        default=0,
+        help="No fundir deltas más recientes (p. ej. si hay una ingesta en curso)",
+    )
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    if not GCS_BUCKET_NAME:
+        logging.error("❌ Falta GCS_BUCKET_NAME. Verifica tu archivo .env")
+        exit(1)
+
+    min_age = timedelta(minutes=args.min_age_minutes) if args.min_age_minutes else None
+    compact(
+        get_storage_client().bucket(GCS_BUCKET_NAME),
+        load_configs(),
+        args.bank,
+        args.account,
+        min_age,
+        args.dry_run,
+    )
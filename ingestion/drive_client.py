@@ -0,0 +1,96 @@
+import logging
+from typing import Dict, List
+
+from scheduler import drive_scheduler
+
+FOLDER_MIME = "application/vnd.google-apps.folder"
+
+# Metadatos que se piden en el listado de PENDING: con ellos ya no hace falta
+# un files().get por archivo antes de descargarlo
+FILE_FIELDS = "id, name, mimeType, md5Checksum, modifiedTime, size"
+FOLDER_FIELDS = "id, name"
+
+# Máximo de la API de Drive por página y por petición batch
+PAGE_SIZE = 1000
+BATCH_LIMIT = 100
+
+
+def children_query(parent_id: str, folders_only: bool = False) -> str:
+    q = f"'{parent_id}' in parents and trashed=false"
+    if folders_only:
+        q += f" and mimeType='{FOLDER_MIME}'"
+    return q
+
+
+def _list_request(drive_service, q, fields, page_token=None):
+    return drive_service.files().list(
+        q=q,
+        fields=f"nextPageToken, files({fields})",
+        pageSize=PAGE_SIZE,
+        pageToken=page_token,
+    )
+
+
+def list_files(drive_service, q: str, fields: str = FOLDER_FIELDS) -> List[dict]:
+    """files().list completo: sigue nextPageToken hasta la última página."""
+    files, page_token = [], None
+    while True:
+        request = _list_request(drive_service, q, fields, page_token)
+        response = drive_scheduler.call(request.execute, "files.list")
+        files.extend(response.get("files", []))
+        page_token = response.get("nextPageToken")
+        if not page_token:
+            return files
+
+
+def list_children_many(
+    drive_service, parent_ids, fields: str = FOLDER_FIELDS, folders_only=False
+) -> Dict[str, List[dict]]:
+    """
+    Hijos de varias carpetas con el endpoint batch de Drive: hasta BATCH_LIMIT
+    listados por petición HTTP. Las carpetas con más de una página se vuelven
+    a pedir (en batch) con su nextPageToken hasta agotarlas.
+    """
+    results = {parent_id: [] for parent_id in parent_ids}
+    tokens = {parent_id: None for parent_id in results}
+
+    def run_batch(parent_ids):
+        # Las respuestas se acumulan aparte: si el batch falla y se reintenta
+        # entero, no quedan resultados duplicados
+        responses, errors = {}, []
+
+        def callback(request_id, response, exception):
+            if exception is not None:
+                errors.append(exception)
+            else:
+                responses[request_id] = response
+
+        batch = drive_service.new_batch_http_request(callback=callback)
+        for parent_id in parent_ids:
+            q = children_query(parent_id, folders_only)
+            batch.add(
+                _list_request(drive_service, q, fields, tokens[parent_id]),
+                request_id=parent_id,
+            )
+        batch.execute()
+        if errors:
+            raise errors[0]
+        return responses
+
+    while tokens:
+        next_tokens = {}
+        pending = list(tokens)
+        for start in range(0, len(pending), BATCH_LIMIT):
+            chunk = pending[start : start + BATCH_LIMIT]
+            # Cada sub-petición del batch cuenta para la cuota de Drive
+            responses = drive_scheduler.call(
+                lambda: run_batch(chunk), "batch files.list", cost=len(chunk)
+            )
+            for parent_id, response in responses.items():
+                results[parent_id].extend(response.get("files", []))
+                if response.get("nextPageToken"):
+                    next_tokens[parent_id] = response["nextPageToken"]
+        tokens = next_tokens
+
+    logging.debug(f"📂 Listadas {len(results)} carpetas en batch")
+    return results
@@ -0,0 +1,234 @@
+"""
+Índice de hash_id ya ingeridos por banco/cuenta.
+
+Guarda los primeros 64 bits de cada hash_id (SHA256) en un array ordenado de
+uint64 (8 bytes por transacción) para filtrar, antes de subir a GCS, las filas
+que ya llegaron en extractos anteriores (o que otro archivo de la cuenta está
+subiendo a la vez). Un falso positivo (descartar una fila
+nueva) solo ocurre si dos hashes comparten los 64 primeros bits:
+probabilidad ≈ n / 2^64 por consulta.
+
+Uso (reconstrucción desde lo ya aterrizado en GCS):
+    python ingestion/hash_index.py rebuild
+    python ingestion/hash_index.py rebuild --bank BANKINTER --account CARD
+    python ingestion/hash_index.py stats
+"""
+
+import io
+import logging
+import argparse
+import threading
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+from google.api_core.exceptions import PreconditionFailed
+
+from scheduler import gcs_scheduler
+
+INDEX_PREFIX = "_state/hash_index"
+
+
+def hash_prefixes(hash_ids) -> np.ndarray:
+    """Convierte hash_id hexadecimales a sus primeros 64 bits (uint64)."""
+    hex_prefixes = "".join(h[:16] for h in hash_ids)
+    return np.frombuffer(bytes.fromhex(hex_prefixes), dtype=">u8").astype(np.uint64)
+
+
+class HashIndex:
+    def __init__(self, bank: str, account: str, bucket=None):
+        self.bank = bank
+        self.account = account
+        self._bucket = bucket
+        self._keys = np.empty(0, dtype=np.uint64)
+        self._claimed = set()
+        self._generation = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    @property
+    def blob_name(self) -> str:
+        return f"{INDEX_PREFIX}/{self.bank}/{self.account}.npy"
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def false_positive_rate(self) -> float:
+        """Probabilidad de que una fila nueva se descarte por colisión de prefijo."""
+        return len(self._keys) / 2.0**64
+
+    # --- Persistencia ---
+
+    def load(self) -> "HashIndex":
+        self._keys, self._generation = self._read()
+        logging.info(
+            f"🗂️ Índice {self.bank}/{self.account}: {len(self)} hashes "
+            f"(FPR ≈ {self.false_positive_rate():.1e})"
+        )
+        return self
+
+    def _read(self) -> tuple[np.ndarray, int]:
+        blob = gcs_scheduler.call(lambda: self._bucket.get_blob(self.blob_name), "get")
+        if blob is None:
+            return np.empty(0, dtype=np.uint64), 0
+        data = gcs_scheduler.call(blob.download_as_bytes, "download")
+        keys = np.load(io.BytesIO(data), allow_pickle=False)
+        return keys.astype(np.uint64), blob.generation
+
+    def save(self, max_attempts: int = 5):
+        if not self._dirty:
+            return
+        for _ in range(max_attempts):
+            buffer = io.BytesIO()
+            with self._lock:
+                np.save(buffer, self._keys, allow_pickle=False)
+            try:
+                blob = self._bucket.blob(self.blob_name)
+                # Con precondición de generación el reintento es seguro: si la
+                # subida llegó a aplicarse, el siguiente intento da PreconditionFailed
+                gcs_scheduler.call(
+                    lambda: blob.upload_from_string(
+                        buffer.getvalue(),
+                        "application/octet-stream",
+                        if_generation_match=self._generation,
+                    ),
+                    "upload",
+                )
+                self._generation = blob.generation
+                self._dirty = False
+                return
+            except PreconditionFailed:
+                # Otra ejecución guardó antes: unión de ambos índices y reintento
+                remote, self._generation = self._read()
+                with self._lock:
+                    self._keys = np.union1d(self._keys, remote)
+        logging.error(f"⚠️ No se pudo guardar el índice {self.blob_name}")
+
+    # --- Filtrado ---
+
+    def claim_new(self, hash_ids: pd.Series, own: set = None):
+        """
+        Devuelve la máscara de filas nuevas, la de filas repetidas dentro del
+        propio archivo y los hashes nuevos, que quedan reservados para que
+        otro archivo de la misma cuenta procesado en paralelo no los suba
+        también. Las reservas se confirman con commit() o se liberan con
+        release(). `own` son los hashes que el archivo ya reservó en bloques
+        anteriores.
+
+        Dos filas idénticas del mismo archivo (misma fecha, concepto e
+        importe) tienen el mismo hash_id, que es la clave del MERGE de Bronze:
+        solo se aterriza la primera. Se cuentan aparte de las ya ingeridas.
+        """
+        keys = hash_prefixes(hash_ids)
+        _, first = np.unique(keys, return_index=True)
+        repeated = np.ones(len(keys), dtype=bool)
+        repeated[first] = False
+        if own:
+            repeated |= np.isin(keys, np.fromiter(own, np.uint64, len(own)))
+        new = ~repeated
+
+        with self._lock:
+            if len(self._keys):
+                pos = np.searchsorted(self._keys, keys)
+                pos = np.minimum(pos, len(self._keys) - 1)
+                new &= self._keys[pos] != keys
+            if self._claimed:
+                claimed = np.fromiter(self._claimed, np.uint64, len(self._claimed))
+                new &= ~np.isin(keys, claimed)
+            new_keys = keys[new]
+            self._claimed.update(new_keys.tolist())
+        return new, repeated, new_keys
+
+    def filter_new_rows(self, chunks, claimed: list, counts: dict):
+        """
+        Filtra un iterador de bloques normalizados, dejando solo filas nuevas.
+        En `counts` acumula las válidas, las ya ingeridas por otros archivos
+        (duplicates) y las repetidas dentro de este (repeated).
+        """
+        own = set()
+        for df in chunks:
+            counts["valid"] = counts.get("valid", 0) + len(df)
+            if df.empty:
+                yield df
+                continue
+            new, repeated, new_keys = self.claim_new(df["hash_id"], own)
+            claimed.append(new_keys)
+            own.update(new_keys.tolist())
+            duplicates = int((~new & ~repeated).sum())
+            counts["duplicates"] = counts.get("duplicates", 0) + duplicates
+            counts["repeated"] = counts.get("repeated", 0) + int(repeated.sum())
+            yield df[new]
+
+    def commit(self, claimed: list):
+        if not claimed:
+            return
+        keys = np.concatenate(claimed)
+        with self._lock:
+            self._keys = np.union1d(self._keys, keys)
+            self._claimed.difference_update(keys.tolist())
+            self._dirty = True
+
+    def release(self, claimed: list):
+        if not claimed:
+            return
+        with self._lock:
+            self._claimed.difference_update(np.concatenate(claimed).tolist())
+
+    # --- Reconstrucción ---
+
+    def rebuild(self) -> "HashIndex":
+        """Reconstruye el índice leyendo los hash_id de todo lo aterrizado."""
+        prefix = f"{self.bank}/{self.account}/"
+        current = self._bucket.get_blob(self.blob_name)
+        self._generation = current.generation if current is not None else 0
+        parts = []
+        for blob in self._bucket.list_blobs(prefix=prefix):
+            data = io.BytesIO(blob.download_as_bytes())
+            if blob.name.endswith(".parquet"):
+                hash_ids = pq.read_table(data, columns=["hash_id"])["hash_id"]
+                hash_ids = hash_ids.to_pylist()
+            elif blob.name.endswith(".jsonl"):
+                hash_ids = pd.read_json(data, lines=True, dtype=False)["hash_id"]
+            else:
+                continue
+            parts.append(hash_prefixes(hash_ids))
+
+        with self._lock:
+            self._keys = (
+                np.unique(np.concatenate(parts))
+                if parts
+                else np.empty(0, dtype=np.uint64)
+            )
+            self._dirty = True
+        logging.info(
+            f"🔁 Índice {self.bank}/{self.account} reconstruido desde {len(parts)} objetos: "
+            f"{len(self)} hashes (FPR ≈ {self.false_positive_rate():.1e})"
+        )
+        return self
+
+
+if __name__ == "__main__":
+    from main import GCS_BUCKET_NAME, get_storage_client, load_configs
+
+    parser = argparse.ArgumentParser(description="Índice de hash_id por cuenta")
+    parser.add_argument("command", choices=["rebuild", "stats"])
+    parser.add_argument("--bank", help="Solo este banco (por defecto, todos)")
+    parser.add_argument("--account", help="Solo esta cuenta (por defecto, todas)")
+    args = parser.parse_args()
+
+    if not GCS_BUCKET_NAME:
+        logging.error("❌ Falta GCS_BUCKET_NAME. Verifica tu archivo .env")
+        exit(1)
+
+    bucket = get_storage_client().bucket(GCS_BUCKET_NAME)
+    for bank, accounts in load_configs().items():
+        if args.bank and bank != args.bank:
+            continue
+        for account in accounts:
+            if args.account and account != args.account:
+                continue
+            index = HashIndex(bank, account, bucket)
+            if args.command == "rebuild":
+                index.rebuild().save()
+            else:
+                index.load()
@@ -0,0 +1,54 @@
+import os
+import time
+import uuid
+
+from scheduler import drive_scheduler
+
+# Identificador de esta ejecución (o del worker, si se lanzan varios en paralelo)
+RUN_ID = os.environ.get("INGESTION_RUN_ID") or uuid.uuid4().hex[:12]
+
+# Tiempo tras el cual un archivo en in_progress se considera abandonado por
+# una ejecución caída y se devuelve a PENDING
+LEASE_SECONDS = float(os.environ.get("INGESTION_LEASE_SECONDS", "3600"))
+
+# appProperties del archivo en Drive (privadas de la app, no las ve el usuario)
+LEASE_RUN_ID = "ingestion_run_id"
+LEASE_CLAIMED_AT = "ingestion_claimed_at"
+LEASE_FIELDS = "id, name, appProperties"
+
+
+def new_lease(now: float = None) -> dict:
+    claimed_at = int(now if now is not None else time.time())
+    return {LEASE_RUN_ID: RUN_ID, LEASE_CLAIMED_AT: str(claimed_at)}
+
+
+def cleared_lease() -> dict:
+    # En Drive, una appProperty a null se borra
+    return {LEASE_RUN_ID: None, LEASE_CLAIMED_AT: None}
+
+
+def is_expired(file_meta: dict, ttl: float = LEASE_SECONDS, now: float = None) -> bool:
+    """
+    Archivos de in_progress sin lease (ejecuciones anteriores a este mecanismo
+    o lease borrado a mano) o con lease más antiguo que `ttl`.
+    """
+    props = file_meta.get("appProperties") or {}
+    try:
+        claimed_at = float(props[LEASE_CLAIMED_AT])
+    except (KeyError, TypeError, ValueError):
+        return True
+    now = now if now is not None else time.time()
+    return now - claimed_at > ttl
+
+
+def holds_lease(drive_service, file_id: str) -> bool:
+    """¿Sigue siendo nuestro el lease? (otro worker pudo reclamarlo o pisarlo)."""
+    meta = drive_scheduler.call(
+        drive_service.files().get(fileId=file_id, fields="appProperties").execute,
+        "files.get",
+    )
+    return (meta.get("appProperties") or {}).get(LEASE_RUN_ID) == RUN_ID
+
+
+class LeaseLostError(Exception):
+    """El archivo lo ha reclamado otra ejecución: no hay que subirlo ni moverlo."""
@@ -0,0 +1,189 @@
+"""
+Ejecución local del pipeline completo, sin Drive, GCS ni BigQuery.
+
+Lee los extractos de un árbol de carpetas con la misma estructura que Drive
+(BANCO/CUENTA/PENDING/...), los transforma con la misma lógica que main.py,
+aterriza Parquet en local_data/landing/<banco>_<cuenta>/ y ejecuta dbt
+(seed + run + test) contra un DuckDB embebido con el target `local`.
+
+Uso:
+    python ingestion/local_runner.py
+    python ingestion/local_runner.py --input local_data/drive --skip-dbt
+    python ingestion/local_runner.py --keep-pending --full-refresh
+"""
+
+import os
+import shutil
+import hashlib
+import logging
+import argparse
+import subprocess
+from pathlib import Path
+
+import pyarrow.parquet as pq
+
+from main import (
+    BASE_DIR,
+    PENDING_FOLDER,
+    PROCESSED_FOLDER,
+    LANDING_SCHEMA,
+    iter_transformed_chunks,
+    landing_path,
+    load_configs,
+    write_parquet,
+)
+
+LOCAL_DIR = BASE_DIR / "local_data"
+DEFAULT_INPUT = LOCAL_DIR / "drive"
+DEFAULT_LANDING = LOCAL_DIR / "landing"
+DBT_DIR = BASE_DIR / "transformation"
+
+FILE_TYPES = {
+    ".csv": "text/csv",
+    ".xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ".xls": "application/vnd.ms-excel",
+}
+
+# Cabecera de la hoja de efectivo (fuente `cash`, que en local es un CSV)
+CASH_COLUMNS = "fecha,concepto,importe\n"
+
+
+def landed_hash_ids(table_dir: Path) -> set:
+    """hash_id ya aterrizados en local para una cuenta (equivale al índice de GCS)."""
+    seen = set()
+    for path in table_dir.glob("*.parquet"):
+        seen.update(pq.read_table(path, columns=["hash_id"])["hash_id"].to_pylist())
+    return seen
+
+
+def filter_seen(chunks, seen: set):
+    for df in chunks:
+        if df.empty:
+            continue
+        mask = ~df["hash_id"].isin(seen) & ~df["hash_id"].duplicated()
+        seen.update(df["hash_id"][mask])
+        yield df[mask]
+
+
+def land_file(path: Path, target: Path, config, bank_name, acc_name, seen) -> int:
+    """
+    Aterriza las filas nuevas del extracto en `target`. Se escribe en un
+    temporal y solo se publica si hay filas: un fallo o un extracto sin nada
+    nuevo no deja (ni borra) ningún Parquet.
+    """
+    tmp = target.with_name(target.name + ".tmp")
+    try:
+        with path.open("rb") as file_bytes, tmp.open("wb") as out:
+            chunks = iter_transformed_chunks(
+                file_bytes,
+                FILE_TYPES[path.suffix.lower()],
+                path.name,
+                config,
+                bank_name,
+                acc_name,
+            )
+            rows = write_parquet(filter_seen(chunks, seen), out)
+        if rows:
+            os.replace(tmp, target)
+        return rows
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def ingest_local(input_dir: Path, landing_dir: Path, configs: dict, keep_pending=False):
+    """Procesa los PENDING locales y devuelve el número de filas aterrizadas."""
+    total_rows = 0
+    for bank_name, accounts in configs.items():
+        for acc_name, config in accounts.items():
+            table_dir = landing_dir / f"{bank_name}_{acc_name}".lower()
+            table_dir.mkdir(parents=True, exist_ok=True)
+            pending = input_dir / bank_name / acc_name / PENDING_FOLDER
+            processed = input_dir / bank_name / acc_name / PROCESSED_FOLDER
+
+            files = sorted(
+                p for p in pending.glob("*") if p.suffix.lower() in FILE_TYPES
+            )
+            seen = landed_hash_ids(table_dir) if files else set()
+            for path in files:
+                logging.info(f"📄 Procesando {bank_name}/{acc_name}/{path.name}")
+                # Mismo nombre que en GCS: un extracto ampliado no pisa al anterior
+                md5 = hashlib.md5(path.read_bytes()).hexdigest()
+                name = landing_path(
+                    bank_name, acc_name, {"md5Checksum": md5}, path.name, ".parquet"
+                )
+                target = table_dir / Path(name).name
+                if target.exists():
+                    # Mismo contenido ya aterrizado (p. ej. con --keep-pending): no se toca
+                    logging.info(f"⏭️ Ya aterrizado en {table_dir.name}/{target.name}")
+                    rows = 0
+                else:
+                    rows = land_file(path, target, config, bank_name, acc_name, seen)
+                    logging.info(
+                        f"✅ {rows} filas nuevas -> {table_dir.name}/{target.name}"
+                    )
+                total_rows += rows
+                if not keep_pending:
+                    processed.mkdir(parents=True, exist_ok=True)
+                    shutil.move(str(path), processed / path.name)
+
+            # DuckDB no admite un glob sin ficheros: dejamos un Parquet vacío tipado
+            if not any(table_dir.glob("*.parquet")):
+                pq.write_table(
+                    LANDING_SCHEMA.empty_table(), table_dir / "_empty.parquet"
+                )
+
+    cash_csv = landing_dir / "cash.csv"
+    if not cash_csv.exists():
+        cash_csv.write_text(CASH_COLUMNS, encoding="utf-8")
+    return total_rows
+
+
+def run_dbt(landing_dir: Path, full_refresh=False) -> int:
+    if shutil.which("dbt") is None:
+        logging.error("❌ No se encuentra dbt. Instala: pip install dbt-duckdb")
+        return 1
+
+    LOCAL_DIR.mkdir(exist_ok=True)
+    env = {
+        **os.environ,
+        "DBT_PROFILES_DIR": str(DBT_DIR),
+        "DBT_LOCAL_LANDING_DIR": landing_dir.resolve().as_posix(),
+        "DBT_DUCKDB_PATH": (LOCAL_DIR / "dwhfinancial.duckdb").as_posix(),
+    }
+    refresh = ["--full-refresh"] if full_refresh else []
+    for command in (["seed", *refresh], ["run", *refresh], ["test"]):
+        logging.info(f"🦆 dbt {' '.join(command)} (target local)")
+        result = subprocess.run(
+            ["dbt", *command, "--target", "local"], cwd=DBT_DIR, env=env
+        )
+        if result.returncode != 0:
+            logging.error(f"❌ dbt {command[0]} terminó con código {result.returncode}")
+            return result.returncode
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pipeline local (carpetas + DuckDB)")
+    parser.add_argument("--input", type=Path, default=DEFAULT_INPUT)
+    parser.add_argument("--landing", type=Path, default=DEFAULT_LANDING)
+    parser.add_argument(
+        "--keep-pending",
+        action="store_true",
+        help="No mover los extractos a PROCESSED (útil para iterar sobre el mapeo)",
+    )
+    parser.add_argument("--full-refresh", action="store_true")
+    parser.add_argument("--skip-dbt", action="store_true")
+    args = parser.parse_args()
+
+    print(
+        f"""
+    ========================================
+       🧪 DWH FINANCIAL - LOCAL RUN
+    ========================================
+    """
+    )
+
+    rows = ingest_local(args.input, args.landing, load_configs(), args.keep_pending)
+    logging.info(f"🏁 Ingesta local completada: {rows} filas nuevas")
+    if not args.skip_dbt:
+        exit(run_dbt(args.landing, args.full_refresh))
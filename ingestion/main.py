@@ -1,17 +1,51 @@
 import os
-import io
 import json
+import argparse
 import logging
 import hashlib
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, Any
+from typing import IO, Dict, Any, Iterator
 
+import httplib2
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from google.cloud import storage
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.discovery import build, Resource
+from googleapiclient.http import MediaIoBaseDownload
 from google.oauth2 import service_account
 from dotenv import load_dotenv
 
+from categorizer import MAPPING_CSV, KeywordCategorizer
+from drive_client import (
+    FILE_FIELDS,
+    FOLDER_MIME,
+    children_query,
+    list_children_many,
+    list_files,
+)
+from hash_index import HashIndex
+from leases import (
+    LEASE_FIELDS,
+    LEASE_RUN_ID,
+    LEASE_SECONDS,
+    RUN_ID,
+    LeaseLostError,
+    cleared_lease,
+    holds_lease,
+    is_expired,
+    new_lease,
+)
+from manifest import IngestionManifest, config_version, file_content_key
+from run_report import RunReport, count, set_status, stage
+from scheduler import drive_scheduler, gcs_scheduler
+from statement_reader import compile_readers, get_reader
+
 # --- CONFIGURACIÓN INICIAL ---
 # Carga variables del archivo .env que está en la raíz del proyecto
 # (Subimos dos niveles desde ingestion/main.py para llegar a la raíz)
@@ -30,13 +64,93 @@ PENDING_FOLDER = "PENDING"
 PROCESSED_FOLDER = "PROCESSED"
 IN_PROGRESS_FOLDER = "in_progress"
 
+# Informe estructurado de cada ejecución (tiempos por etapa, filas, bytes)
+STATE_DIR = BASE_DIR / "ingestion" / "state"
+RUN_REPORT_JSON = STATE_DIR / "run_report.json"
+PROFILES_DIR = STATE_DIR / "profiles"
+
 # Variables de entorno
 PROJECT_ID = os.environ.get("GCP_PROJECT_ID")
 GCS_BUCKET_NAME = os.environ.get("GCS_BUCKET_NAME")
 DRIVE_PARENT_FOLDER_ID = os.environ.get("DRIVE_PARENT_FOLDER_ID")
 
-# Cliente GCS
-storage_client = storage.Client()
+# Concurrencia: número máximo de workers y timeout por archivo (segundos)
+MAX_WORKERS = int(os.environ.get("INGESTION_MAX_WORKERS", "4"))
+FILE_TIMEOUT = float(os.environ.get("INGESTION_FILE_TIMEOUT", "300"))
+
+# Streaming: filas por bloque al leer CSV (0 = leer el archivo entero de golpe)
+CHUNK_ROWS = int(os.environ.get("INGESTION_CHUNK_ROWS", "50000"))
+# Descargas y ficheros de aterrizaje se quedan en memoria hasta este tamaño
+# y a partir de ahí se vuelcan a disco (SpooledTemporaryFile)
+SPOOL_MAX_BYTES = 32 * 1024 * 1024
+DOWNLOAD_CHUNK_BYTES = 8 * 1024 * 1024
+
+# Caché de archivos ya ingeridos (manifiesto por contenido). Subir
+# TRANSFORM_VERSION invalida el manifiesto cuando cambia la lógica de transformación.
+SKIP_CACHE = os.environ.get("INGESTION_SKIP_CACHE", "1") != "0"
+TRANSFORM_VERSION = "2"
+
+# Índice de hash_id por cuenta para subir solo transacciones nuevas
+DEDUPE_INDEX = os.environ.get("INGESTION_DEDUPE_INDEX", "1") != "0"
+
+# Categorización en la ingesta con el motor compilado de master_mapping.csv
+CATEGORIZE = os.environ.get("INGESTION_CATEGORIZE", "1") != "0"
+
+# Formato de aterrizaje en GCS: "jsonl" (por defecto) o "parquet"
+OUTPUT_FORMAT = os.environ.get("INGESTION_OUTPUT_FORMAT", "jsonl").lower()
+LANDING_FORMATS = {
+    "jsonl": (".jsonl", "application/jsonl"),
+    "parquet": (".parquet", "application/vnd.apache.parquet"),
+}
+
+# Esquema tipado del Parquet: fecha como DATE y entidad/origen con diccionario
+LANDING_SCHEMA = pa.schema(
+    [
+        ("hash_id", pa.string()),
+        ("fecha", pa.date32()),
+        ("concepto", pa.string()),
+        ("importe", pa.float64()),
+        ("entidad", pa.dictionary(pa.int8(), pa.string())),
+        ("origen", pa.dictionary(pa.int8(), pa.string())),
+        ("categoria_ingesta", pa.string()),
+        ("mapping_version", pa.dictionary(pa.int8(), pa.string())),
+    ]
+)
+
+# Cliente GCS (se crea bajo demanda para poder importar el módulo sin credenciales)
+_storage_client = None
+
+
+def get_storage_client() -> storage.Client:
+    global _storage_client
+    if _storage_client is None:
+        _storage_client = storage.Client()
+    return _storage_client
+
+
+# Motor de categorización (se compila una vez y se comparte entre hilos: es de solo lectura)
+_categorizer = None
+_categorizer_lock = threading.Lock()
+
+
+def get_categorizer():
+    global _categorizer
+    if not CATEGORIZE:
+        return None
+    with _categorizer_lock:
+        if _categorizer is None:
+            if not MAPPING_CSV.exists():
+                logging.warning(
+                    f"⚠️ No se encuentra {MAPPING_CSV}: se categorizará en dbt"
+                )
+                return None
+            _categorizer = KeywordCategorizer.from_csv(MAPPING_CSV)
+            logging.info(
+                f"🏷️ Motor de categorías compilado: {len(_categorizer.rules)} reglas "
+                f"(versión {_categorizer.version})"
+            )
+    return _categorizer
+
 
 # --- FUNCIONES AUXILIARES ---
 
@@ -50,11 +164,15 @@ def load_configs() -> Dict[str, Any]:
 
     try:
         with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
+            configs = json.load(f)
     except Exception as e:
         logging.critical(f"❌ Error leyendo JSON de configuración: {e}")
         return {}
 
+    # Un lector compilado por banco/cuenta, listo antes de abrir el pool
+    compile_readers(configs)
+    return configs
+
 
 def generate_hash_id(row: pd.Series) -> str:
     # Usamos valores str() para evitar errores de tipos
@@ -69,12 +187,32 @@ def generate_hash_id(row: pd.Series) -> str:
     return hashlib.sha256(unique_string.encode("utf-8")).hexdigest()
 
 
+def generate_hash_ids(df: pd.DataFrame) -> pd.Series:
+    # Misma firma que generate_hash_id (byte a byte), pero recorriendo las
+    # columnas como listas en vez de construir un pd.Series por fila.
+    sha256 = hashlib.sha256
+    hashes = [
+        sha256(
+            f"{str(fecha)}-{str(concepto).strip().lower()}-{float(importe):.2f}".encode(
+                "utf-8"
+            )
+        ).hexdigest()
+        for fecha, concepto, importe in zip(
+            df["fecha"].tolist(), df["concepto"].tolist(), df["importe"].tolist()
+        )
+    ]
+    return pd.Series(hashes, index=df.index, dtype=object)
+
+
 def download_drive_file_as_bytes(
-    drive_service: Resource, file_id: str
-) -> tuple[io.BytesIO, str, str]:
-    file_metadata = (
-        drive_service.files().get(fileId=file_id, fields="mimeType, name").execute()
-    )
+    drive_service: Resource, file_id: str, file_metadata: dict = None
+) -> tuple[IO[bytes], str, str]:
+    # Si el listado ya trae nombre y mimeType no hace falta pedir los metadatos
+    if not file_metadata or not file_metadata.get("mimeType"):
+        file_metadata = drive_scheduler.call(
+            drive_service.files().get(fileId=file_id, fields="mimeType, name").execute,
+            "files.get",
+        )
     mime_type = file_metadata.get("mimeType")
     file_name = file_metadata.get("name")
 
@@ -90,48 +228,116 @@ def download_drive_file_as_bytes(
         request = drive_service.files().get_media(fileId=file_id)
         effective_type = Path(file_name).suffix.lower()
 
-    return io.BytesIO(request.execute()), effective_type, file_name
+    # Descarga por bloques: los archivos grandes no se cargan enteros en memoria
+    buffer = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    downloader = MediaIoBaseDownload(buffer, request, chunksize=DOWNLOAD_CHUNK_BYTES)
+    done = False
+    with stage("download"):
+        while not done:
+            # Un bloque fallido no avanza la descarga: reintentarlo es seguro
+            _, done = drive_scheduler.call(downloader.next_chunk, "download")
+    count("bytes_downloaded", buffer.tell())
+    buffer.seek(0)
 
+    return buffer, effective_type, file_name
 
-def unify_importe_format(x):
-    if pd.isna(x):
-        return x
-    s = str(x).strip()
-    # Lógica simple para detectar formato europeo (1.000,00) vs americano (1,000.00)
-    # Si tiene coma y punto, asumimos formato europeo o americano complejo.
-    # Esta lógica es básica, ajústala según tus bancos.
-    if "," in s and "." in s:
-        s = s.replace(".", "").replace(",", ".")
-    elif "," in s:
-        s = s.replace(",", ".")
-    try:
-        return float(s)
-    except:
-        return float("nan")
 
+# Un único separador con exactamente tres dígitos detrás: 1,000 / 1.000 (miles)
+LONE_THOUSANDS = r"[1-9]\d{0,2}[,.]\d{3}"
 
-def transform_dataframe(
-    file_bytes, file_type, file_name, config, bank, account_type
-) -> pd.DataFrame:
-    try:
-        if "csv" in file_type:
-            df = pd.read_csv(
-                file_bytes,
-                skiprows=config.get("skip_rows", 0),
-                skipfooter=config.get("skip_footer", 0),
-                engine="python",
-                encoding="utf-8",
-            )
-        else:
-            df = pd.read_excel(
-                file_bytes,
-                skiprows=config.get("skip_rows", 0),
-                skipfooter=config.get("skip_footer", 0),
-            )
-    except Exception as e:
-        logging.error(f"⚠️ Error leyendo estructura de {file_name}: {e}")
-        return pd.DataFrame()
 
+def parse_importe_column(values: pd.Series) -> tuple[pd.Series, int, int]:
+    """
+    Convierte la columna de importes a float en una sola pasada vectorizada.
+
+    Soporta separadores europeos (1.234,56) y americanos (1,234.56), símbolos
+    de moneda, signo menos final (12,50-) y negativos entre paréntesis (12,50).
+    Un único separador seguido de exactamente tres dígitos (1,000 / 1.000) se
+    lee como separador de miles.
+
+    Devuelve la serie numérica, el número de valores no vacíos que no se
+    pudieron interpretar (quedan como NaN) y el número de valores ambiguos
+    (un único separador con tres dígitos detrás) leídos como miles.
+    """
+    # Camino rápido: valores que ya son numéricos (Excel) o texto tipo "-12.5"
+    result = pd.to_numeric(values, errors="coerce").astype(float)
+    pending = result.isna() & values.notna()
+    if pd.api.types.is_object_dtype(values):
+        # to_numeric lee el texto "1.000" como 1.0: también pasa por abajo
+        fast_text = values[result.notna()]
+        fast_text = fast_text[fast_text.map(type).eq(str)]
+        grouped = fast_text.str.strip().str.lstrip("+-").str.fullmatch(LONE_THOUSANDS)
+        pending |= grouped.reindex(values.index, fill_value=False)
+
+    text = values[pending].astype(str).str.strip()
+    text = text[text != ""]
+    if text.empty:
+        return result, 0, 0
+
+    negative = (
+        text.str.startswith(("-", "\u2212"))
+        | text.str.endswith("-")
+        | (text.str.startswith("(") & text.str.endswith(")"))
+    )
+    # Nos quedamos solo con dígitos y separadores (fuera moneda, espacios y signos)
+    digits = text.str.replace(r"[^\d,.]", "", regex=True)
+
+    last_comma = digits.str.rfind(",")
+    last_dot = digits.str.rfind(".")
+    n_commas = digits.str.count(",")
+    n_dots = digits.str.count(r"\.")
+
+    # Los extractos traen dos decimales: un único separador con exactamente
+    # tres dígitos detrás (1,000 / $1.000) es de miles. Se cuentan como
+    # ambiguos para avisar por si algún banco exporta tres decimales.
+    lone_thousands = digits.str.fullmatch(LONE_THOUSANDS).eq(True)
+
+    # El separador decimal es el último que aparece si hay ambos; si solo hay
+    # uno, es decimal cuando aparece una única vez (12,50 / 12.50) y de miles
+    # cuando se repite (1.234.567).
+    comma_decimal = ((last_comma > last_dot) & (n_dots > 0)) | (
+        (n_dots == 0) & (n_commas == 1) & ~lone_thousands
+    )
+    dot_decimal = ((last_dot > last_comma) & (n_commas > 0)) | (
+        (n_commas == 0) & (n_dots == 1) & ~lone_thousands
+    )
+
+    normalized = digits.where(
+        ~comma_decimal,
+        digits.str.replace(".", "", regex=False).str.replace(",", ".", regex=False),
+    )
+    normalized = normalized.where(
+        ~dot_decimal, normalized.str.replace(",", "", regex=False)
+    )
+    thousands_only = ~comma_decimal & ~dot_decimal
+    normalized = normalized.where(
+        ~thousands_only, normalized.str.replace(r"[,.]", "", regex=True)
+    )
+
+    parsed = pd.to_numeric(normalized, errors="coerce").astype(float)
+    parsed[negative] = -parsed[negative].abs()
+    result.loc[parsed.index] = parsed
+
+    return result, int(parsed.isna().sum()), int(lone_thousands.sum())
+
+
+def read_statement(
+    file_bytes, file_type, file_name, config, bank, account_type, chunk_rows=None
+):
+    """
+    Lee el extracto con el lector compilado de su cuenta: solo las columnas
+    mapeadas y sin las filas que se descartarían (ver statement_reader).
+    """
+    reader = get_reader(bank, account_type, config)
+    return reader.read(file_bytes, file_type, chunk_rows, file_name)
+
+
+def normalize_dataframe(df, file_name, config, bank, account_type) -> pd.DataFrame:
+    with stage("normalize"):
+        return _normalize_dataframe(df, file_name, config, bank, account_type)
+
+
+def _normalize_dataframe(df, file_name, config, bank, account_type) -> pd.DataFrame:
     if "column_mapping" not in config:
         return pd.DataFrame()
 
@@ -139,7 +345,7 @@ def transform_dataframe(
     cols_to_rename = {
         k: v for k, v in config["column_mapping"].items() if k in df.columns
     }
-    df.rename(columns=cols_to_rename, inplace=True)
+    df = df.rename(columns=cols_to_rename)
 
     required_cols = list(config["column_mapping"].values())
 
@@ -153,13 +359,25 @@ def transform_dataframe(
     df = df[required_cols].copy()
 
     # Limpieza de datos
-    df["fecha"] = pd.to_datetime(
-        df["fecha"], format=config.get("date_format"), errors="coerce"
-    ).dt.strftime("%Y-%m-%d")
-    df["importe"] = df["importe"].apply(unify_importe_format)
+    df["fecha"] = get_reader(bank, account_type, config).parse_fecha(df["fecha"])
+    df["importe"], invalid_importes, ambiguous_importes = parse_importe_column(
+        df["importe"]
+    )
+    if invalid_importes:
+        count("rows_invalid_importe", invalid_importes)
+        logging.warning(
+            f"⚠️ {invalid_importes} importes no se pudieron interpretar en {file_name}"
+        )
+    if ambiguous_importes:
+        count("rows_ambiguous_importe", ambiguous_importes)
+        logging.warning(
+            f"⚠️ {ambiguous_importes} importes ambiguos (1,000 / 1.000) leídos como miles en {file_name}"
+        )
 
     # Eliminar filas vacías críticas
+    rows_before = len(df)
     df.dropna(subset=["fecha", "concepto", "importe"], inplace=True)
+    count("rows_dropped", rows_before - len(df))
 
     if df.empty:
         return df
@@ -167,53 +385,500 @@ def transform_dataframe(
     # Enriquecimiento
     df["entidad"] = bank.capitalize()
     df["origen"] = account_type.capitalize()
-    df["hash_id"] = df.apply(generate_hash_id, axis=1)
+    with stage("hash"):
+        df["hash_id"] = generate_hash_ids(df)
+
+    categorizer = get_categorizer()
+    if categorizer is not None:
+        with stage("categorize"):
+            df["categoria_ingesta"] = categorizer.categorize_series(
+                df["concepto"], df["importe"]
+            )
+        df["mapping_version"] = categorizer.version
+    else:
+        df["categoria_ingesta"] = None
+        df["mapping_version"] = None
+
+    return df[
+        [
+            "hash_id",
+            "fecha",
+            "concepto",
+            "importe",
+            "entidad",
+            "origen",
+            "categoria_ingesta",
+            "mapping_version",
+        ]
+    ]
+
+
+def transform_dataframe(
+    file_bytes, file_type, file_name, config, bank, account_type
+) -> pd.DataFrame:
+    try:
+        with stage("read"):
+            df = read_statement(
+                file_bytes, file_type, file_name, config, bank, account_type
+            )
+    except Exception as e:
+        logging.error(f"⚠️ Error leyendo estructura de {file_name}: {e}")
+        return pd.DataFrame()
+
+    return normalize_dataframe(df, file_name, config, bank, account_type)
 
-    return df[["hash_id", "fecha", "concepto", "importe", "entidad", "origen"]]
 
+def iter_transformed_chunks(
+    file_bytes, file_type, file_name, config, bank, account_type, chunk_rows=None
+) -> Iterator[pd.DataFrame]:
+    """
+    Versión en streaming de transform_dataframe: lee, normaliza y hashea el
+    extracto bloque a bloque, de modo que la memoria no crece con el archivo.
+    """
+    if not chunk_rows or "csv" not in file_type:
+        yield transform_dataframe(
+            file_bytes, file_type, file_name, config, bank, account_type
+        )
+        return
 
-def move_file_in_drive(drive_service, file_id, current_parent, new_parent):
     try:
-        drive_service.files().update(
-            fileId=file_id,
-            addParents=new_parent,
-            removeParents=current_parent,
-            fields="id, parents",
-        ).execute()
+        reader = read_statement(
+            file_bytes, file_type, file_name, config, bank, account_type, chunk_rows
+        )
+        while True:
+            # La lectura real de cada bloque ocurre al pedirlo al iterador
+            with stage("read"):
+                chunk = next(reader, None)
+            if chunk is None:
+                return
+            df = normalize_dataframe(chunk, file_name, config, bank, account_type)
+            if df.empty and df.columns.empty:
+                # Estructura inválida (faltan columnas): no tiene sentido seguir
+                return
+            yield df
+    except Exception as e:
+        # Un fallo a mitad de archivo invalida los bloques ya escritos:
+        # se propaga para que el archivo vuelva entero a PENDING
+        logging.error(f"⚠️ Error leyendo estructura de {file_name}: {e}")
+        raise
+
+
+def write_jsonl(chunks: Iterator[pd.DataFrame], out: IO[bytes]) -> int:
+    """Escribe los bloques como JSONL en `out` y devuelve las filas escritas."""
+    rows = 0
+    for df in chunks:
+        if df.empty:
+            continue
+        json_data = df.to_json(orient="records", lines=True, date_format="iso")
+        out.write(json_data.encode("utf-8"))
+        rows += len(df)
+    return rows
+
+
+def write_parquet(chunks: Iterator[pd.DataFrame], out: IO[bytes]) -> int:
+    """Escribe los bloques como row groups de un Parquet tipado (LANDING_SCHEMA)."""
+    rows = 0
+    writer = None
+    for df in chunks:
+        if df.empty:
+            continue
+        table = pa.table(
+            {
+                "hash_id": pa.array(df["hash_id"], pa.string()),
+                "fecha": pa.array(df["fecha"], pa.string()).cast(pa.date32()),
+                "concepto": pa.array(df["concepto"].astype(str), pa.string()),
+                "importe": pa.array(df["importe"], pa.float64()),
+                "entidad": pa.array(df["entidad"], pa.string()).dictionary_encode(),
+                "origen": pa.array(df["origen"], pa.string()).dictionary_encode(),
+                "categoria_ingesta": pa.array(df["categoria_ingesta"], pa.string()),
+                "mapping_version": pa.array(
+                    df["mapping_version"], pa.string()
+                ).dictionary_encode(),
+            }
+        ).cast(LANDING_SCHEMA)
+        if writer is None:
+            writer = pq.ParquetWriter(out, LANDING_SCHEMA, compression="snappy")
+        writer.write_table(table)
+        rows += len(df)
+    if writer is not None:
+        writer.close()
+    return rows
+
+
+def write_landing_file(chunks, out, output_format) -> int:
+    if output_format == "parquet":
+        return write_parquet(chunks, out)
+    return write_jsonl(chunks, out)
+
+
+def move_file_in_drive(
+    drive_service, file_id, current_parent, new_parent, app_properties=None
+) -> bool:
+    """
+    Mueve el archivo entre carpetas con reintentos (y, en la misma llamada,
+    actualiza sus appProperties: el lease). Devuelve False si no se pudo.
+    """
+    body = {"appProperties": app_properties} if app_properties is not None else None
+    with stage("drive"):
+        moved = _move_file(drive_service, file_id, current_parent, new_parent, body)
+    return moved is not None
+
+
+def claim_file(drive_service, file_id, folders) -> bool:
+    """
+    Bloqueo lógico: mueve el archivo de PENDING a in_progress con un lease
+    nuevo. Si otro worker ya lo había archivado en PROCESSED entre el listado
+    y el bloqueo, se deshace el movimiento y el archivo no se procesa.
+    """
+    pending, processed, progress = folders
+    with stage("drive"):
+        moved = _move_file(
+            drive_service, file_id, pending, progress, {"appProperties": new_lease()}
+        )
+        if moved is None:
+            return False
+        if processed not in (moved.get("parents") or []):
+            return True
+        _move_file(
+            drive_service,
+            file_id,
+            progress,
+            None,
+            {"appProperties": cleared_lease()},
+        )
+    return False
+
+
+def _move_file(drive_service, file_id, current_parent, new_parent, body):
+    """Respuesta del update ({} si se aplicó pero se perdió), o None si falló."""
+
+    def already_moved():
+        # Si el update llegó a aplicarse pero se perdió la respuesta, no se repite
+        try:
+            request = drive_service.files().get(fileId=file_id, fields="parents")
+            parents = request.execute().get("parents", [])
+        except Exception:
+            return False
+        return (
+            new_parent is None or new_parent in parents
+        ) and current_parent not in parents
+
+    try:
+        response = drive_scheduler.call(
+            drive_service.files()
+            .update(
+                fileId=file_id,
+                addParents=new_parent,
+                removeParents=current_parent,
+                body=body,
+                fields="id, parents",
+            )
+            .execute,
+            "files.update",
+            already_done=already_moved,
+        )
+        return response or {}
     except Exception as e:
         logging.error(f"⚠️ Error moviendo archivo en Drive: {e}")
+        return None
 
 
-def get_subfolder_ids(drive_service, parent_id) -> Dict[str, str]:
-    folder_ids = {}
-    q = f"'{parent_id}' in parents and mimeType='application/vnd.google-apps.folder' and trashed=false"
-    folders = (
-        drive_service.files()
-        .list(q=q, fields="files(id, name)")
-        .execute()
-        .get("files", [])
-    )
-    for f in folders:
-        folder_ids[f["name"]] = f["id"]
+def get_subfolder_ids(drive_service, parent_id, folders=None) -> Dict[str, str]:
+    """
+    Subcarpetas de una cuenta por nombre. `folders` es el listado ya obtenido
+    en batch por run_ingestion; si no se pasa, se lista aquí.
+    """
+    if folders is None:
+        folders = list_files(drive_service, children_query(parent_id, True))
+    folder_ids = {f["name"]: f["id"] for f in folders}
 
     # Auto-crear carpeta IN_PROGRESS si no existe
     if IN_PROGRESS_FOLDER not in folder_ids:
         m = {
             "name": IN_PROGRESS_FOLDER,
-            "mimeType": "application/vnd.google-apps.folder",
+            "mimeType": FOLDER_MIME,
             "parents": [parent_id],
         }
-        f = drive_service.files().create(body=m, fields="id").execute()
+        f = drive_scheduler.call(
+            drive_service.files().create(body=m, fields="id").execute, "files.create"
+        )
         folder_ids[IN_PROGRESS_FOLDER] = f.get("id")
     return folder_ids
 
 
-def process_account_folder(drive_service, account_folder, bank_name, config) -> int:
+def reclaim_expired_leases(
+    drive_service, progress, pending, in_progress_files=None, ttl=None
+) -> int:
+    """
+    Devuelve a PENDING los archivos de in_progress cuyo lease ha caducado
+    (ejecución caída o matada a mitad). El plazo nunca es menor que dos veces
+    el timeout por archivo, para no quitarle el archivo a un worker vivo.
+    `in_progress_files` es el listado ya obtenido en batch, si lo hay.
+    """
+    ttl = max(LEASE_SECONDS if ttl is None else ttl, 2 * FILE_TIMEOUT)
+    if in_progress_files is None:
+        in_progress_files = list_files(
+            drive_service, children_query(progress), LEASE_FIELDS
+        )
+    stale = [f for f in in_progress_files if is_expired(f, ttl)]
+    reclaimed = 0
+    for f in stale:
+        owner = (f.get("appProperties") or {}).get(LEASE_RUN_ID, "desconocida")
+        if move_file_in_drive(
+            drive_service, f["id"], progress, pending, cleared_lease()
+        ):
+            reclaimed += 1
+            logging.warning(
+                f"♻️ Lease caducado (ejecución {owner}), vuelve a PENDING: {f['name']}"
+            )
+    return reclaimed
+
+
+def landing_path(bank_name, acc_name, file_meta, fname, extension) -> str:
+    """
+    Ruta del delta en GCS: nombre del extracto más una huella de su contenido.
+    Un extracto ampliado que se vuelve a subir con el mismo nombre genera un
+    delta nuevo en vez de pisar (y perder) las filas aterrizadas la primera
+    vez; el mismo contenido siempre va a la misma ruta (reintentos idempotentes).
+    """
+    digest = hashlib.sha256(file_content_key(file_meta).encode("utf-8")).hexdigest()
+    return f"{bank_name}/{acc_name}/{Path(fname).stem}_{digest[:12]}{extension}"
+
+
+def check_deadline(deadline, fname, stage):
+    # Timeout cooperativo por archivo: se comprueba entre etapas. Las llamadas
+    # de red individuales quedan acotadas por el timeout de cada cliente.
+    if deadline is not None and time.monotonic() > deadline:
+        raise TimeoutError(f"Timeout por archivo superado antes de '{stage}': {fname}")
+
+
+def process_file(
+    drive_service,
+    f,
+    folders,
+    bank_name,
+    acc_name,
+    config,
+    deadline=None,
+    output_format=OUTPUT_FORMAT,
+    manifest=None,
+    hash_index=None,
+    report=None,
+) -> bool:
+    args = (drive_service, f, folders, bank_name, acc_name, config, deadline)
+    if report is None:
+        return _process_file(*args, output_format, manifest, hash_index)
+    # Tiempos por etapa y contadores del archivo, en el hilo que lo procesa
+    with report.track_file(bank_name, acc_name, f["name"]):
+        return _process_file(*args, output_format, manifest, hash_index)
+
+
+def _process_file(
+    drive_service,
+    f,
+    folders,
+    bank_name,
+    acc_name,
+    config,
+    deadline,
+    output_format,
+    manifest,
+    hash_index,
+) -> bool:
+    pending, processed, progress = folders
+    fid, fname = f["id"], f["name"]
+
+    # 0. Caché por contenido: si ya se ingirió con esta configuración, se
+    # archiva directamente sin descargar ni transformar
+    manifest_key = None
+    if manifest is not None:
+        version = config_version(config, output_format, TRANSFORM_VERSION)
+        manifest_key = manifest.key(f, version)
+        previous = manifest.get(manifest_key)
+        if previous:
+            logging.info(
+                f"⏭️ Ya ingerido el {previous['processed_at']}, se archiva sin descargar: {fname}"
+            )
+            set_status("skipped_cached")
+            move_file_in_drive(drive_service, fid, pending, processed, cleared_lease())
+            return False
+
+    logging.info(f"🔄 Procesando archivo: {fname}")
+
+    # Hashes reservados en el índice mientras se procesa el archivo
+    claimed, counts = [], {}
+    try:
+        # 1. Mover a In Progress (Bloqueo lógico) con lease (ejecución + hora)
+        # en la misma llamada. Sin bloqueo no se procesa: el archivo sigue en
+        # PENDING y lo recogerá la siguiente ejecución
+        if not claim_file(drive_service, fid, folders):
+            set_status("not_claimed")
+            return False
+
+        # 2. Descargar y Transformar
+        check_deadline(deadline, fname, "descarga")
+        fbytes, ftype, fname = download_drive_file_as_bytes(drive_service, fid, f)
+        check_deadline(deadline, fname, "transformación")
+        # El archivo de aterrizaje se escribe bloque a bloque en un temporal
+        gcs_path = None
+        with fbytes, tempfile.SpooledTemporaryFile(SPOOL_MAX_BYTES) as landing:
+            chunks = iter_transformed_chunks(
+                fbytes, ftype, fname, config, bank_name, acc_name, CHUNK_ROWS
+            )
+            if hash_index is not None:
+                # Solo se emiten transacciones que no estén ya en el índice
+                chunks = hash_index.filter_new_rows(chunks, claimed, counts)
+            # Incluye la lectura, normalización y filtrado que hace el generador
+            with stage("write"):
+                rows = write_landing_file(chunks, landing, output_format)
+
+            # Antes de publicar nada se comprueba que el lease sigue siendo
+            # nuestro: si otro worker reclamó el archivo, él lo termina
+            with stage("drive"):
+                if not holds_lease(drive_service, fid):
+                    raise LeaseLostError(fname)
+
+            if rows:
+                # 3. Subir a GCS (JSONL o Parquet, misma ruta bank/account/)
+                check_deadline(deadline, fname, "subida")
+                extension, content_type = LANDING_FORMATS[output_format]
+                gcs_path = landing_path(bank_name, acc_name, f, fname, extension)
+                blob = get_storage_client().bucket(GCS_BUCKET_NAME).blob(gcs_path)
+                # Idempotente: misma ruta y rewind=True, cada intento sube el archivo entero
+                with stage("upload"):
+                    gcs_scheduler.call(
+                        lambda: blob.upload_from_file(
+                            landing,
+                            content_type=content_type,
+                            rewind=True,
+                            timeout=FILE_TIMEOUT,
+                        ),
+                        "upload",
+                    )
+                count("bytes_uploaded", landing.tell())
+                logging.info(f"✅ Subido a GCS: {gcs_path} ({rows} filas)")
+
+        count("rows_written", rows)
+        count("rows_duplicated", counts.get("duplicates", 0))
+        count("rows_repeated_in_file", counts.get("repeated", 0))
+        if counts.get("repeated"):
+            logging.warning(
+                f"⚠️ {counts['repeated']} filas repetidas dentro de {fname} "
+                "(mismo hash_id): solo se aterriza la primera"
+            )
+        if rows or counts.get("valid"):
+            if hash_index is not None:
+                hash_index.commit(claimed)
+                if counts.get("duplicates"):
+                    logging.info(
+                        f"🧹 {counts['duplicates']} filas ya ingeridas descartadas en {fname}"
+                    )
+            if not rows:
+                logging.info(f"⏭️ Sin transacciones nuevas en {fname}")
+            if manifest is not None:
+                manifest.record(
+                    manifest_key, gcs_path=gcs_path, rows=rows, file_name=fname
+                )
+
+            # 4. Mover a Processed (Finalizado) y liberar el lease
+            move_file_in_drive(drive_service, fid, progress, processed, cleared_lease())
+            set_status("processed")
+            return True
+
+        logging.warning(f"⚠️ Archivo vacío o datos inválidos: {fname}")
+        set_status("empty")
+        # Devolver a PENDING para revisión manual
+        move_file_in_drive(drive_service, fid, progress, pending, cleared_lease())
+
+    except LeaseLostError:
+        logging.warning(f"🔒 {fname} lo ha reclamado otra ejecución, se descarta")
+        set_status("lease_lost")
+        if hash_index is not None:
+            hash_index.release(claimed)
+
+    except Exception as e:
+        logging.error(f"🔥 Error procesando {fname}: {e}")
+        set_status("failed")
+        if hash_index is not None:
+            hash_index.release(claimed)
+        try:
+            # Intentar devolver a PENDING si falla
+            move_file_in_drive(drive_service, fid, progress, pending, cleared_lease())
+        except:
+            pass
+
+    return False
+
+
+# --- CONCURRENCIA ---
+# googleapiclient (httplib2) no es thread-safe: cada hilo usa su propio
+# cliente de Drive, creado bajo demanda con la factoría que se le pase.
+_thread_local = threading.local()
+
+
+def get_thread_drive(drive_factory):
+    drives = _thread_local.__dict__.setdefault("drives", {})
+    if drive_factory not in drives:
+        drives[drive_factory] = drive_factory()
+    return drives[drive_factory]
+
+
+def _process_file_worker(
+    drive_factory,
+    f,
+    folders,
+    bank_name,
+    acc_name,
+    config,
+    file_timeout,
+    output_format,
+    manifest,
+    hash_index,
+    report=None,
+):
+    # El plazo empieza a contar cuando el worker coge el archivo, no al encolarlo
+    deadline = time.monotonic() + file_timeout if file_timeout else None
+    drive_service = get_thread_drive(drive_factory)
+    return process_file(
+        drive_service,
+        f,
+        folders,
+        bank_name,
+        acc_name,
+        config,
+        deadline,
+        output_format,
+        manifest,
+        hash_index,
+        report,
+    )
+
+
+def process_account_folder(
+    drive_service,
+    account_folder,
+    bank_name,
+    config,
+    file_executor=None,
+    drive_factory=None,
+    file_timeout=None,
+    output_format=OUTPUT_FORMAT,
+    manifest=None,
+    use_hash_index=DEDUPE_INDEX,
+    subfolders=None,
+    in_progress_files=None,
+    report=None,
+) -> int:
     acc_name = account_folder["name"]
     acc_id = account_folder["id"]
     logging.info(f"🔎 Revisando carpeta: {bank_name} / {acc_name}")
 
-    subs = get_subfolder_ids(drive_service, acc_id)
+    if output_format not in LANDING_FORMATS:
+        raise ValueError(
+            f"Formato de salida no soportado: {output_format} ({list(LANDING_FORMATS)})"
+        )
+
+    subs = get_subfolder_ids(drive_service, acc_id, subfolders)
     pending, processed, progress = (
         subs.get(PENDING_FOLDER),
         subs.get(PROCESSED_FOLDER),
@@ -226,57 +891,195 @@ def process_account_folder(drive_service, account_folder, bank_name, config) ->
         )
         return 0
 
-    # Listar archivos en PENDING
-    files = (
-        drive_service.files()
-        .list(q=f"'{pending}' in parents and trashed=false", fields="files(id, name)")
-        .execute()
-        .get("files", [])
-    )
+    # Archivos abandonados en in_progress por ejecuciones caídas vuelven a PENDING
+    if progress:
+        reclaim_expired_leases(drive_service, progress, pending, in_progress_files)
+
+    # Listar archivos en PENDING (todas las páginas, con los metadatos de descarga)
+    files = list_files(drive_service, children_query(pending), FILE_FIELDS)
+    folders = (pending, processed, progress)
+    if not files:
+        return 0
 
-    count = 0
-    for f in files:
-        fid, fname = f["id"], f["name"]
-        logging.info(f"🔄 Procesando archivo: {fname}")
+    hash_index = None
+    if use_hash_index:
+        hash_index = HashIndex(
+            bank_name, acc_name, get_storage_client().bucket(GCS_BUCKET_NAME)
+        ).load()
 
-        try:
-            # 1. Mover a In Progress (Bloqueo lógico)
-            move_file_in_drive(drive_service, fid, pending, progress)
-
-            # 2. Descargar y Transformar
-            fbytes, ftype, fname = download_drive_file_as_bytes(drive_service, fid)
-            df = transform_dataframe(fbytes, ftype, fname, config, bank_name, acc_name)
-
-            if not df.empty:
-                # 3. Subir a GCS (Formato JSONL)
-                json_data = df.to_json(orient="records", lines=True, date_format="iso")
-                gcs_path = f"{bank_name}/{acc_name}/{Path(fname).stem}.jsonl"
-                storage_client.bucket(GCS_BUCKET_NAME).blob(
-                    gcs_path
-                ).upload_from_string(json_data, "application/jsonl")
-                logging.info(f"✅ Subido a GCS: {gcs_path}")
-
-                # 4. Mover a Processed (Finalizado)
-                move_file_in_drive(drive_service, fid, progress, processed)
-                count += 1
+    # Modo secuencial (sin pool): mismo comportamiento que antes
+    if file_executor is None:
+        done = 0
+        for f in files:
+            deadline = time.monotonic() + file_timeout if file_timeout else None
+            done += process_file(
+                drive_service,
+                f,
+                folders,
+                bank_name,
+                acc_name,
+                config,
+                deadline,
+                output_format,
+                manifest,
+                hash_index,
+                report,
+            )
+    else:
+        futures = [
+            file_executor.submit(
+                _process_file_worker,
+                drive_factory,
+                f,
+                folders,
+                bank_name,
+                acc_name,
+                config,
+                file_timeout,
+                output_format,
+                manifest,
+                hash_index,
+                report,
+            )
+            for f in files
+        ]
+        done = sum(future.result() for future in futures)
+
+    if hash_index is not None:
+        hash_index.save()
+    return done
+
+
+def run_ingestion(
+    drive_factory,
+    configs,
+    max_workers=None,
+    file_timeout=None,
+    output_format=OUTPUT_FORMAT,
+    use_manifest=SKIP_CACHE,
+    report=None,
+) -> int:
+    """
+    Recorre bancos y cuentas y procesa los archivos PENDING con un pool acotado.
+
+    Las carpetas de cuenta se revisan en paralelo y sus archivos se encolan en
+    un segundo pool (compartido) de `max_workers` hilos. Usar dos pools evita
+    que las tareas de cuenta, que esperan a sus archivos, bloqueen el pool.
+    Si se pasa un `RunReport`, se rellena con los tiempos y contadores.
+    """
+    max_workers = max_workers or MAX_WORKERS
+    file_timeout = FILE_TIMEOUT if file_timeout is None else file_timeout
+    drive = get_thread_drive(drive_factory)
+
+    # Iteración por carpetas de Bancos
+    banks = list_files(drive, children_query(DRIVE_PARENT_FOLDER_ID, True))
+
+    # Cuentas de todos los bancos en una sola petición batch
+    bank_children = list_children_many(
+        drive, [b["id"] for b in banks], folders_only=True
+    )
+
+    accounts = []
+    for b in banks:
+        bname = b["name"]
+        for acc in bank_children[b["id"]]:
+            aname = acc["name"]
+            # Solo procesar si tenemos configuración para este banco/cuenta
+            if bname in configs and aname in configs[bname]:
+                accounts.append((acc, bname, configs[bname][aname]))
             else:
-                logging.warning(f"⚠️ Archivo vacío o datos inválidos: {fname}")
-                # Devolver a PENDING para revisión manual
-                move_file_in_drive(drive_service, fid, progress, pending)
+                logging.debug(f"ℹ️ Saltando carpeta no configurada: {bname}/{aname}")
+
+    logging.info(
+        f"⚙️ {len(accounts)} cuentas a revisar con {max_workers} workers (timeout por archivo: {file_timeout}s, ejecución {RUN_ID})"
+    )
+
+    # Subcarpetas (PENDING/PROCESSED/in_progress) de todas las cuentas, también en batch
+    account_children = list_children_many(
+        drive, [acc["id"] for acc, _, _ in accounts], folders_only=True
+    )
+    # Y el contenido de las carpetas in_progress, con sus leases
+    progress_ids = {
+        acc_id: f["id"]
+        for acc_id, folders in account_children.items()
+        for f in folders
+        if f["name"] == IN_PROGRESS_FOLDER
+    }
+    in_progress = list_children_many(drive, list(progress_ids.values()), LEASE_FIELDS)
+
+    manifest = None
+    if use_manifest:
+        manifest = IngestionManifest(
+            bucket=get_storage_client().bucket(GCS_BUCKET_NAME)
+        ).load()
 
-        except Exception as e:
-            logging.error(f"🔥 Error procesando {fname}: {e}")
+    def account_worker(acc, bname, config):
+        return process_account_folder(
+            get_thread_drive(drive_factory),
+            acc,
+            bname,
+            config,
+            file_executor=file_pool,
+            drive_factory=drive_factory,
+            file_timeout=file_timeout,
+            output_format=output_format,
+            manifest=manifest,
+            subfolders=account_children[acc["id"]],
+            in_progress_files=in_progress.get(progress_ids.get(acc["id"])),
+            report=report,
+        )
+
+    total_files = 0
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="file"
+    ) as file_pool, ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="account"
+    ) as account_pool:
+        futures = {
+            account_pool.submit(account_worker, *account): account
+            for account in accounts
+        }
+        for future in as_completed(futures):
+            acc, bname, _ = futures[future]
             try:
-                # Intentar devolver a PENDING si falla
-                move_file_in_drive(drive_service, fid, progress, pending)
-            except:
-                pass
+                total_files += future.result()
+            except Exception as e:
+                logging.error(f"🔥 Error revisando {bname}/{acc['name']}: {e}")
 
-    return count
+    if manifest is not None:
+        manifest.save()
+
+    drive_scheduler.log_summary()
+    gcs_scheduler.log_summary()
+    if report is not None:
+        report.set_api_metrics("drive", drive_scheduler.snapshot())
+        report.set_api_metrics("gcs", gcs_scheduler.snapshot())
+    return total_files
 
 
 # --- MAIN ENTRY POINT ---
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingesta Drive -> GCS")
+    parser.add_argument(
+        "--profile",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Perfilar con cProfile y guardar los N archivos más lentos",
+    )
+    parser.add_argument(
+        "--report",
+        type=Path,
+        default=RUN_REPORT_JSON,
+        help="Ruta del informe JSON de la ejecución",
+    )
+    parser.add_argument(
+        "--prometheus",
+        type=Path,
+        help="Escribir también las métricas en formato texto de Prometheus",
+    )
+    args = parser.parse_args()
+
     print(
         """
     ========================================
@@ -318,38 +1121,19 @@ if __name__ == "__main__":
                 ]
             )
 
-        drive = build("drive", "v3", credentials=creds)
-
-        # Iteración por carpetas de Bancos
-        q_banks = f"'{DRIVE_PARENT_FOLDER_ID}' in parents and mimeType='application/vnd.google-apps.folder' and trashed=false"
-        banks = (
-            drive.files()
-            .list(q=q_banks, fields="files(id, name)")
-            .execute()
-            .get("files", [])
-        )
+        # Un cliente de Drive por hilo, con timeout de socket acotado
+        def drive_factory():
+            http = AuthorizedHttp(creds, http=httplib2.Http(timeout=FILE_TIMEOUT))
+            return build("drive", "v3", http=http, cache_discovery=False)
 
-        total_files = 0
-        for b in banks:
-            bname = b["name"]
-            # Iteración por cuentas dentro del banco
-            q_acc = f"'{b['id']}' in parents and mimeType='application/vnd.google-apps.folder' and trashed=false"
-            accs = (
-                drive.files()
-                .list(q=q_acc, fields="files(id, name)")
-                .execute()
-                .get("files", [])
-            )
+        report = RunReport(RUN_ID, profile_top=args.profile)
+        total_files = run_ingestion(drive_factory, configs, report=report)
 
-            for acc in accs:
-                aname = acc["name"]
-                # Solo procesar si tenemos configuración para este banco/cuenta
-                if bname in configs and aname in configs[bname]:
-                    total_files += process_account_folder(
-                        drive, acc, bname, configs[bname][aname]
-                    )
-                else:
-                    logging.debug(f"ℹ️ Saltando carpeta no configurada: {bname}/{aname}")
+        report.log_summary()
+        report.write_json(args.report)
+        if args.prometheus:
+            report.write_prometheus(args.prometheus)
+        report.write_profiles(PROFILES_DIR)
 
         print(f"\n🎉 Proceso finalizado. Archivos procesados hoy: {total_files}")
 
@@ -0,0 +1,128 @@
+import json
+import logging
+import hashlib
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+from google.api_core.exceptions import PreconditionFailed
+
+from scheduler import gcs_scheduler
+
+# Ruta del manifiesto dentro del bucket de aterrizaje (fuera de bank/account/)
+MANIFEST_BLOB = "_state/ingestion_manifest.json"
+
+
+def file_content_key(file_meta: dict) -> str:
+    """
+    Clave por contenido de un archivo de Drive a partir de los metadatos del
+    listado. Los binarios traen md5Checksum; los Google Sheets no, así que se
+    identifican por id + modifiedTime (cambian si alguien edita la hoja).
+    """
+    if file_meta.get("md5Checksum"):
+        return f"md5:{file_meta['md5Checksum']}"
+    return f"sheet:{file_meta['id']}:{file_meta.get('modifiedTime', '')}"
+
+
+def config_version(config: dict, *extra) -> str:
+    """Huella corta de la configuración de banco/cuenta (más extras como el formato)."""
+    payload = json.dumps([config, *extra], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class IngestionManifest:
+    """
+    Registro persistente de archivos ya ingeridos, indexado por contenido y
+    versión de configuración. Permite saltar (sin descargar ni transformar)
+    los extractos que vuelven a PENDING o que se suben repetidos.
+
+    Se guarda en GCS (`MANIFEST_BLOB`) o en un JSON local. El guardado en GCS
+    usa precondición de generación y fusiona con lo que haya escrito otra
+    ejecución en paralelo, así que nunca se pierden entradas.
+    """
+
+    def __init__(self, bucket=None, local_path: Path = None):
+        self._bucket = bucket
+        self._local_path = Path(local_path) if local_path else None
+        self._entries = {}
+        self._dirty = set()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(file_meta: dict, version: str) -> str:
+        return f"{file_content_key(file_meta)}|{version}"
+
+    def load(self) -> "IngestionManifest":
+        self._entries, self._generation = self._read()
+        logging.info(f"📒 Manifiesto de ingesta cargado: {len(self._entries)} entradas")
+        return self
+
+    def _read(self) -> tuple[dict, int]:
+        if self._bucket is not None:
+            blob = gcs_scheduler.call(
+                lambda: self._bucket.get_blob(MANIFEST_BLOB), "get"
+            )
+            if blob is None:
+                return {}, 0
+            data = gcs_scheduler.call(blob.download_as_bytes, "download")
+            return json.loads(data), blob.generation
+        if self._local_path and self._local_path.exists():
+            return json.loads(self._local_path.read_text(encoding="utf-8")), 0
+        return {}, 0
+
+    def contains(self, key: str) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def get(self, key: str):
+        with self._lock:
+            return self._entries.get(key)
+
+    def record(self, key: str, **info):
+        info["processed_at"] = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        with self._lock:
+            self._entries[key] = info
+            self._dirty.add(key)
+
+    def save(self, max_attempts: int = 5):
+        with self._lock:
+            if not self._dirty:
+                return
+            pending = {k: self._entries[k] for k in self._dirty}
+
+        if self._bucket is None:
+            if self._local_path:
+                self._local_path.parent.mkdir(parents=True, exist_ok=True)
+                self._local_path.write_text(
+                    json.dumps(self._entries, indent=1, ensure_ascii=False),
+                    encoding="utf-8",
+                )
+        else:
+            for _ in range(max_attempts):
+                try:
+                    # if_generation_match=0 -> solo si el objeto aún no existe
+                    blob = self._bucket.blob(MANIFEST_BLOB)
+                    payload = json.dumps(self._entries, ensure_ascii=False)
+                    gcs_scheduler.call(
+                        lambda: blob.upload_from_string(
+                            payload,
+                            "application/json",
+                            if_generation_match=self._generation,
+                        ),
+                        "upload",
+                    )
+                    self._generation = blob.generation
+                    break
+                except PreconditionFailed:
+                    # Otra ejecución guardó antes: fusionamos y reintentamos
+                    remote, self._generation = self._read()
+                    with self._lock:
+                        self._entries = {**remote, **self._entries}
+            else:
+                logging.error("⚠️ No se pudo guardar el manifiesto de ingesta")
+                return
+
+        with self._lock:
+            self._dirty.difference_update(pending)
+        logging.info(f"📒 Manifiesto guardado (+{len(pending)} archivos)")
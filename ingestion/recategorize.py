@@ -0,0 +1,263 @@
+"""
+Recategorización selectiva del histórico tras un cambio en master_mapping.
+
+Silver solo recalcula la ventana reciente (lookback_days), así que una regla
+nueva o corregida no llega a las transacciones antiguas salvo con un full
+refresh. Este job toma las keywords que cambiaron (ingestion/state/
+mapping_changes.json, lo escribe sync_seeds.py), localiza SOLO las
+transacciones cuyo concepto_norm las contiene con el índice invertido de
+Silver (concepto_vocabulary + concepto_index, sin recorrer el histórico), las
+recategoriza con el motor de ingestion/categorizer.py (misma
+semántica que la macro) y actualiza grupo/categoria/subcategoria/comercio en
+Silver y Gold únicamente donde el resultado cambia. Después hay que refrescar
+los agregados mensuales (dbt run --select tag:rollup), que solo recalculan los
+meses de las filas tocadas.
+
+Uso:
+    python ingestion/recategorize.py
+    python ingestion/recategorize.py --keywords MERCADONA "AMAZON PRIME"
+    python ingestion/recategorize.py --dry-run
+"""
+
+import os
+import json
+import logging
+import argparse
+from pathlib import Path
+
+import pandas as pd
+from google.cloud import bigquery
+from dotenv import load_dotenv
+
+from categorizer import KeywordCategorizer, clean_text
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+load_dotenv(BASE_DIR / ".env")
+
+CHANGES_JSON = BASE_DIR / "ingestion" / "state" / "mapping_changes.json"
+
+PROJECT_ID = os.environ.get("GCP_PROJECT_ID") or "dwhfinancial"
+SILVER_TABLE = f"{PROJECT_ID}.silver.fct_transactions"
+VOCABULARY_TABLE = f"{PROJECT_ID}.silver.concepto_vocabulary"
+INDEX_TABLE = f"{PROJECT_ID}.silver.concepto_index"
+GOLD_TABLE = f"{PROJECT_ID}.gold.transactions"
+
+# Filas por sentencia UPDATE (el array va como parámetro de la query)
+UPDATE_BATCH = 5000
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+
+def load_changed_keywords(path: Path = CHANGES_JSON) -> tuple[list, dict]:
+    if not path.exists():
+        return [], {}
+    changes = json.loads(path.read_text(encoding="utf-8"))
+    if changes.get("applied_version") == changes.get("version"):
+        return [], changes
+    return changes.get("keywords", []), changes
+
+
+def keyword_probes(keywords) -> list:
+    """
+    Palabra más larga de cada keyword. Cada palabra de una keyword contenida
+    en concepto_norm está dentro de una palabra del concepto, así que basta
+    buscar una (la más selectiva) en el vocabulario.
+    """
+    return sorted({max(kw.split(" "), key=len) for kw in keywords})
+
+
+def run_query(client, query, **params) -> pd.DataFrame:
+    """Query con parámetros de tipo array (nombre=(tipo, valores))."""
+    job_config = bigquery.QueryJobConfig(
+        query_parameters=[
+            bigquery.ArrayQueryParameter(name, kind, list(values))
+            for name, (kind, values) in params.items()
+        ]
+    )
+    return client.query(query, job_config=job_config).to_dataframe()
+
+
+def fetch_affected(client, keywords) -> pd.DataFrame:
+    """
+    Transacciones de Silver cuyo concepto_norm contiene alguna keyword, sin
+    recorrer concepto_norm entero:
+
+    1. concepto_vocabulary (palabras distintas, tabla pequeña): palabras que
+       contienen la palabra más larga de cada keyword.
+    2. concepto_index (agrupado por token): hash_id y fecha de esas palabras;
+       BigQuery solo lee los bloques de esos tokens.
+    3. Silver, solo en las fechas candidatas (poda de particiones), confirmando
+       que el concepto contiene la keyword completa.
+
+    STRPOS y no LIKE para que un '%' o '_' de la keyword no actúe como comodín.
+    """
+    tokens = run_query(
+        client,
+        f"""
+        SELECT token
+        FROM `{VOCABULARY_TABLE}`
+        WHERE EXISTS (
+            SELECT 1 FROM UNNEST(@probes) AS probe WHERE STRPOS(token, probe) > 0
+        )
+        """,
+        probes=("STRING", keyword_probes(keywords)),
+    )["token"]
+    if tokens.empty:
+        return pd.DataFrame()
+
+    candidates = run_query(
+        client,
+        f"""
+        SELECT DISTINCT hash_id, fecha
+        FROM `{INDEX_TABLE}`
+        WHERE token IN UNNEST(@tokens)
+        """,
+        tokens=("STRING", tokens),
+    )
+    if candidates.empty:
+        return pd.DataFrame()
+
+    return run_query(
+        client,
+        f"""
+        SELECT hash_id, fecha, concepto, importe, grupo, categoria, subcategoria, comercio
+        FROM `{SILVER_TABLE}`
+        WHERE fecha IN UNNEST(@fechas)
+          AND hash_id IN UNNEST(@hash_ids)
+          AND EXISTS (
+              SELECT 1 FROM UNNEST(@keywords) AS kw WHERE STRPOS(concepto_norm, kw) > 0
+          )
+        """,
+        fechas=("DATE", sorted(set(candidates["fecha"]))),
+        hash_ids=("STRING", candidates["hash_id"]),
+        keywords=("STRING", keywords),
+    )
+
+
+def compute_updates(df: pd.DataFrame, engine: KeywordCategorizer) -> pd.DataFrame:
+    """Nuevas categorías, solo para las filas en las que algo cambia."""
+    labels = engine.categorize_series(df["concepto"], df["importe"].fillna(0))
+    parts = labels.str.split("|", n=3, expand=True)
+    updates = pd.DataFrame(
+        {
+            "hash_id": df["hash_id"],
+            "fecha": df["fecha"],
+            "concepto": df["concepto"],
+            "grupo": parts[0],
+            "categoria": parts[1],
+            "subcategoria": parts[2],
+            "entidad_comercio": parts[3],
+        }
+    )
+    # comercio: con entidad 'Desconocido' Silver usa INITCAP(concepto) (se calcula en SQL)
+    changed = (
+        (updates["grupo"] != df["grupo"])
+        | (updates["categoria"] != df["categoria"])
+        | (updates["subcategoria"] != df["subcategoria"])
+        | (
+            (updates["entidad_comercio"] != "Desconocido")
+            & (updates["entidad_comercio"] != df["comercio"])
+        )
+        | (
+            (updates["entidad_comercio"] == "Desconocido")
+            & (df["comercio"].str.lower() != df["concepto"].str.lower())
+        )
+    )
+    return updates[changed]
+
+
+def apply_updates(client, table: str, updates: pd.DataFrame) -> int:
+    # En Gold se sella _updated_at para que los agregados mensuales recalculen esos meses
+    touch = (
+        ",\n        _updated_at = CURRENT_TIMESTAMP()" if table == GOLD_TABLE else ""
+    )
+    query = f"""
+    UPDATE `{table}` t
+    SET grupo = u.grupo,
+        categoria = u.categoria,
+        subcategoria = u.subcategoria,
+        comercio = IF(u.entidad_comercio = 'Desconocido', INITCAP(t.concepto), u.entidad_comercio){touch}
+    FROM UNNEST(@updates) u
+    WHERE t.fecha IN UNNEST(@fechas)
+      AND t.hash_id = u.hash_id
+    """
+    fields = ["hash_id", "grupo", "categoria", "subcategoria", "entidad_comercio"]
+    updated = 0
+    for start in range(0, len(updates), UPDATE_BATCH):
+        batch = updates.iloc[start : start + UPDATE_BATCH]
+        structs = [
+            bigquery.StructQueryParameter(
+                None,
+                *[bigquery.ScalarQueryParameter(f, "STRING", row[f]) for f in fields],
+            )
+            for _, row in batch.iterrows()
+        ]
+        # Las fechas del lote: el UPDATE solo lee esas particiones
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[
+                bigquery.ArrayQueryParameter("updates", "STRUCT", structs),
+                bigquery.ArrayQueryParameter(
+                    "fechas", "DATE", sorted(set(batch["fecha"]))
+                ),
+            ]
+        )
+        job = client.query(query, job_config=job_config)
+        job.result()
+        updated += job.num_dml_affected_rows or 0
+    return updated
+
+
+def recategorize(keywords, dry_run=False, client=None) -> int:
+    keywords = sorted({clean_text(k) for k in keywords if str(k).strip()})
+    if not keywords:
+        logging.info("✅ No hay keywords cambiadas: nada que recategorizar")
+        return 0
+
+    client = client or bigquery.Client()
+    engine = KeywordCategorizer.from_csv()
+    logging.info(f"🔍 Recategorizando {len(keywords)} keywords (mapeo {engine.version})")
+
+    affected = fetch_affected(client, keywords)
+    logging.info(f"🎯 {len(affected)} transacciones contienen alguna keyword")
+    if affected.empty:
+        return 0
+
+    updates = compute_updates(affected, engine)
+    logging.info(f"✏️ {len(updates)} transacciones cambian de categoría")
+    if dry_run or updates.empty:
+        for _, row in updates.head(20).iterrows():
+            logging.info(
+                f"   {row['concepto']} -> {row['grupo']}|{row['categoria']}|"
+                f"{row['subcategoria']}|{row['entidad_comercio']}"
+            )
+        return len(updates)
+
+    for table in (SILVER_TABLE, GOLD_TABLE):
+        updated = apply_updates(client, table, updates)
+        logging.info(f"✅ {table}: {updated} filas actualizadas")
+    return len(updates)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recategorización selectiva")
+    parser.add_argument(
+        "--keywords", nargs="+", help="Keywords a revisar (por defecto, el último diff)"
+    )
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    changes = {}
+    keywords = args.keywords
+    if not keywords:
+        keywords, changes = load_changed_keywords()
+
+    recategorize(keywords, dry_run=args.dry_run)
+
+    # Marcamos el diff como aplicado para no repetirlo en la próxima ejecución
+    if changes and not args.dry_run and not args.keywords:
+        changes["applied_version"] = changes.get("version")
+        CHANGES_JSON.write_text(
+            json.dumps(changes, indent=1, ensure_ascii=False), encoding="utf-8"
+        )
@@ -0,0 +1,220 @@
+"""
+Artefacto precompilado de reglas de categorización para dbt.
+
+A partir de los seeds master_mapping.csv y map_entities.csv genera la macro
+`compiled_mapping_rules()` (transformation/macros/generated/mapping_rules.sql)
+con las keywords ya normalizadas, ordenadas por prioridad y sin duplicados.
+Cada seed va con el sha256 de su contenido: las macros solo usan el artefacto
+si coincide con el checksum del seed que ve dbt, sin consultar el warehouse.
+
+Uso (sync_seeds.py lo regenera automáticamente):
+    python ingestion/rules_artifact.py
+"""
+
+import json
+import hashlib
+import logging
+from pathlib import Path
+
+import pandas as pd
+
+from categorizer import (
+    BASE_DIR,
+    INCOME_GROUP,
+    MAPPING_CSV,
+    clean_text,
+    load_rules,
+    mapping_version,
+)
+
+ENTITIES_CSV = BASE_DIR / "transformation" / "seeds" / "map_entities.csv"
+RULES_MACRO = BASE_DIR / "transformation" / "macros" / "generated" / "mapping_rules.sql"
+
+LABEL_COLUMNS = ["grupo_categoria", "categoria", "subcategoria", "entity_name"]
+
+
+# dbt no calcula el checksum de seeds mayores de 1 MiB (usa la ruta)
+DBT_MAX_SEED_BYTES = 1024 * 1024
+
+
+def file_sha256(path: Path) -> str:
+    """
+    Mismo checksum que calcula dbt para el seed: sha256 del texto UTF-8 sin
+    espacios ni saltos de línea al principio y al final (load_file_contents
+    con strip=True + FileHash.from_contents).
+    """
+    if path.stat().st_size > DBT_MAX_SEED_BYTES:
+        logging.warning(
+            f"⚠️ {path.name} supera 1 MiB: dbt no le calcula checksum y el "
+            "artefacto de reglas no se usará"
+        )
+    contents = path.read_bytes().decode("utf-8").strip()
+    return hashlib.sha256(contents.encode("utf-8")).hexdigest()
+
+
+def _value(value):
+    # Las celdas vacías llegan a BigQuery como NULL: se conservan como none
+    return value if value != "" else None
+
+
+def compile_mapping_rules(path: Path = MAPPING_CSV) -> dict:
+    """
+    Reglas de master_mapping en el orden de evaluación de la macro.
+
+    - Duplicadas: misma keyword normalizada y mismo tipo de signo. Nunca
+      pueden ganar (la anterior siempre casa antes), así que se eliminan.
+    - Tapadas: contienen una keyword anterior del mismo tipo de signo, por lo
+      que esa otra regla gana siempre. Se conservan pero se señalan.
+    """
+    rules = load_rules(path)
+    compiled, conflicts, first_seen = [], [], {}
+
+    for _, row in rules.iterrows():
+        keyword = clean_text(row["keyword"])
+        is_income = row["grupo_categoria"] == INCOME_GROUP
+        label = "|".join(row[col] for col in LABEL_COLUMNS)
+        kept = first_seen.get((keyword, is_income))
+        if kept is not None:
+            conflicts.append(
+                {
+                    "type": "duplicate" if kept["label"] == label else "conflict",
+                    "keyword": keyword,
+                    "kept": kept["label"],
+                    "dropped": label,
+                }
+            )
+            continue
+
+        shadowed_by = next(
+            (
+                rule["clean_keyword"]
+                for rule in compiled
+                if rule["is_income"] == is_income and rule["clean_keyword"] in keyword
+            ),
+            None,
+        )
+        if shadowed_by:
+            conflicts.append(
+                {
+                    "type": "shadowed",
+                    "keyword": keyword,
+                    "kept": shadowed_by,
+                    "dropped": None,
+                }
+            )
+
+        rule = {
+            "clean_keyword": keyword,
+            "priority": int(row["priority"]),
+            "is_income": is_income,
+            **{col: _value(row[col]) for col in LABEL_COLUMNS},
+        }
+        first_seen[(keyword, is_income)] = {"label": label}
+        compiled.append(rule)
+
+    return {
+        "sha256": file_sha256(path),
+        "version": mapping_version(rules),
+        "rules": compiled,
+        "conflicts": conflicts,
+    }
+
+
+def compile_entity_rules(path: Path = ENTITIES_CSV) -> dict:
+    """Reglas de map_entities (la primera keyword normalizada gana)."""
+    entities = pd.read_csv(path, dtype=str, keep_default_na=False)
+    entities["priority"] = pd.to_numeric(entities["priority"], errors="coerce")
+    entities = entities.sort_values(["priority", "keyword"], kind="stable")
+
+    compiled, conflicts, first_seen = [], [], {}
+    for _, row in entities.iterrows():
+        keyword = clean_text(row["keyword"])
+        if keyword in first_seen:
+            conflicts.append(
+                {
+                    "type": (
+                        "duplicate"
+                        if first_seen[keyword] == row["entity_name"]
+                        else "conflict"
+                    ),
+                    "keyword": keyword,
+                    "kept": first_seen[keyword],
+                    "dropped": row["entity_name"],
+                }
+            )
+            continue
+        first_seen[keyword] = row["entity_name"]
+        compiled.append(
+            {"clean_keyword": keyword, "entity_name": _value(row["entity_name"])}
+        )
+
+    return {"sha256": file_sha256(path), "rules": compiled, "conflicts": conflicts}
+
+
+def _jinja_literal(value, indent=0) -> str:
+    """Serializa a literal Jinja (como JSON, pero con none/true/false)."""
+    pad = "    " * indent
+    if value is None:
+        return "none"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, str):
+        return json.dumps(value, ensure_ascii=False)
+    if isinstance(value, dict):
+        items = ", ".join(
+            f"{json.dumps(k)}: {_jinja_literal(v, indent + 1)}"
+            for k, v in value.items()
+        )
+        return "{" + items + "}"
+    if isinstance(value, list):
+        if not value:
+            return "[]"
+        inner = ",\n".join(pad + "    " + _jinja_literal(v, indent + 1) for v in value)
+        return "[\n" + inner + "\n" + pad + "]"
+    raise TypeError(f"Tipo no serializable: {type(value)}")
+
+
+def write_rules_artifact(
+    mapping_path: Path = MAPPING_CSV,
+    entities_path: Path = ENTITIES_CSV,
+    target: Path = RULES_MACRO,
+) -> dict:
+    artifact = {
+        "master_mapping": compile_mapping_rules(mapping_path),
+        "map_entities": compile_entity_rules(entities_path),
+    }
+
+    for seed, compiled in artifact.items():
+        for c in compiled["conflicts"]:
+            if c["type"] == "duplicate":
+                continue
+            logging.warning(
+                f"⚠️ [{seed}] Regla '{c['keyword']}' {c['type']}: gana '{c['kept']}'"
+                + (f", se descarta '{c['dropped']}'" if c["dropped"] else "")
+            )
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(
+        "-- AUTOGENERADO por ingestion/rules_artifact.py (sync_seeds.py). No editar a mano.\n"
+        "-- Reglas normalizadas y ordenadas por prioridad; cada seed lleva el sha256\n"
+        "-- de su CSV y solo se usa si coincide con el que carga dbt (ver mapping_artifact).\n\n"
+        "{% macro compiled_mapping_rules() %}\n"
+        f"{{{{ return({_jinja_literal(artifact)}) }}}}\n"
+        "{% endmacro %}\n",
+        encoding="utf-8",
+    )
+    logging.info(
+        f"🧩 Artefacto de reglas generado: {len(artifact['master_mapping']['rules'])} "
+        f"categorías, {len(artifact['map_entities']['rules'])} entidades "
+        f"(versión {artifact['master_mapping']['version']})"
+    )
+    return artifact
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    write_rules_artifact()
@@ -0,0 +1,244 @@
+"""
+Instrumentación de la ingesta: tiempos por etapa, bytes y filas por archivo.
+
+Cada archivo se procesa entero en un hilo, así que sus estadísticas viven en
+un thread-local mientras dura `RunReport.track_file`. Las funciones de
+transformación llaman a `stage()` / `count()` sin saber si hay informe activo
+(fuera de una ingesta, por ejemplo en local_runner, no hacen nada).
+
+Los tiempos de etapa son exclusivos: si una etapa abre otra (la escritura
+consume el generador que lee y normaliza), el tiempo de la interior no se
+cuenta dos veces, y la suma de etapas coincide con el tiempo del archivo.
+"""
+
+import io
+import json
+import time
+import heapq
+import pstats
+import cProfile
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+_current = threading.local()
+
+STAGES = [
+    "drive",
+    "download",
+    "read",
+    "normalize",
+    "hash",
+    "categorize",
+    "write",
+    "upload",
+]
+
+
+class FileStats:
+    def __init__(self, bank, account, name):
+        self.bank = bank
+        self.account = account
+        self.name = name
+        self.status = "pending"
+        self.seconds = dict.fromkeys(STAGES, 0.0)
+        self.counters = {}
+        self.duration = 0.0
+        self._stack = []
+
+    def enter(self, stage):
+        now = time.perf_counter()
+        if self._stack:
+            parent, started = self._stack[-1]
+            self.seconds[parent] += now - started
+        self._stack.append((stage, now))
+
+    def exit(self):
+        now = time.perf_counter()
+        stage, started = self._stack.pop()
+        self.seconds[stage] = self.seconds.get(stage, 0.0) + now - started
+        if self._stack:
+            # La etapa exterior vuelve a contar desde ahora
+            self._stack[-1] = (self._stack[-1][0], now)
+
+    def count(self, key, value):
+        self.counters[key] = self.counters.get(key, 0) + int(value)
+
+    def as_dict(self) -> dict:
+        return {
+            "bank": self.bank,
+            "account": self.account,
+            "file": self.name,
+            "status": self.status,
+            "seconds": round(self.duration, 4),
+            "stages": {k: round(v, 4) for k, v in self.seconds.items() if v},
+            **self.counters,
+        }
+
+
+@contextmanager
+def stage(name):
+    """Cronometra una etapa del archivo en curso (no-op sin informe activo)."""
+    stats = getattr(_current, "stats", None)
+    if stats is None:
+        yield
+        return
+    stats.enter(name)
+    try:
+        yield
+    finally:
+        stats.exit()
+
+
+def count(key, value):
+    stats = getattr(_current, "stats", None)
+    if stats is not None:
+        stats.count(key, value)
+
+
+def set_status(status):
+    stats = getattr(_current, "stats", None)
+    if stats is not None:
+        stats.status = status
+
+
+class RunReport:
+    """Informe de una ejecución: agrega FileStats y métricas de las APIs."""
+
+    def __init__(self, run_id, profile_top=0):
+        self.run_id = run_id
+        self.started_at = datetime.now(timezone.utc)
+        self._t0 = time.perf_counter()
+        self.files = []
+        self.api = {}
+        self.profile_top = profile_top
+        # Montículo (duración, n, FileStats, perfil) con los archivos más lentos
+        self._profiles = []
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def track_file(self, bank, account, name):
+        stats = FileStats(bank, account, name)
+        profiler = cProfile.Profile() if self.profile_top else None
+        _current.stats = stats
+        t0 = time.perf_counter()
+        if profiler is not None:
+            # cProfile solo perfila el hilo que lo activa: el del archivo
+            profiler.enable()
+        try:
+            yield stats
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            stats.duration = time.perf_counter() - t0
+            _current.stats = None
+            with self._lock:
+                self.files.append(stats)
+                if profiler is not None:
+                    self._keep_profile(stats, profiler)
+
+    def _keep_profile(self, stats, profiler):
+        self._seq += 1
+        entry = (stats.duration, self._seq, stats, profiler)
+        if len(self._profiles) < self.profile_top:
+            heapq.heappush(self._profiles, entry)
+        else:
+            heapq.heappushpop(self._profiles, entry)
+
+    def set_api_metrics(self, name, metrics: dict):
+        self.api[name] = metrics
+
+    def as_dict(self) -> dict:
+        totals = dict.fromkeys(STAGES, 0.0)
+        counters, status = {}, {}
+        for f in self.files:
+            for k, v in f.seconds.items():
+                totals[k] = totals.get(k, 0.0) + v
+            for k, v in f.counters.items():
+                counters[k] = counters.get(k, 0) + v
+            status[f.status] = status.get(f.status, 0) + 1
+        slowest = sorted(self.files, key=lambda f: f.duration, reverse=True)
+        return {
+            "run_id": self.run_id,
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "duration_seconds": round(time.perf_counter() - self._t0, 3),
+            "files": status,
+            "stage_seconds": {k: round(v, 4) for k, v in totals.items()},
+            "counters": counters,
+            "api": self.api,
+            "per_file": [f.as_dict() for f in slowest],
+        }
+
+    # --- Salidas ---
+
+    def write_json(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            json.dumps(self.as_dict(), indent=1, ensure_ascii=False), encoding="utf-8"
+        )
+        logging.info(f"📊 Informe de ejecución: {path}")
+
+    def write_prometheus(self, path: Path):
+        """Formato texto de Prometheus (p. ej. para el textfile collector)."""
+        report = self.as_dict()
+        lines = [
+            "# TYPE ingestion_run_duration_seconds gauge",
+            f"ingestion_run_duration_seconds {report['duration_seconds']}",
+            "# TYPE ingestion_files_total gauge",
+            *(
+                f'ingestion_files_total{{status="{k}"}} {v}'
+                for k, v in report["files"].items()
+            ),
+            "# TYPE ingestion_stage_seconds_total gauge",
+            *(
+                f'ingestion_stage_seconds_total{{stage="{k}"}} {v}'
+                for k, v in report["stage_seconds"].items()
+            ),
+            "# TYPE ingestion_counter_total gauge",
+            *(
+                f'ingestion_counter_total{{name="{k}"}} {v}'
+                for k, v in report["counters"].items()
+            ),
+            "# TYPE ingestion_api_total gauge",
+            *(
+                f'ingestion_api_total{{api="{api}",name="{k}"}} {v}'
+                for api, metrics in report["api"].items()
+                for k, v in metrics.items()
+            ),
+        ]
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        logging.info(f"📈 Métricas Prometheus: {path}")
+
+    def write_profiles(self, directory: Path, top_functions=25):
+        """Un .prof (para snakeviz/pstats) y un resumen .txt por archivo lento."""
+        if not self._profiles:
+            return
+        directory.mkdir(parents=True, exist_ok=True)
+        ranked = sorted(self._profiles, key=lambda e: e[0], reverse=True)
+        for rank, (duration, _, stats, profiler) in enumerate(ranked, 1):
+            stem = f"{rank:02d}_{stats.bank}_{stats.account}_{Path(stats.name).stem}"
+            profiler.dump_stats(directory / f"{stem}.prof")
+            text = io.StringIO()
+            pstats.Stats(profiler, stream=text).sort_stats("cumulative").print_stats(
+                top_functions
+            )
+            (directory / f"{stem}.txt").write_text(text.getvalue(), encoding="utf-8")
+            logging.info(f"🐢 {duration:.2f}s {stats.name} -> {stem}.prof")
+
+    def log_summary(self):
+        report = self.as_dict()
+        stages = ", ".join(
+            f"{k} {v:.2f}s" for k, v in report["stage_seconds"].items() if v
+        )
+        logging.info(
+            f"⏱️ {sum(report['files'].values())} archivos en "
+            f"{report['duration_seconds']:.1f}s ({stages})"
+        )
+        if report["counters"]:
+            logging.info(
+                "🔢 " + ", ".join(f"{k}={v}" for k, v in report["counters"].items())
+            )
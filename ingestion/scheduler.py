@@ -0,0 +1,165 @@
+import os
+import time
+import random
+import socket
+import logging
+import threading
+
+from googleapiclient.errors import HttpError
+from google.api_core import exceptions as gexc
+
+# Cuota de Drive: peticiones por segundo sostenidas y ráfaga máxima
+DRIVE_QPS = float(os.environ.get("INGESTION_DRIVE_QPS", "20"))
+DRIVE_BURST = int(os.environ.get("INGESTION_DRIVE_BURST", "40"))
+
+# Reintentos con backoff exponencial y jitter completo
+MAX_RETRIES = int(os.environ.get("INGESTION_MAX_RETRIES", "6"))
+BASE_DELAY = 0.5
+MAX_DELAY = 32.0
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+# Drive devuelve 403 (no 429) cuando se supera la cuota por usuario
+RATE_LIMIT_REASONS = {"rateLimitExceeded", "userRateLimitExceeded"}
+RETRYABLE_GCS = (
+    gexc.TooManyRequests,
+    gexc.InternalServerError,
+    gexc.BadGateway,
+    gexc.ServiceUnavailable,
+    gexc.GatewayTimeout,
+)
+
+
+class TokenBucket:
+    """Limitador compartido entre hilos: `rate` tokens/s con ráfaga de `capacity`."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def pause(self, seconds: float):
+        # Tras un 429 todos los hilos esperan, no solo el que lo recibió
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def acquire(self, tokens: int = 1) -> float:
+        """Bloquea hasta disponer de `tokens`; devuelve los segundos esperados."""
+        tokens = min(tokens, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if now >= self._paused_until and self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = max(
+                    self._paused_until - now, (tokens - self._tokens) / self.rate
+                )
+            time.sleep(delay)
+            waited += delay
+
+
+def classify_error(exc) -> tuple[bool, bool, float]:
+    """(reintentable, es limitación de cuota, Retry-After en segundos o 0)."""
+    if isinstance(exc, HttpError):
+        status = exc.resp.status
+        reasons = {
+            d.get("reason") for d in (exc.error_details or []) if isinstance(d, dict)
+        }
+        throttled = status == 429 or (
+            status == 403 and bool(reasons & RATE_LIMIT_REASONS)
+        )
+        retry_after = float(exc.resp.get("retry-after", 0) or 0)
+        return throttled or status in RETRYABLE_STATUS, throttled, retry_after
+    if isinstance(exc, RETRYABLE_GCS):
+        return True, isinstance(exc, gexc.TooManyRequests), 0.0
+    if isinstance(exc, (ConnectionError, TimeoutError, socket.timeout)):
+        return True, False, 0.0
+    return False, False, 0.0
+
+
+class CallScheduler:
+    """
+    Ejecuta llamadas a una API con límite de ritmo (opcional), reintentos con
+    backoff exponencial + jitter y métricas de limitación. Solo se deben pasar
+    llamadas idempotentes (o con `already_done` para comprobarlo antes de repetir).
+    """
+
+    def __init__(self, name, bucket: TokenBucket = None, max_retries=MAX_RETRIES):
+        self.name = name
+        self.bucket = bucket
+        self.max_retries = max_retries
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.metrics = {
+                "calls": 0,
+                "retries": 0,
+                "throttled": 0,
+                "failures": 0,
+                "wait_seconds": 0.0,
+                "backoff_seconds": 0.0,
+            }
+
+    def _count(self, key, value=1):
+        with self._lock:
+            self.metrics[key] += value
+
+    def call(self, fn, description="", cost=1, already_done=None):
+        for attempt in range(self.max_retries + 1):
+            if self.bucket is not None:
+                self._count("wait_seconds", self.bucket.acquire(cost))
+            self._count("calls")
+            try:
+                return fn()
+            except Exception as e:
+                retryable, throttled, retry_after = classify_error(e)
+                if throttled:
+                    self._count("throttled")
+                if not retryable or attempt == self.max_retries:
+                    self._count("failures")
+                    raise
+
+                delay = max(
+                    retry_after,
+                    random.uniform(0, min(MAX_DELAY, BASE_DELAY * 2**attempt)),
+                )
+                if throttled and self.bucket is not None:
+                    self.bucket.pause(delay)
+                self._count("retries")
+                self._count("backoff_seconds", delay)
+                logging.warning(
+                    f"🔁 {self.name} {description}: {type(e).__name__}, reintento "
+                    f"{attempt + 1}/{self.max_retries} en {delay:.1f}s"
+                )
+                time.sleep(delay)
+
+                # La llamada pudo completarse aunque se perdiera la respuesta
+                if already_done is not None and already_done():
+                    return None
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self.metrics)
+
+    def log_summary(self):
+        m = self.snapshot()
+        logging.info(
+            f"📶 {self.name}: {m['calls']} llamadas, {m['retries']} reintentos, "
+            f"{m['throttled']} limitadas, {m['failures']} fallidas, "
+            f"{m['wait_seconds']:.1f}s en cola de cuota, {m['backoff_seconds']:.1f}s de backoff"
+        )
+
+
+# Planificadores compartidos por todos los hilos de la ingesta
+drive_scheduler = CallScheduler("Drive", TokenBucket(DRIVE_QPS, DRIVE_BURST))
+gcs_scheduler = CallScheduler("GCS")
@@ -0,0 +1,292 @@
+"""
+Lectura de extractos compilada a partir de bank_configs.json.
+
+Cada configuración banco/cuenta se compila una vez, al cargar las
+configuraciones (`compile_readers`), en un `StatementReader`
+que sabe qué columnas pedir al parser (solo las de `column_mapping` y, con
+`filter_completed`, la del estado), con qué tipos, y qué filas descartar
+(operaciones no completadas o sin importe) en cuanto se lee cada bloque,
+antes de renombrar, copiar o parsear fechas e importes.
+
+La cabecera se localiza buscando la fila que contiene todas las columnas de
+`column_mapping`, así que un banner nuevo del banco no rompe la lectura;
+`skip_rows` solo se usa si no aparece. Los Excel (y las Google Sheets, que se
+exportan como xlsx) se leen fila a fila con calamine si está instalado.
+"""
+
+import io
+import csv
+import logging
+import itertools
+import threading
+from collections import deque
+from typing import IO, Iterable, Iterator, Optional
+
+import pandas as pd
+
+from run_report import count
+
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:  # Opcional: sin él se usa el engine por defecto de pandas
+    CalamineWorkbook = None
+
+# Columna de estado de los extractos de Revolut (según idioma de la app)
+STATE_COLUMNS = ("Estado", "State")
+COMPLETED_STATES = {"COMPLETADO", "COMPLETED"}
+
+# Formatos "%Y-%m-%d ...": la fecha son los 10 primeros caracteres
+ISO_DATE = "%Y-%m-%d"
+ISO_DATE_LEN = 10
+
+# Filas iniciales en las que se busca la cabecera
+HEADER_SCAN_ROWS = 50
+
+
+class FooterTrimmedReader(io.RawIOBase):
+    """
+    Envuelve un fichero binario y omite sus últimas `n_lines` líneas.
+
+    Equivale al `skipfooter` de pandas, pero sin leer el archivo entero y sin
+    obligar a usar el engine "python": permite el engine C y `chunksize`.
+    """
+
+    def __init__(self, raw: IO[bytes], n_lines: int):
+        self._lines = iter(raw)
+        self._held = deque()
+        self._n_lines = n_lines
+        self._buffer = bytearray()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while len(self._buffer) < len(b):
+            line = next(self._lines, None)
+            if line is None:
+                break
+            self._held.append(line)
+            if len(self._held) > self._n_lines:
+                self._buffer += self._held.popleft()
+        n = min(len(b), len(self._buffer))
+        b[:n] = self._buffer[:n]
+        del self._buffer[:n]
+        return n
+
+
+def _cell(value):
+    # Celda vacía: "" en calamine, NaN en pandas
+    if value == "" or value != value:
+        return None
+    return value
+
+
+def _text(value):
+    # calamine devuelve todos los números como float: 12345.0 -> "12345"
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+
+def iter_sheet_rows(file_bytes: IO[bytes]) -> Iterator[tuple]:
+    """Filas de la primera hoja de un Excel (xlsx, xls u ods)."""
+    if CalamineWorkbook is not None:
+        sheet = CalamineWorkbook.from_filelike(file_bytes).get_sheet_by_index(0)
+        yield from sheet.iter_rows()
+        return
+    df = pd.read_excel(file_bytes, header=None, dtype=object)
+    yield from df.itertuples(index=False, name=None)
+
+
+class StatementReader:
+    def __init__(self, config: dict):
+        self.config = config
+        mapping = config.get("column_mapping", {})
+        self.skip_rows = config.get("skip_rows", 0)
+        self.skip_footer = config.get("skip_footer", 0)
+        self.date_format = config.get("date_format")
+        self.filter_completed = bool(config.get("filter_completed"))
+
+        state_columns = STATE_COLUMNS if self.filter_completed else ()
+        self.header_columns = set(mapping)
+        self.columns = set(mapping) | set(state_columns)
+        self.amount_columns = [k for k, v in mapping.items() if v == "importe"]
+
+        # Todo como texto salvo el importe: el concepto no depende de la
+        # inferencia de tipos de cada bloque (el hash tampoco) y la fecha se
+        # parsea después con su formato fijo. En Excel la fecha ya llega como
+        # fecha y se deja tal cual.
+        self.text_columns = {k for k, v in mapping.items() if v == "concepto"} | set(
+            state_columns
+        )
+        self.csv_dtypes = dict.fromkeys(
+            self.text_columns | {k for k, v in mapping.items() if v == "fecha"}, str
+        )
+        # El lector se comparte entre los hilos de la ingesta
+        self._warned_state = False
+        self._warn_lock = threading.Lock()
+
+    def _usecols(self, column) -> bool:
+        # Callable: las columnas que falten no rompen la lectura (normalize
+        # avisa después con la lista de columnas encontradas)
+        return column in self.columns
+
+    def find_header(self, rows: Iterable) -> Optional[int]:
+        """Índice de la primera fila que contiene todas las columnas mapeadas."""
+        for i, row in enumerate(itertools.islice(rows, HEADER_SCAN_ROWS)):
+            cells = {str(c).strip().lstrip("\ufeff") for c in row if c is not None}
+            if self.header_columns <= cells:
+                return i
+        return None
+
+    def _header_row(self, found: Optional[int], file_name) -> int:
+        if found is not None:
+            return found
+        logging.warning(
+            f"⚠️ No se encontró la cabecera en {file_name}, se usa skip_rows={self.skip_rows}"
+        )
+        return self.skip_rows
+
+    def read(self, file_bytes, file_type, chunk_rows=None, file_name=""):
+        """
+        Lee el extracto crudo. Con `chunk_rows` los CSV se devuelven como un
+        iterador de bloques; los Excel siempre se leen de una vez.
+        """
+        if "csv" not in file_type:
+            return self.filter_rows(self.read_excel(file_bytes, file_name))
+
+        # Solo se miran las primeras líneas para situar la cabecera
+        head = [
+            line.decode("utf-8", errors="replace")
+            for line in itertools.islice(file_bytes, HEADER_SCAN_ROWS)
+        ]
+        file_bytes.seek(0)
+        skip_rows = self._header_row(self.find_header(csv.reader(head)), file_name)
+
+        source = file_bytes
+        if self.skip_footer:
+            source = io.BufferedReader(
+                FooterTrimmedReader(file_bytes, self.skip_footer)
+            )
+        reader = pd.read_csv(
+            source,
+            skiprows=skip_rows,
+            usecols=self._usecols,
+            dtype=self.csv_dtypes,
+            encoding="utf-8",
+            chunksize=chunk_rows,
+        )
+        if chunk_rows:
+            return (self.filter_rows(chunk) for chunk in reader)
+        return self.filter_rows(reader)
+
+    def read_excel(self, file_bytes, file_name="") -> pd.DataFrame:
+        """
+        Recorre las filas de la hoja una vez: localiza la cabecera y de cada
+        fila de datos copia solo las celdas de las columnas que se usan.
+        """
+        rows = iter_sheet_rows(file_bytes)
+        scanned = list(itertools.islice(rows, HEADER_SCAN_ROWS))
+        header_at = self._header_row(self.find_header(scanned), file_name)
+        if header_at >= len(scanned):
+            return pd.DataFrame()
+
+        positions = {}
+        for i, name in enumerate(scanned[header_at]):
+            name = str(name).strip()
+            if self._usecols(name):
+                positions.setdefault(name, i)
+
+        width = max(positions.values(), default=-1) + 1
+        records = [
+            [_cell(row[i]) for i in positions.values()]
+            for row in itertools.chain(scanned[header_at + 1 :], rows)
+            if len(row) >= width
+        ]
+        if self.skip_footer:
+            records = records[: -self.skip_footer]
+
+        df = pd.DataFrame(records, columns=list(positions), dtype=object)
+        for col in self.text_columns & set(df.columns):
+            df[col] = df[col].map(_text, na_action="ignore")
+        return df
+
+    def filter_rows(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Descarta operaciones no completadas y filas sin importe."""
+        count("rows_read", len(df))
+        keep = pd.Series(True, index=df.index)
+        for col in self.amount_columns:
+            if col in df.columns:
+                keep &= df[col].notna()
+
+        if self.filter_completed:
+            state = next((c for c in STATE_COLUMNS if c in df.columns), None)
+            if state is not None:
+                values = df[state].astype(str).str.strip().str.upper()
+                keep &= values.isin(COMPLETED_STATES)
+            elif self._claim_state_warning():
+                logging.warning(
+                    f"⚠️ filter_completed sin columna de estado ({'/'.join(STATE_COLUMNS)}): no se filtra"
+                )
+
+        if keep.all():
+            return df
+        count("rows_filtered", int((~keep).sum()))
+        return df[keep]
+
+    def _claim_state_warning(self) -> bool:
+        """True solo para el primer hilo que llega: el aviso sale una vez."""
+        with self._warn_lock:
+            first, self._warned_state = not self._warned_state, True
+        return first
+
+    def parse_fecha(self, values: pd.Series) -> pd.Series:
+        """
+        Fechas a texto YYYY-MM-DD parseando cada valor distinto una sola vez
+        (un extracto repite pocas fechas en muchas filas). Con formatos
+        "%Y-%m-%d ..." se parsean solo los 10 primeros caracteres, así que
+        las marcas de tiempo del mismo día se agrupan.
+        """
+        date_format = self.date_format
+        if (
+            date_format
+            and date_format.startswith(ISO_DATE)
+            and pd.api.types.is_string_dtype(values)
+        ):
+            values, date_format = values.str.slice(0, ISO_DATE_LEN), ISO_DATE
+
+        codes, uniques = pd.factorize(values)
+        # Un nulo al final: los valores vacíos (código -1) caen en él
+        uniques = pd.Series(uniques).reindex(range(len(uniques) + 1))
+        parsed = pd.to_datetime(uniques, format=date_format, errors="coerce")
+        return parsed.dt.strftime("%Y-%m-%d").take(codes).set_axis(values.index)
+
+
+_readers: dict = {}
+_readers_lock = threading.Lock()
+
+
+def compile_readers(configs: dict) -> dict:
+    """Compila un StatementReader por banco/cuenta. Se llama al cargar las configuraciones."""
+    readers = {
+        (bank, account): StatementReader(config)
+        for bank, accounts in configs.items()
+        for account, config in accounts.items()
+    }
+    with _readers_lock:
+        _readers.update(readers)
+    return readers
+
+
+def get_reader(bank: str, account: str, config: dict) -> StatementReader:
+    """
+    Lector ya compilado de banco/cuenta. Si la configuración no es la que se
+    cargó (otra copia o una editada a mano), se compila y pasa a ser la vigente.
+    """
+    reader = _readers.get((bank, account))
+    if reader is not None and reader.config is config:
+        return reader
+    reader = StatementReader(config)
+    with _readers_lock:
+        _readers[(bank, account)] = reader
+    return reader
@@ -1,5 +1,9 @@
 import os
+import io
+import json
 import logging
+import argparse
+from datetime import datetime, timezone
 import pandas as pd
 from pathlib import Path
 from googleapiclient.discovery import build
@@ -7,9 +11,19 @@ from google.oauth2 import service_account
 from google.auth import default
 from dotenv import load_dotenv
 
+from categorizer import RULE_COLUMNS, clean_text, load_rules, mapping_version
+from main import GCS_BUCKET_NAME, get_storage_client
+from rules_artifact import write_rules_artifact
+from scheduler import gcs_scheduler
+
 # --- CONFIGURACIÓN ---
 BASE_DIR = Path(__file__).resolve().parent.parent
 TARGET_CSV = BASE_DIR / "transformation" / "seeds" / "master_mapping.csv"
+# Último diff aplicado: lo consume la recategorización selectiva
+CHANGES_JSON = BASE_DIR / "ingestion" / "state" / "mapping_changes.json"
+# Mapeo que ya está cargado en el warehouse. Vive en GCS porque el CSV del repo
+# no se commitea de vuelta: es la única referencia que sobrevive entre ejecuciones
+APPLIED_BLOB = "_state/master_mapping_applied.csv"
 
 load_dotenv(BASE_DIR / ".env")
 
@@ -35,6 +49,136 @@ def get_credentials():
         return creds
 
 
+def build_mapping_frame(rows: list) -> pd.DataFrame:
+    """Filas crudas de la hoja -> DataFrame con tantas columnas como cabeceras."""
+    headers = rows[0]
+    width = len(headers)
+    df = pd.DataFrame(
+        [row[:width] + [""] * (width - len(row)) for row in rows[1:]],
+        columns=headers,
+    )
+
+    if "priority" in df.columns:
+        df["priority"] = (
+            pd.to_numeric(df["priority"], errors="coerce").fillna(50).astype(int)
+        )
+
+    if "keyword" in df.columns:
+        df["keyword"] = df["keyword"].astype(str).str.strip()
+
+    return df
+
+
+def diff_rules(old: pd.DataFrame, new: pd.DataFrame) -> dict:
+    """
+    Diff estable (ordenado por keyword) entre dos versiones del mapeo.
+    Una regla cambiada es una keyword que sigue existiendo con otros valores.
+    """
+
+    def records(df):
+        df = df.reindex(columns=RULE_COLUMNS).fillna("").astype(str)
+        return {tuple(r) for r in df.itertuples(index=False)}
+
+    before, after = records(old), records(new)
+    removed = {r[0]: r for r in before - after}
+    added = {r[0]: r for r in after - before}
+    changed = sorted(removed.keys() & added.keys())
+
+    def as_dict(record):
+        return dict(zip(RULE_COLUMNS, record))
+
+    diff = {
+        "added": [as_dict(added[k]) for k in sorted(added.keys() - removed.keys())],
+        "removed": [as_dict(removed[k]) for k in sorted(removed.keys() - added.keys())],
+        "changed": [
+            {"keyword": k, "before": as_dict(removed[k]), "after": as_dict(added[k])}
+            for k in changed
+        ],
+    }
+    # Keywords normalizadas cuyas transacciones pueden cambiar de categoría
+    diff["keywords"] = sorted({clean_text(k) for k in removed.keys() | added.keys()})
+    return diff
+
+
+def mapping_csv_bytes(df: pd.DataFrame) -> bytes:
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False, lineterminator="\n")
+    return buffer.getvalue().encode("utf-8")
+
+
+def write_if_changed(df: pd.DataFrame, path) -> bool:
+    """Escribe el CSV solo si su contenido cambia (dbt seed y el artefacto dependen de ello)."""
+    content = mapping_csv_bytes(df)
+    if path.exists() and path.read_bytes() == content:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    return True
+
+
+def state_bucket():
+    if not GCS_BUCKET_NAME:
+        return None
+    return get_storage_client().bucket(GCS_BUCKET_NAME)
+
+
+def read_applied(bucket):
+    """CSV del último mapeo aplicado, o None si aún no se ha registrado ninguno."""
+    blob = gcs_scheduler.call(lambda: bucket.get_blob(APPLIED_BLOB), "get")
+    if blob is None:
+        return None
+    return gcs_scheduler.call(blob.download_as_bytes, "download")
+
+
+def mark_applied(path=TARGET_CSV):
+    """
+    Registra el seed como aplicado. El pipeline lo llama al final, cuando
+    dbt seed y la recategorización han terminado: si algo falla antes, la
+    siguiente ejecución vuelve a ver el mismo cambio y lo reintenta.
+    """
+    bucket = state_bucket()
+    if bucket is None:
+        logging.error("❌ Falta GCS_BUCKET_NAME. Verifica tu archivo .env")
+        exit(1)
+    content = Path(path).read_bytes()
+    blob = bucket.blob(APPLIED_BLOB)
+    gcs_scheduler.call(
+        lambda: blob.upload_from_string(content, content_type="text/csv"), "upload"
+    )
+    version = mapping_version(load_rules(path))
+    logging.info(f"📌 Mapeo {version} registrado como aplicado en {APPLIED_BLOB}")
+
+
+def applied_baseline():
+    """
+    (contenido, fiable) del mapeo contra el que comparar la hoja. Sin estado en
+    GCS se usa el CSV del repo; `fiable` es False si no sabemos qué tiene el
+    warehouse (primera ejecución) y hay que recargar el seed igualmente.
+    """
+    bucket = state_bucket()
+    if bucket is not None:
+        applied = read_applied(bucket)
+        if applied is not None:
+            return applied, True
+        logging.warning(
+            f"⚠️ No hay {APPLIED_BLOB}: se recarga el seed y se compara contra el del repo"
+        )
+    else:
+        logging.warning(
+            "⚠️ Sin GCS_BUCKET_NAME: se compara contra el seed del repo, no contra el aplicado"
+        )
+    content = TARGET_CSV.read_bytes() if TARGET_CSV.exists() else None
+    return content, bucket is None
+
+
+def publish_changed_flag(changed: bool):
+    """En GitHub Actions deja `seeds_changed` como output del paso."""
+    output = os.environ.get("GITHUB_OUTPUT")
+    if output:
+        with open(output, "a", encoding="utf-8") as f:
+            f.write(f"seeds_changed={'true' if changed else 'false'}\n")
+
+
 def sync_seeds():
     print(
         f"""
@@ -92,36 +236,65 @@ def sync_seeds():
         logging.info(f"📥 Descargadas {len(rows)} filas.")
 
         # 5. PROCESAMIENTO
-        headers = rows[0]
-        expected_cols = len(headers)
-        raw_data = rows[1:]
-
-        normalized_data = []
-        for row in raw_data:
-            if len(row) < expected_cols:
-                row = row + [""] * (expected_cols - len(row))
-            elif len(row) > expected_cols:
-                row = row[:expected_cols]
-            normalized_data.append(row)
-
-        df = pd.DataFrame(normalized_data, columns=headers)
-
-        if "priority" in df.columns:
-            df["priority"] = (
-                pd.to_numeric(df["priority"], errors="coerce").fillna(50).astype(int)
-            )
+        df = build_mapping_frame(rows)
+
+        # 6. DIFF CONTRA EL ÚLTIMO MAPEO APLICADO (no contra el CSV del checkout)
+        applied, reliable = applied_baseline()
+        if applied is not None:
+            old = pd.read_csv(io.BytesIO(applied), dtype=str, keep_default_na=False)
+            previous_version = mapping_version(load_rules(io.BytesIO(applied)))
+        else:
+            old, previous_version = pd.DataFrame(columns=RULE_COLUMNS), None
+        diff = diff_rules(old, df)
 
-        if "keyword" in df.columns:
-            df["keyword"] = df["keyword"].astype(str).str.strip()
+        # 7. SEED Y ARTEFACTO DE REGLAS PRECOMPILADO (lo leen las macros de dbt)
+        if write_if_changed(df, TARGET_CSV):
+            write_rules_artifact(mapping_path=TARGET_CSV)
+            logging.info(f"💾 Seed reescrito en {TARGET_CSV}")
+        version = mapping_version(load_rules(TARGET_CSV))
 
-        TARGET_CSV.parent.mkdir(parents=True, exist_ok=True)
-        df.to_csv(TARGET_CSV, index=False, encoding="utf-8")
+        if reliable and applied == mapping_csv_bytes(df):
+            logging.info("⏭️ El mapeo no ha cambiado desde la última aplicación")
+            publish_changed_flag(False)
+            return
+
+        logging.info(
+            f"✅ Mapeo {previous_version} -> {version}: +{len(diff['added'])} "
+            f"-{len(diff['removed'])} ~{len(diff['changed'])} reglas"
+        )
+        for keyword in diff["keywords"]:
+            logging.info(f"   🔑 {keyword}")
 
-        logging.info(f"✅ Archivo guardado correctamente en: {TARGET_CSV}")
+        # 8. REGISTRO DEL CAMBIO (keywords afectadas, para recategorizar solo eso)
+        if diff["keywords"]:
+            diff["generated_at"] = datetime.now(timezone.utc).isoformat(
+                timespec="seconds"
+            )
+            diff["previous_version"] = previous_version
+            diff["version"] = version
+            CHANGES_JSON.parent.mkdir(parents=True, exist_ok=True)
+            CHANGES_JSON.write_text(
+                json.dumps(diff, indent=1, ensure_ascii=False), encoding="utf-8"
+            )
+            logging.info(f"📝 Cambios registrados en {CHANGES_JSON}")
+        publish_changed_flag(True)
 
     except Exception as e:
         logging.error(f"🔥 Error crítico: {e}")
 
 
 if __name__ == "__main__":
-    sync_seeds()
+    parser = argparse.ArgumentParser(
+        description="Sincroniza master_mapping desde Sheets"
+    )
+    parser.add_argument(
+        "--mark-applied",
+        action="store_true",
+        help="Registra el seed actual como aplicado (tras dbt seed y recategorize)",
+    )
+    args = parser.parse_args()
+
+    if args.mark_applied:
+        mark_applied()
+    else:
+        sync_seeds()
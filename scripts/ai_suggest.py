@@ -1,25 +1,184 @@
 import os
-import pandas as pd
-import google.generativeai as genai
-from google.cloud import bigquery
+import re
+import csv
+import io
+import sys
+import json
+import argparse
+from datetime import datetime, timezone
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from difflib import SequenceMatcher
 from pathlib import Path
+
+import pandas as pd
 from dotenv import load_dotenv
 
 # --- CONFIGURACIÓN ---
 BASE_DIR = Path(__file__).resolve().parent.parent
 load_dotenv(BASE_DIR / ".env")
 
+# Misma normalización que concepto_norm (Bronze) y el motor de categorías
+sys.path.insert(0, str(BASE_DIR / "ingestion"))
+from categorizer import INCOME_GROUP, clean_text, load_rules  # noqa: E402
+
 # Credenciales
 GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
 # Para BigQuery usamos las credenciales de servicio
-os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = os.environ.get(
-    "GOOGLE_APPLICATION_CREDENTIALS"
-)
+if os.environ.get("GOOGLE_APPLICATION_CREDENTIALS"):
+    os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = os.environ.get(
+        "GOOGLE_APPLICATION_CREDENTIALS"
+    )
 
 # Archivos
 SEEDS_DIR = BASE_DIR / "transformation" / "seeds"
 MAPPING_FILE = SEEDS_DIR / "master_mapping.csv"
 OUTPUT_FILE = BASE_DIR / "suggested_mappings.csv"
+# Respuestas ya pagadas, por comercio normalizado: una re-ejecución no las vuelve a pedir
+CACHE_FILE = BASE_DIR / "ingestion" / "state" / "ai_suggestions_cache.json"
+
+MAPPING_COLUMNS = [
+    "keyword",
+    "priority",
+    "grupo_categoria",
+    "categoria",
+    "subcategoria",
+    "entity_name",
+]
+
+# Tamaño de cada prompt y peticiones simultáneas a Gemini
+BATCH_SIZE = 40
+BATCH_MAX_CHARS = 3000
+MAX_CONCURRENCY = 3
+
+# Modelos en orden de preferencia ("stub" = modelo local sin red, para pruebas)
+MODELS_TO_TRY = [
+    "gemini-2.0-flash",  # Tu modelo más potente disponible
+    "gemini-flash-latest",  # El alias seguro
+    "gemini-pro-latest",  # Fallback a Pro
+]
+STUB_MODEL = "stub"
+
+# Palabras de operativa bancaria que no identifican al comercio
+NOISE_TOKENS = {
+    "COMPRA",
+    "COMPRAS",
+    "PAGO",
+    "PAGOS",
+    "TARJ",
+    "TARJETA",
+    "CARD",
+    "EN",
+    "DE",
+    "RECIBO",
+    "ADEUDO",
+    "CARGO",
+    "TRANSF",
+    "TRANSFERENCIA",
+    "CONTACTLESS",
+    "VISA",
+    "APPLE",
+    "PAY",
+}
+MERCHANT_TOKENS = 2
+
+# Preclasificación local: similitud mínima para no preguntar a la IA, longitud
+# mínima de keyword (las cortas casan con cualquier cosa) y candidatos a puntuar
+MIN_CONFIDENCE = 0.85
+MIN_KEYWORD_LEN = 4
+MAX_CANDIDATES = 20
+LOCAL_MODEL = "local"
+
+
+# Separadores de tokens: todo lo que no es letra/dígito ('NETFLIX.COM' -> NETFLIX, COM)
+TOKEN_SPLIT_RE = re.compile(r"[^A-Z0-9&]+")
+
+
+def merchant_key(concepto) -> str:
+    """
+    Clave de agrupación: los primeros tokens significativos del concepto
+    normalizado (sin operativa bancaria, fechas, números de tarjeta ni
+    importes). 'COMPRA TARJ. 1234 MERCADONA CASTELLON 12/03' -> 'MERCADONA CASTELLON'.
+    """
+    tokens = TOKEN_SPLIT_RE.split(clean_text(concepto))
+    meaningful = [
+        t
+        for t in tokens
+        if len(t) > 1 and t not in NOISE_TOKENS and not re.search(r"\d", t)
+    ]
+    return " ".join(meaningful[:MERCHANT_TOKENS]) or clean_text(concepto)
+
+
+def char_ngrams(text: str, n=3) -> set:
+    padded = f" {text} "
+    return {padded[i : i + n] for i in range(len(padded) - n + 1)}
+
+
+class KeywordSimilarityIndex:
+    """
+    Índice de trigramas sobre las keywords de gasto de master_mapping. Sirve
+    para proponer la regla existente más parecida a un concepto sin clasificar
+    (erratas, sufijos del TPV, ciudades...) sin pasar por la IA.
+    """
+
+    def __init__(self, rules: pd.DataFrame):
+        # Los conceptos pendientes son gastos: las reglas de Ingresos no aplican
+        rules = rules[rules["grupo_categoria"] != INCOME_GROUP]
+        self.rules = []
+        self.postings = defaultdict(set)
+        for _, row in rules.iterrows():
+            keyword = clean_text(row["keyword"])
+            if len(keyword) < MIN_KEYWORD_LEN:
+                continue
+            rank = len(self.rules)
+            self.rules.append((keyword, row))
+            for gram in char_ngrams(keyword):
+                self.postings[gram].add(rank)
+
+    @classmethod
+    def from_csv(cls, path: Path = MAPPING_FILE) -> "KeywordSimilarityIndex":
+        return cls(load_rules(path))
+
+    def best_match(self, concepto) -> tuple[float, int]:
+        """(similitud, rango de la regla) de la keyword más parecida; (0, -1) si ninguna."""
+        text = clean_text(concepto)
+        shared = Counter()
+        for gram in char_ngrams(text):
+            shared.update(self.postings.get(gram, ()))
+
+        tokens = [t for t in TOKEN_SPLIT_RE.split(text) if t]
+        best = (0.0, -1)
+        for rank, _ in shared.most_common(MAX_CANDIDATES):
+            keyword = self.rules[rank][0]
+            width = len(keyword.split())
+            # Se compara con cada ventana de tantos tokens como tiene la keyword
+            windows = [
+                " ".join(tokens[i : i + width])
+                for i in range(max(1, len(tokens) - width + 1))
+            ]
+            score = max(SequenceMatcher(None, keyword, w).ratio() for w in windows)
+            # A igual similitud gana la regla de mayor prioridad (menor rango)
+            if score > best[0] or (score == best[0] and rank < best[1]):
+                best = (score, rank)
+        return best
+
+
+def preclassify(groups: dict, index, min_confidence=MIN_CONFIDENCE) -> dict:
+    """Propuestas locales (merchant_key -> fila) con similitud >= min_confidence."""
+    proposals = {}
+    for key, example in groups.items():
+        score, rank = index.best_match(example)
+        if rank < 0 or score < min_confidence:
+            continue
+        keyword, rule = index.rules[rank]
+        proposals[key] = {
+            "keyword": key,
+            "priority": str(rule["priority"]),
+            **{col: rule[col] for col in MAPPING_COLUMNS[2:]},
+            "model": f"{LOCAL_MODEL}:{keyword}",
+            "confidence": round(score, 3),
+        }
+    return proposals
 
 
 def configure_ai():
@@ -27,22 +186,28 @@ def configure_ai():
         print("❌ Error: Falta GEMINI_API_KEY en el .env")
         return False
 
+    import google.generativeai as genai
+
     genai.configure(api_key=GEMINI_API_KEY)
     return True
 
 
-def get_uncategorized_concepts():
-    """Consulta BigQuery para obtener conceptos sin clasificar."""
+def get_uncategorized_concepts(limit=None):
+    """Consulta BigQuery para obtener conceptos sin clasificar (los más frecuentes primero)."""
+    from google.cloud import bigquery
+
     client = bigquery.Client()
 
     # Ajusta esta query según tus datos reales en Silver
-    query = """
-    SELECT DISTINCT concepto
+    query = f"""
+    SELECT concepto, COUNT(*) AS movimientos
     FROM `dwhfinancial.silver.fct_transactions`
     WHERE (grupo IS NULL OR grupo = 'Sin Clasificar' OR grupo = 'Gastos Variables')
       AND (categoria IS NULL OR categoria = 'Otros Gastos')
       AND (subcategoria IS NULL OR subcategoria = 'Sin Clasificar')
-    LIMIT 20
+    GROUP BY concepto
+    ORDER BY movimientos DESC
+    {f"LIMIT {int(limit)}" if limit else ""}
     """
 
     try:
@@ -72,81 +237,226 @@ def get_categories_context():
         return "Estructura estándar."
 
 
-def try_generate(model_name, prompt):
-    """Intenta generar contenido con un modelo específico."""
-    print(f"🤖 Probando con modelo: {model_name}...")
-    model = genai.GenerativeModel(model_name)
-    response = model.generate_content(prompt)
-    return response.text
+def group_by_merchant(concepts) -> dict:
+    """merchant_key -> ejemplo representativo (el primero, que es el más frecuente)."""
+    groups = {}
+    for concepto in concepts:
+        groups.setdefault(merchant_key(concepto), concepto)
+    return groups
 
 
-def generate_suggestions(concepts, context_structure):
-
-    prompt = f"""
+def load_cache(path: Path = CACHE_FILE) -> dict:
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        print(f"⚠️ Caché corrupta en {path}, se ignora.")
+        return {}
+
+
+def save_cache(cache: dict, path: Path = CACHE_FILE):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(
+        json.dumps(cache, indent=1, ensure_ascii=False, sort_keys=True),
+        encoding="utf-8",
+    )
+    tmp.replace(path)
+
+
+def make_batches(groups: dict, size=BATCH_SIZE, max_chars=BATCH_MAX_CHARS):
+    """Lotes de como mucho `size` comercios y `max_chars` caracteres de ejemplos."""
+    batch, chars = [], 0
+    for key, example in groups.items():
+        if batch and (len(batch) >= size or chars + len(example) > max_chars):
+            yield batch
+            batch, chars = [], 0
+        batch.append((key, example))
+        chars += len(example)
+    if batch:
+        yield batch
+
+
+def build_prompt(batch, context_structure) -> str:
+    lines = "\n".join(f"{i}: {example}" for i, (_, example) in enumerate(batch))
+    return f"""
     Eres un experto Data Engineer. Clasifica estos movimientos bancarios siguiendo MI estructura.
 
     MIS CATEGORÍAS VÁLIDAS:
     {context_structure}
 
     INSTRUCCIONES:
-    Genera un CSV (sin markdown) con: keyword,priority,grupo_categoria,categoria,subcategoria,entity_name
+    Genera un CSV (sin markdown ni cabecera) con: id,keyword,priority,grupo_categoria,categoria,subcategoria,entity_name
 
     REGLAS:
-    1. keyword: Texto clave del concepto en MAYÚSCULAS.
-    2. priority: 50.
-    3. entity_name: Nombre limpio (Title Case).
-    4. Usa solo mi estructura. Si dudas: 'Gastos Variables,Otros,Varios'.
+    1. id: El número que precede a cada concepto. Una fila por concepto.
+    2. keyword: Texto clave del concepto en MAYÚSCULAS.
+    3. priority: 50.
+    4. entity_name: Nombre limpio (Title Case).
+    5. Usa solo mi estructura. Si dudas: 'Gastos Variables,Otros,Varios'.
 
     CONCEPTOS:
-    {", ".join(concepts)}
+{lines}
     """
 
-    # --- CAMBIO IMPORTANTE: Lista de modelos basada en tu log ---
-    models_to_try = [
-        "gemini-2.0-flash",  # Tu modelo más potente disponible
-        "gemini-flash-latest",  # El alias seguro
-        "gemini-pro-latest",  # Fallback a Pro
-    ]
 
-    for model_name in models_to_try:
+def stub_generate(prompt) -> str:
+    """Modelo local determinista: devuelve la respuesta genérica para cada concepto."""
+    rows = []
+    for i, example in re.findall(r"^(\d+): (.*)$", prompt, flags=re.MULTILINE):
+        key = merchant_key(example)
+        rows.append(
+            f"{i},{key},50,Gastos Variables,Otros,Varios,{key.title() or 'Desconocido'}"
+        )
+    return "\n".join(rows)
+
+
+def try_generate(model_name, prompt):
+    """Intenta generar contenido con un modelo específico."""
+    if model_name == STUB_MODEL:
+        return stub_generate(prompt)
+
+    import google.generativeai as genai
+
+    model = genai.GenerativeModel(model_name)
+    response = model.generate_content(prompt)
+    return response.text
+
+
+def parse_response(raw_response, batch) -> dict:
+    """merchant_key -> fila de mapping, a partir del CSV con id que devuelve el modelo."""
+    clean_csv = raw_response.replace("```csv", "").replace("```", "").strip()
+    parsed = {}
+    for row in csv.reader(io.StringIO(clean_csv)):
+        if len(row) != len(MAPPING_COLUMNS) + 1 or not row[0].strip().isdigit():
+            continue  # cabeceras o líneas que el modelo se inventa
+        i = int(row[0])
+        if i >= len(batch):
+            continue
+        parsed[batch[i][0]] = dict(zip(MAPPING_COLUMNS, (v.strip() for v in row[1:])))
+    return parsed
+
+
+def classify_batch(batch, context_structure, models) -> tuple[dict, str]:
+    prompt = build_prompt(batch, context_structure)
+    for model_name in models:
         try:
-            return try_generate(model_name, prompt)
+            return parse_response(try_generate(model_name, prompt), batch), model_name
         except Exception as e:
             print(f"⚠️ Falló {model_name}: {e}")
-
-    print("\n❌ TODOS LOS MODELOS FALLARON.")
-    return None
+    return {}, None
+
+
+def generate_suggestions(groups, context_structure, cache, models, max_workers):
+    """Pide a la IA solo los comercios que no están en caché, en lotes concurrentes."""
+    pending = {k: v for k, v in groups.items() if k not in cache}
+    print(
+        f"💾 {len(groups) - len(pending)} comercios en caché, {len(pending)} pendientes."
+    )
+    if not pending:
+        return 0
+
+    batches = list(make_batches(pending))
+    print(f"📦 {len(batches)} lotes (máx. {max_workers} en paralelo)...")
+    answered = 0
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(classify_batch, batch, context_structure, models)
+            for batch in batches
+        ]
+        for future in as_completed(futures):
+            parsed, model_name = future.result()
+            if model_name is None:
+                print("❌ Un lote falló con TODOS los modelos (se reintentará).")
+                continue
+            now = datetime.now(timezone.utc).isoformat(timespec="seconds")
+            for key, row in parsed.items():
+                cache[key] = {**row, "model": model_name, "cached_at": now}
+            answered += len(parsed)
+            # Guardamos tras cada lote: lo ya pagado no se pierde si algo falla después
+            save_cache(cache)
+            print(f"🤖 {model_name}: {len(parsed)} comercios clasificados.")
+    return answered
+
+
+def write_suggestions(groups, cache, local, path: Path = OUTPUT_FILE) -> int:
+    """CSV para revisar: columnas del mapping más origen (modelo o regla local) y confianza."""
+    columns = MAPPING_COLUMNS + ["source", "confidence"]
+    rows = []
+    for key in groups:
+        suggestion = cache.get(key) or local.get(key)
+        if suggestion is None:
+            continue
+        rows.append(
+            {
+                **{col: suggestion[col] for col in MAPPING_COLUMNS},
+                "source": suggestion.get("model"),
+                "confidence": suggestion.get("confidence"),
+            }
+        )
+    df = pd.DataFrame(rows, columns=columns).drop_duplicates("keyword")
+    df.to_csv(path, index=False, encoding="utf-8")
+    return len(df)
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sugerencias de mapeo con IA")
+    parser.add_argument(
+        "--input",
+        type=Path,
+        help="CSV con columna 'concepto' en lugar de consultar BigQuery",
+    )
+    parser.add_argument(
+        "--limit", type=int, help="Máximo de conceptos a leer de BigQuery"
+    )
+    parser.add_argument(
+        "--model",
+        help=f"Fuerza un modelo ('{STUB_MODEL}' para probar sin red ni API key)",
+    )
+    parser.add_argument("--max-workers", type=int, default=MAX_CONCURRENCY)
+    parser.add_argument(
+        "--min-confidence",
+        type=float,
+        default=MIN_CONFIDENCE,
+        help="Similitud mínima para aceptar la propuesta local sin preguntar a la IA",
+    )
+    args = parser.parse_args()
+
     print("--- 🧠 DWH Financial AI Assistant ---")
 
-    if not configure_ai():
+    models = [args.model] if args.model else MODELS_TO_TRY
+    if models != [STUB_MODEL] and not configure_ai():
         exit(1)
 
     print("🔍 Buscando transacciones...")
-    concepts = get_uncategorized_concepts()
+    if args.input:
+        concepts = pd.read_csv(args.input, dtype=str)["concepto"].dropna().tolist()
+    else:
+        concepts = get_uncategorized_concepts(args.limit)
 
     if not concepts:
         print("✅ No hay nada pendiente de clasificar.")
         exit()
 
-    print(f"📝 Encontrados {len(concepts)} conceptos.")
-    context = get_categories_context()
+    groups = group_by_merchant(concepts)
+    print(f"📝 Encontrados {len(concepts)} conceptos ({len(groups)} comercios).")
 
-    raw_response = generate_suggestions(concepts, context)
+    cache = load_cache()
+    uncached = {k: v for k, v in groups.items() if k not in cache}
+    local = preclassify(
+        uncached, KeywordSimilarityIndex.from_csv(), args.min_confidence
+    )
+    print(f"🧮 {len(local)} comercios resueltos por similitud con reglas existentes.")
 
-    if raw_response:
-        # Limpieza de bloques de código markdown
-        clean_csv = raw_response.replace("```csv", "").replace("```", "").strip()
-
-        with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-            f.write(
-                "keyword,priority,grupo_categoria,categoria,subcategoria,entity_name\n"
-            )
-            f.write(clean_csv)
+    # A la IA solo va el residuo de baja confianza
+    residue = {k: v for k, v in groups.items() if k not in local}
+    context = get_categories_context()
+    generate_suggestions(residue, context, cache, models, args.max_workers)
 
-        print(f"\n✅ Sugerencias generadas en: {OUTPUT_FILE}")
+    written = write_suggestions(groups, cache, local)
+    if written:
+        print(f"\n✅ {written} sugerencias generadas en: {OUTPUT_FILE}")
         print(
             "👉 Abre el archivo, revisa las sugerencias y copia las filas válidas a tu Google Sheet 'dbt - mapping'."
         )
@@ -0,0 +1,114 @@
+"""
+Benchmark: ingesta secuencial vs pool de workers contra Drive/GCS falsos.
+
+Monta en memoria la estructura BANCO/CUENTA/PENDING de bank_configs.json con
+varios extractos por cuenta, simula la latencia de cada llamada de red y mide
+`run_ingestion` con distintos límites de concurrencia.
+
+Uso:
+    python scripts/benchmarks/bench_concurrency.py
+    python scripts/benchmarks/bench_concurrency.py --files 10 --latency 0.1 --workers 1 4 8
+    python scripts/benchmarks/bench_concurrency.py --error-rate 0.1 --qps 50
+"""
+
+import sys
+import time
+import logging
+import argparse
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(BASE_DIR / "ingestion"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import main  # noqa: E402
+import scheduler  # noqa: E402
+from fake_services import FakeDrive, FakeStorageClient  # noqa: E402
+from statement_generator import MIME_TYPES, generate_statement  # noqa: E402
+
+
+def build_fake_drive(
+    configs, files_per_account, rows, latency, error_rate=0.0, fmt="csv"
+):
+    drive = FakeDrive(latency=latency, error_rate=error_rate)
+    root = drive.add_folder("root")
+    for bank, accounts in configs.items():
+        bank_id = drive.add_folder(bank, root)
+        for account, config in accounts.items():
+            acc_id = drive.add_folder(account, bank_id)
+            pending = drive.add_folder(main.PENDING_FOLDER, acc_id)
+            drive.add_folder(main.PROCESSED_FOLDER, acc_id)
+            for n in range(files_per_account):
+                drive.add_file(
+                    f"{bank}_{account}_{n}.{fmt}",
+                    pending,
+                    generate_statement(bank, account, config, rows, fmt, seed=n),
+                    MIME_TYPES[fmt],
+                )
+    return drive, root
+
+
+def run(workers_list, files_per_account, rows, latency, error_rate=0.0, qps=None):
+    configs = main.load_configs()
+    baseline = None
+    expected = files_per_account * sum(len(accounts) for accounts in configs.values())
+    print(
+        f"{'workers':>8} | {'tiempo (s)':>10} | {'archivos':>8} | {'speedup':>8} | "
+        f"{'llamadas/archivo':>16} | {'reintentos':>10}"
+    )
+    print("-" * 77)
+    for workers in workers_list:
+        drive, root = build_fake_drive(
+            configs, files_per_account, rows, latency, error_rate
+        )
+        # Sin --qps no se limita el ritmo: se mide solo la concurrencia
+        drive_scheduler = scheduler.drive_scheduler
+        drive_scheduler.bucket = (
+            scheduler.TokenBucket(qps, max(1, int(qps))) if qps else None
+        )
+        drive_scheduler.reset()
+        storage = FakeStorageClient(latency=latency)
+        main.DRIVE_PARENT_FOLDER_ID = root
+        main.GCS_BUCKET_NAME = "fake-bucket"
+        main._storage_client = storage
+
+        t0 = time.perf_counter()
+        total = main.run_ingestion(lambda: drive, configs, max_workers=workers)
+        elapsed = time.perf_counter() - t0
+
+        objects = storage.bucket("fake-bucket").objects
+        uploaded = sum(not name.startswith("_state/") for name in objects)
+        if total != uploaded:
+            raise AssertionError(f"❌ Procesados {total} pero subidos {uploaded}")
+        # Con errores inyectados ningún archivo debe quedarse sin procesar
+        if total != expected:
+            raise AssertionError(f"❌ Procesados {total} de {expected} archivos")
+
+        baseline = baseline or elapsed
+        # Llamadas a Drive (listados incluidos) por archivo procesado
+        calls = drive.calls / total if total else 0
+        retries = drive_scheduler.snapshot()["retries"]
+        print(
+            f"{workers:>8} | {elapsed:>10.2f} | {total:>8} | {baseline / elapsed:>7.1f}x | "
+            f"{calls:>16.1f} | {retries:>10}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=5, help="Archivos por cuenta")
+    parser.add_argument("--rows", type=int, default=200, help="Filas por archivo")
+    parser.add_argument(
+        "--latency", type=float, default=0.05, help="Latencia simulada por llamada (s)"
+    )
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Fracción de llamadas con 429/503"
+    )
+    parser.add_argument(
+        "--qps", type=float, help="Cuota simulada de Drive (llamadas/s)"
+    )
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    run(args.workers, args.files, args.rows, args.latency, args.error_rate, args.qps)
@@ -0,0 +1,79 @@
+"""
+Benchmark: generación de hash_id fila a fila vs vectorizada.
+
+Compara `generate_hash_id` aplicado con df.apply(axis=1) (camino original)
+contra `generate_hash_ids` sobre DataFrames sintéticos, y comprueba que
+ambos caminos producen exactamente los mismos hashes.
+
+Uso:
+    python scripts/benchmarks/bench_hash_id.py
+    python scripts/benchmarks/bench_hash_id.py --sizes 10000 100000
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(BASE_DIR / "ingestion"))
+
+from main import generate_hash_id, generate_hash_ids  # noqa: E402
+
+CONCEPTOS = [
+    "MERCADONA CASTELLON",
+    "  Amazon Prime*8776O82J5, amazon.es/prm ",
+    "PAGO BIZUM A LLEDO;AMOROS;ARRU",
+    "Cafetería Petita Llum",
+    "RECIBO PLATINUM",
+    "TRANS /PABLO RODRIGUEZ MANRIQU",
+    "Revolut**1589*",
+]
+
+
+def build_synthetic_df(n_rows: int, seed: int = 42) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    fechas = pd.Timestamp("2021-01-01") + pd.to_timedelta(
+        rng.integers(0, 5 * 365, n_rows), unit="D"
+    )
+    return pd.DataFrame(
+        {
+            "fecha": fechas.strftime("%Y-%m-%d"),
+            "concepto": rng.choice(CONCEPTOS, n_rows),
+            "importe": np.round(rng.normal(-40, 250, n_rows), 2),
+        }
+    )
+
+
+def run(sizes):
+    print(
+        f"{'filas':>10} | {'apply (s)':>10} | {'vectorizado (s)':>15} | {'speedup':>8}"
+    )
+    print("-" * 54)
+    for n in sizes:
+        df = build_synthetic_df(n)
+
+        t0 = time.perf_counter()
+        row_wise = df.apply(generate_hash_id, axis=1)
+        t_row = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        vectorized = generate_hash_ids(df)
+        t_vec = time.perf_counter() - t0
+
+        if not row_wise.equals(vectorized.astype(row_wise.dtype)):
+            raise AssertionError(f"❌ Los hashes no coinciden para {n} filas")
+
+        print(f"{n:>10} | {t_row:>10.3f} | {t_vec:>15.3f} | {t_row / t_vec:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    args = parser.parse_args()
+    run(args.sizes)
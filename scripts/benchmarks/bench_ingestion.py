@@ -0,0 +1,204 @@
+"""
+Benchmark end-to-end de la ingesta por banco/cuenta y formato.
+
+Para cada escenario (banco, cuenta, csv|xlsx, filas) genera extractos
+sintéticos con statement_generator y mide, en un proceso nuevo:
+  - `transform_dataframe` en memoria (filas/s, mejor de --repeat),
+  - `run_ingestion` completo contra Drive/GCS falsos (filas/s y tiempo por
+    etapa del RunReport: descarga, lectura, normalización, subida...),
+  - el pico de memoria residente (RSS) del proceso.
+
+Los resultados se pueden guardar como baseline y comparar con ejecuciones
+posteriores; una caída de rendimiento mayor que --tolerance hace fallar el
+script (código de salida 1).
+
+Uso:
+    python scripts/benchmarks/bench_ingestion.py
+    python scripts/benchmarks/bench_ingestion.py --rows 100000 --formats csv
+    python scripts/benchmarks/bench_ingestion.py --save-baseline main
+    python scripts/benchmarks/bench_ingestion.py --compare main --tolerance 0.15
+"""
+
+import io
+import sys
+import json
+import time
+import logging
+import argparse
+import resource
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+sys.path.insert(0, str(BASE_DIR / "ingestion"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import main  # noqa: E402
+import scheduler  # noqa: E402
+from run_report import RunReport  # noqa: E402
+from fake_services import FakeStorageClient  # noqa: E402
+from bench_concurrency import build_fake_drive  # noqa: E402
+from statement_generator import MIME_TYPES, generate_statement  # noqa: E402
+
+# Métricas comparadas con la baseline: (clave, True si más alto es mejor)
+COMPARED = [
+    ("transform_rows_per_s", True),
+    ("e2e_rows_per_s", True),
+    ("peak_rss_mb", False),
+]
+
+
+def peak_rss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux lo da en KiB, macOS en bytes
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def run_scenario(bank, account, fmt, rows, files, repeat) -> dict:
+    logging.disable(logging.WARNING)
+    config = main.load_configs()[bank][account]
+    configs = {bank: {account: config}}
+
+    data = generate_statement(bank, account, config, rows, fmt)
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        main.transform_dataframe(
+            io.BytesIO(data), MIME_TYPES[fmt], f"bench.{fmt}", config, bank, account
+        )
+        best = min(best, time.perf_counter() - t0)
+
+    # Sin latencia ni cuota: se mide el coste propio de la ingesta
+    drive, root = build_fake_drive(configs, files, rows, 0.0, fmt=fmt)
+    scheduler.drive_scheduler.bucket = None
+    main.DRIVE_PARENT_FOLDER_ID = root
+    main.GCS_BUCKET_NAME = "fake-bucket"
+    main._storage_client = FakeStorageClient()
+
+    report = RunReport("bench")
+    t0 = time.perf_counter()
+    processed = main.run_ingestion(lambda: drive, configs, report=report)
+    elapsed = time.perf_counter() - t0
+    if processed != files:
+        raise AssertionError(f"❌ Procesados {processed} de {files} archivos")
+
+    summary = report.as_dict()
+    return {
+        "rows": rows,
+        "files": files,
+        "transform_seconds": round(best, 4),
+        "transform_rows_per_s": round(rows / best),
+        "e2e_seconds": round(elapsed, 4),
+        "e2e_rows_per_s": round(rows * files / elapsed),
+        "rows_written": summary["counters"].get("rows_written", 0),
+        "stage_seconds": summary["stage_seconds"],
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def run(scenarios, files, repeat) -> dict:
+    results = {}
+    # Un proceso nuevo por escenario: el pico de RSS no arrastra el anterior
+    context = multiprocessing.get_context("spawn")
+    for bank, account, fmt, rows in scenarios:
+        key = f"{bank}/{account}/{fmt}/{rows}"
+        with ProcessPoolExecutor(1, mp_context=context) as pool:
+            future = pool.submit(run_scenario, bank, account, fmt, rows, files, repeat)
+            results[key] = future.result()
+        print_result(key, results[key])
+    return results
+
+
+def print_header():
+    print(
+        f"{'escenario':<32} | {'transform filas/s':>17} | {'e2e filas/s':>11} | "
+        f"{'RSS MB':>7} | etapas más lentas"
+    )
+    print("-" * 110)
+
+
+def print_result(key, r):
+    stages = sorted(r["stage_seconds"].items(), key=lambda kv: kv[1], reverse=True)
+    slowest = ", ".join(f"{k} {v:.2f}s" for k, v in stages[:3] if v)
+    print(
+        f"{key:<32} | {r['transform_rows_per_s']:>17,} | {r['e2e_rows_per_s']:>11,} | "
+        f"{r['peak_rss_mb']:>7.1f} | {slowest}"
+    )
+
+
+def compare(results, baseline, tolerance) -> int:
+    """Imprime la variación frente a la baseline y devuelve nº de regresiones."""
+    regressions = 0
+    print(
+        f"\n{'escenario':<32} | {'métrica':<22} | {'baseline':>12} | {'actual':>12} | cambio"
+    )
+    print("-" * 100)
+    for key, r in results.items():
+        if key not in baseline:
+            print(f"{key:<32} | (sin baseline)")
+            continue
+        for metric, higher_is_better in COMPARED:
+            before, now = baseline[key][metric], r[metric]
+            change = (now - before) / before if before else 0.0
+            worse = -change if higher_is_better else change
+            flag = ""
+            if worse > tolerance:
+                regressions += 1
+                flag = " ❌"
+            print(
+                f"{key:<32} | {metric:<22} | {before:>12,} | {now:>12,} | {change:+.1%}{flag}"
+            )
+    return regressions
+
+
+def baseline_path(name) -> Path:
+    return BASELINE_DIR / f"{name}.json"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--rows", type=int, nargs="+", default=[20_000], help="Filas por extracto"
+    )
+    parser.add_argument("--files", type=int, default=2, help="Extractos por escenario")
+    parser.add_argument(
+        "--formats", nargs="+", choices=list(MIME_TYPES), default=list(MIME_TYPES)
+    )
+    parser.add_argument(
+        "--accounts", nargs="+", help="Limitar a BANCO/CUENTA (p. ej. REVOLUT/ACCOUNT)"
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save-baseline", metavar="NOMBRE")
+    parser.add_argument("--compare", metavar="NOMBRE")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Empeoramiento admitido (0.2 = 20%%)",
+    )
+    args = parser.parse_args()
+
+    scenarios = [
+        (bank, account, fmt, rows)
+        for bank, accounts in main.load_configs().items()
+        for account in accounts
+        if not args.accounts or f"{bank}/{account}" in args.accounts
+        for fmt in args.formats
+        for rows in args.rows
+    ]
+
+    print_header()
+    results = run(scenarios, args.files, args.repeat)
+
+    if args.save_baseline:
+        path = baseline_path(args.save_baseline)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(results, indent=1), encoding="utf-8")
+        print(f"\n💾 Baseline guardada en {path}")
+
+    if args.compare:
+        baseline = json.loads(baseline_path(args.compare).read_text(encoding="utf-8"))
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
@@ -0,0 +1,64 @@
+"""
+Benchmark: serialización de aterrizaje JSONL vs Parquet.
+
+Genera transacciones sintéticas ya normalizadas (mismas columnas que produce
+`transform_dataframe`) y mide el tiempo de `write_jsonl` y `write_parquet`
+junto con el tamaño del payload que se subiría a GCS.
+
+Uso:
+    python scripts/benchmarks/bench_landing_format.py
+    python scripts/benchmarks/bench_landing_format.py --sizes 10000 100000
+"""
+
+import io
+import sys
+import time
+import argparse
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(BASE_DIR / "ingestion"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from main import generate_hash_ids, write_jsonl, write_parquet  # noqa: E402
+from bench_hash_id import build_synthetic_df  # noqa: E402
+
+
+def build_landing_df(n_rows):
+    df = build_synthetic_df(n_rows)
+    df["entidad"] = "Bankinter"
+    df["origen"] = "Card"
+    df["hash_id"] = generate_hash_ids(df)
+    return df[["hash_id", "fecha", "concepto", "importe", "entidad", "origen"]]
+
+
+def measure(writer, df):
+    out = io.BytesIO()
+    t0 = time.perf_counter()
+    writer([df], out)
+    return time.perf_counter() - t0, out.getbuffer().nbytes
+
+
+def run(sizes):
+    print(
+        f"{'filas':>10} | {'jsonl (s)':>9} | {'parquet (s)':>11} | "
+        f"{'jsonl (MB)':>10} | {'parquet (MB)':>12} | {'ratio':>6}"
+    )
+    print("-" * 74)
+    for n in sizes:
+        df = build_landing_df(n)
+        t_json, b_json = measure(write_jsonl, df)
+        t_parq, b_parq = measure(write_parquet, df)
+        print(
+            f"{n:>10} | {t_json:>9.3f} | {t_parq:>11.3f} | "
+            f"{b_json / 1e6:>10.2f} | {b_parq / 1e6:>12.2f} | {b_json / b_parq:>5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    args = parser.parse_args()
+    run(args.sizes)
@@ -0,0 +1,321 @@
+"""
+Dobles en memoria de Google Drive y Google Cloud Storage.
+
+Implementan solo la parte de la API que usa la ingesta
+(files().list paginado/get/get_media/export_media/update/create, peticiones
+batch, descargas con MediaIoBaseDownload y bucket().blob()/get_blob()/
+list_blobs()/delete() con precondiciones de generación y metadata) y simulan
+la latencia de red con un sleep por llamada, para medir la ingesta sin conexión. Con `error_rate` una
+fracción de las llamadas a Drive falla con 429/503 (sin aplicarse), para
+ejercitar los reintentos.
+"""
+
+import re
+import time
+import hashlib
+import threading
+import random
+import itertools
+from datetime import datetime, timezone
+
+import httplib2
+from googleapiclient.errors import HttpError
+from google.api_core.exceptions import NotFound, PreconditionFailed
+
+FOLDER_MIME = "application/vnd.google-apps.folder"
+
+
+def maybe_fail(error_rate):
+    if error_rate and random.random() < error_rate:
+        status = random.choice([429, 503])
+        raise HttpError(httplib2.Response({"status": status}), b"fake error")
+
+
+class FakeRequest:
+    def __init__(self, fn, latency, error_rate=0.0):
+        self._fn = fn
+        self._latency = latency
+        self._error_rate = error_rate
+
+    def execute(self):
+        if self._latency:
+            time.sleep(self._latency)
+        maybe_fail(self._error_rate)
+        return self._fn()
+
+
+class FakeResponse(dict):
+    def __init__(self, status, headers):
+        super().__init__(headers)
+        self.status = status
+
+
+class FakeMediaHttp:
+    """Sirve rangos de bytes como lo haría Drive para MediaIoBaseDownload."""
+
+    def __init__(self, drive, file_id):
+        self._drive = drive
+        self._file_id = file_id
+
+    def request(self, uri, method="GET", headers=None, **kwargs):
+        if self._drive.latency:
+            time.sleep(self._drive.latency)
+        content = self._drive.items[self._file_id]["content"]
+        start, end = map(int, headers["range"].split("=")[1].split("-"))
+        chunk = content[start : end + 1]
+        content_range = f"bytes {start}-{start + len(chunk) - 1}/{len(content)}"
+        return FakeResponse(206, {"content-range": content_range}), chunk
+
+
+class FakeMediaRequest(FakeRequest):
+    def __init__(self, drive, file_id):
+        super().__init__(lambda: drive.items[file_id]["content"], drive.latency)
+        self.uri = f"fake://drive/{file_id}"
+        self.headers = {}
+        self.http = FakeMediaHttp(drive, file_id)
+
+
+class FakeFiles:
+    def __init__(self, drive):
+        self._drive = drive
+
+    def list(self, q, fields=None, pageToken=None, pageSize=100, **kwargs):
+        parent = re.search(r"'([^']+)' in parents", q).group(1)
+        only_folders = f"mimeType='{FOLDER_MIME}'" in q
+
+        def run():
+            with self._drive.lock:
+                files = [
+                    self._drive.metadata(fid)
+                    for fid, f in self._drive.items.items()
+                    if parent in f["parents"]
+                    and (not only_folders or f["mimeType"] == FOLDER_MIME)
+                ]
+            # Paginación como Drive: el token es el desplazamiento de la página siguiente
+            start = int(pageToken or 0)
+            page = {"files": files[start : start + pageSize]}
+            if start + pageSize < len(files):
+                page["nextPageToken"] = str(start + pageSize)
+            return page
+
+        return self._drive.request(run)
+
+    def get(self, fileId, fields=None, **kwargs):
+        def run():
+            with self._drive.lock:
+                return self._drive.metadata(fileId)
+
+        return self._drive.request(run)
+
+    def get_media(self, fileId, **kwargs):
+        with self._drive.lock:
+            self._drive.calls += 1
+        return FakeMediaRequest(self._drive, fileId)
+
+    def export_media(self, fileId, mimeType=None, **kwargs):
+        return self.get_media(fileId)
+
+    def update(self, fileId, addParents=None, removeParents=None, body=None, **kwargs):
+        def run():
+            with self._drive.lock:
+                item = self._drive.items[fileId]
+                parents = item["parents"]
+                if removeParents:
+                    parents.discard(removeParents)
+                if addParents:
+                    parents.add(addParents)
+                self._drive.moves.append((fileId, removeParents, addParents))
+                # appProperties: se fusionan y las que llegan a None se borran
+                for key, value in ((body or {}).get("appProperties") or {}).items():
+                    if value is None:
+                        item["appProperties"].pop(key, None)
+                    else:
+                        item["appProperties"][key] = value
+                return {"id": fileId, "parents": sorted(parents)}
+
+        return self._drive.request(run)
+
+    def create(self, body, fields=None, **kwargs):
+        return self._drive.request(
+            lambda: {
+                "id": self._drive.add_item(
+                    body["name"], body["parents"][0], body["mimeType"]
+                )
+            }
+        )
+
+
+class FakeBatch:
+    """Petición batch: una sola llamada (y una latencia) para todas las sub-peticiones."""
+
+    def __init__(self, drive, callback):
+        self._drive = drive
+        self._callback = callback
+        self._requests = []
+
+    def add(self, request, request_id=None):
+        self._requests.append((request_id, request))
+
+    def execute(self):
+        if self._drive.latency:
+            time.sleep(self._drive.latency)
+        maybe_fail(self._drive.error_rate)
+        for request_id, request in self._requests:
+            with self._drive.lock:
+                self._drive.calls -= 1  # la sub-petición no cuenta como llamada HTTP
+            try:
+                self._callback(request_id, request._fn(), None)
+            except Exception as e:
+                self._callback(request_id, None, e)
+
+
+class FakeDrive:
+    def __init__(self, latency=0.0, error_rate=0.0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.items = {}
+        self.calls = 0
+        # (archivo, carpeta origen, carpeta destino) de cada files().update
+        self.moves = []
+        self.lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def request(self, fn):
+        with self.lock:
+            self.calls += 1
+        return FakeRequest(fn, self.latency, self.error_rate)
+
+    def files(self):
+        return FakeFiles(self)
+
+    def new_batch_http_request(self, callback=None):
+        with self.lock:
+            self.calls += 1
+        return FakeBatch(self, callback)
+
+    def metadata(self, fid):
+        f = self.items[fid]
+        meta = {
+            "id": fid,
+            "name": f["name"],
+            "mimeType": f["mimeType"],
+            "modifiedTime": f["modifiedTime"],
+            "parents": sorted(f["parents"]),
+            "appProperties": dict(f["appProperties"]),
+        }
+        if f["mimeType"] != FOLDER_MIME:
+            meta["md5Checksum"] = hashlib.md5(f["content"]).hexdigest()
+        return meta
+
+    def add_item(self, name, parent, mime_type, content=b""):
+        with self.lock:
+            fid = f"id{next(self._ids)}"
+            self.items[fid] = {
+                "name": name,
+                "parents": {parent} if parent else set(),
+                "mimeType": mime_type,
+                "content": content,
+                "modifiedTime": "2025-01-01T00:00:00.000Z",
+                "appProperties": {},
+            }
+        return fid
+
+    def add_folder(self, name, parent=None):
+        return self.add_item(name, parent, FOLDER_MIME)
+
+    def add_file(self, name, parent, content, mime_type="text/csv"):
+        return self.add_item(name, parent, mime_type, content)
+
+    def children(self, parent):
+        with self.lock:
+            return [f["name"] for f in self.items.values() if parent in f["parents"]]
+
+
+class FakeBlob:
+    def __init__(self, bucket, name):
+        self.bucket = bucket
+        self.name = name
+        self.generation = bucket.generations.get(name)
+        self.metadata = bucket.metadata.get(name)
+        self.updated = bucket.updated.get(name)
+
+    def upload_from_string(
+        self,
+        data,
+        content_type=None,
+        timeout=None,
+        if_generation_match=None,
+        **kwargs,
+    ):
+        if self.bucket.latency:
+            time.sleep(self.bucket.latency)
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        with self.bucket.lock:
+            current = self.bucket.generations.get(self.name, 0)
+            if if_generation_match is not None and if_generation_match != current:
+                raise PreconditionFailed(
+                    f"generation {current} != {if_generation_match}"
+                )
+            self.bucket.objects[self.name] = data
+            self.generation = self.bucket.generations[self.name] = current + 1
+            self.bucket.metadata[self.name] = self.metadata
+            self.updated = self.bucket.updated[self.name] = datetime.now(timezone.utc)
+
+    def download_as_bytes(self, **kwargs):
+        with self.bucket.lock:
+            return self.bucket.objects[self.name]
+
+    def upload_from_file(
+        self, file_obj, content_type=None, rewind=False, timeout=None, **kwargs
+    ):
+        if rewind:
+            file_obj.seek(0)
+        self.upload_from_string(file_obj.read(), content_type, timeout, **kwargs)
+
+    def delete(self, if_generation_match=None, **kwargs):
+        with self.bucket.lock:
+            current = self.bucket.generations.get(self.name)
+            if current is None:
+                raise NotFound(self.name)
+            if if_generation_match is not None and if_generation_match != current:
+                raise PreconditionFailed(
+                    f"generation {current} != {if_generation_match}"
+                )
+            del self.bucket.objects[self.name]
+            del self.bucket.generations[self.name]
+            self.bucket.metadata.pop(self.name, None)
+            self.bucket.updated.pop(self.name, None)
+
+
+class FakeBucket:
+    def __init__(self, name, latency):
+        self.name = name
+        self.latency = latency
+        self.objects = {}
+        self.generations = {}
+        self.metadata = {}
+        self.updated = {}
+        self.lock = threading.Lock()
+
+    def blob(self, name):
+        return FakeBlob(self, name)
+
+    def get_blob(self, name, **kwargs):
+        return FakeBlob(self, name) if name in self.objects else None
+
+    def list_blobs(self, prefix="", **kwargs):
+        with self.lock:
+            names = sorted(n for n in self.objects if n.startswith(prefix))
+        return [FakeBlob(self, name) for name in names]
+
+
+class FakeStorageClient:
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.buckets = {}
+
+    def bucket(self, name):
+        if name not in self.buckets:
+            self.buckets[name] = FakeBucket(name, self.latency)
+        return self.buckets[name]
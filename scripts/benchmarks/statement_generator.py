@@ -0,0 +1,211 @@
+"""
+Generador de extractos sintéticos con el formato de cada banco/cuenta.
+
+Para cada entrada de bank_configs.json produce un CSV o XLSX como los que
+descarga el banco: filas de banner (skip_rows), cabecera con las columnas
+mapeadas y las que el banco añade, pie (skip_footer), fechas en su
+date_format e importes con separadores europeos ("1.234,56") donde el banco
+los usa. Los conceptos salen de las keywords de master_mapping mezcladas con
+ruido, para que el motor de categorías trabaje como con datos reales.
+
+Uso (árbol BANCO/CUENTA/PENDING listo para ingestion/local_runner.py):
+    python scripts/benchmarks/statement_generator.py
+    python scripts/benchmarks/statement_generator.py --rows 50000 --files 2 --format xlsx
+"""
+
+import io
+import sys
+import zlib
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(BASE_DIR / "ingestion"))
+
+from categorizer import MAPPING_CSV  # noqa: E402
+from main import PENDING_FOLDER, load_configs  # noqa: E402
+
+DEFAULT_OUTPUT = BASE_DIR / "local_data" / "drive"
+
+MIME_TYPES = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+# Columnas que los bancos añaden a las mapeadas (se leen y se descartan) y
+# estilo de importe. Las cuentas sin entrada usan solo las columnas mapeadas.
+LAYOUTS = {
+    ("BANKINTER", "ACCOUNT"): {
+        "extra": ["FECHA CONTABLE", "SALDO"],
+        "decimal": "eu",
+    },
+    ("BANKINTER", "CARD"): {"extra": ["TARJETA"], "decimal": "eu"},
+    ("BANKINTER", "SHARED"): {"extra": ["Fecha contable", "Saldo"], "decimal": "eu"},
+    ("REVOLUT", "ACCOUNT"): {
+        "extra": ["Tipo", "Producto", "Fecha de finalización", "Comisión", "Divisa"],
+        "decimal": "dot",
+    },
+}
+
+EXTRA_VALUES = {
+    "Tipo": ["PAGO CON TARJETA", "TRANSFERENCIA", "RECARGA"],
+    "Producto": ["Actual", "Ahorros"],
+    "Comisión": ["0.00"],
+    "Divisa": ["EUR"],
+    "TARJETA": ["5402XXXXXXXX1234"],
+}
+
+NOISE = [
+    "COMPRA TARJ. 5402XXXXXXXX",
+    "PAGO BIZUM A",
+    "TRANSFERENCIA A FAVOR DE",
+    "RECIBO",
+    "Cafetería",
+    "Apple Pay:",
+]
+
+# Las fechas cubren el último año hasta hoy: parte cae dentro de lookback_days
+# (merge incremental) y parte fuera, repartida en varios meses de los agregados
+HISTORY_DAYS = 365
+
+# Proporción de operaciones no completadas (Revolut) y de filas sin importe
+NOT_COMPLETED_RATE = 0.05
+EMPTY_AMOUNT_RATE = 0.01
+
+
+def sample_conceptos(rng, n_rows) -> np.ndarray:
+    keywords = pd.read_csv(MAPPING_CSV, usecols=["keyword"])["keyword"].to_numpy()
+    kw = pd.Series(rng.choice(keywords, n_rows))
+    noise = pd.Series(rng.choice(NOISE, n_rows))
+    ref = pd.Series(rng.integers(1000, 99999, n_rows)).astype(str)
+    known = noise + " " + kw + " " + ref
+    # Un 10% sin keyword conocida (caen en la categoría por defecto)
+    unknown = rng.random(n_rows) < 0.1
+    return known.where(~unknown, "COMERCIO DESCONOCIDO " + ref).to_numpy()
+
+
+def format_amount(values: np.ndarray, decimal: str) -> pd.Series:
+    text = pd.Series(values).map("{:,.2f}".format)
+    if decimal == "eu":
+        # 1,234.56 -> 1.234,56
+        text = text.str.replace(",", "_").str.replace(".", ",").str.replace("_", ".")
+    return text
+
+
+def statement_rng(bank, account, seed) -> np.random.Generator:
+    """
+    Generador propio de cada banco/cuenta/extracto. Con la misma semilla en
+    todas las cuentas saldrían las mismas transacciones (y los mismos hash_id).
+    """
+    account_key = zlib.crc32(f"{bank}/{account}".encode("utf-8"))
+    return np.random.default_rng([account_key, seed])
+
+
+def build_statement_frame(bank, account, config, n_rows, seed=0) -> pd.DataFrame:
+    """Transacciones sintéticas con las columnas (y orden) del extracto real."""
+    rng = statement_rng(bank, account, seed)
+    layout = LAYOUTS.get((bank, account), {"extra": [], "decimal": "dot"})
+    mapping = {v: k for k, v in config["column_mapping"].items()}
+
+    start = pd.Timestamp.today().normalize() - pd.Timedelta(days=HISTORY_DAYS)
+    fechas = start + pd.to_timedelta(
+        np.sort(rng.integers(0, HISTORY_DAYS * 24 * 3600, n_rows)), unit="s"
+    )
+    importes = np.round(rng.lognormal(3, 1.2, n_rows), 2)
+    # Un 8% son ingresos; el resto, gastos
+    importes = np.where(rng.random(n_rows) < 0.08, importes * 20, -importes)
+
+    df = pd.DataFrame(
+        {
+            mapping["fecha"]: fechas,
+            mapping["concepto"]: sample_conceptos(rng, n_rows),
+            mapping["importe"]: importes,
+        }
+    )
+    for col in layout["extra"]:
+        if "fecha" in col.lower():
+            df[col] = fechas.strftime(config["date_format"])
+        elif "saldo" in col.lower():
+            df[col] = np.round(5000 + np.nan_to_num(importes).cumsum(), 2)
+        else:
+            df[col] = rng.choice(EXTRA_VALUES.get(col, ["-"]), n_rows)
+    if config.get("filter_completed"):
+        df["Estado"] = np.where(
+            rng.random(n_rows) < NOT_COMPLETED_RATE, "REVERTIDO", "COMPLETADO"
+        )
+    df.loc[rng.random(n_rows) < EMPTY_AMOUNT_RATE, mapping["importe"]] = np.nan
+    df.attrs["decimal"] = layout["decimal"]
+    return df
+
+
+def banner(bank, account, n_lines, fechas) -> list:
+    period = f"{fechas.min():%d/%m/%Y} - {fechas.max():%d/%m/%Y}"
+    lines = [f"{bank} - Extracto de {account.lower()}", "Titular: TITULAR SINTETICO"]
+    lines += [f"Periodo: {period} ({i})" for i in range(n_lines)]
+    return lines[:n_lines]
+
+
+def to_csv_bytes(df, bank, account, config) -> bytes:
+    mapping = {v: k for k, v in config["column_mapping"].items()}
+    out = df.copy()
+    out[mapping["fecha"]] = df[mapping["fecha"]].dt.strftime(config["date_format"])
+    amount = df[mapping["importe"]]
+    out[mapping["importe"]] = format_amount(amount.fillna(0), df.attrs["decimal"])
+    out.loc[amount.isna(), mapping["importe"]] = ""
+
+    lines = banner(bank, account, config.get("skip_rows", 0), df[mapping["fecha"]])
+    body = out.to_csv(index=False, lineterminator="\n")
+    footer = [f"Saldo final,{i}" for i in range(config.get("skip_footer", 0))]
+    return ("\n".join([*lines, body.rstrip("\n"), *footer]) + "\n").encode("utf-8")
+
+
+def to_xlsx_bytes(df, bank, account, config) -> bytes:
+    # Fechas como celdas de fecha e importes numéricos, como en la exportación
+    buffer = io.BytesIO()
+    skip_rows = config.get("skip_rows", 0)
+    fechas = df[{v: k for k, v in config["column_mapping"].items()}["fecha"]]
+    with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
+        df.to_excel(writer, index=False, startrow=skip_rows)
+        sheet = writer.sheets["Sheet1"]
+        for i, line in enumerate(banner(bank, account, skip_rows, fechas), 1):
+            sheet.cell(row=i, column=1, value=line)
+        for i in range(config.get("skip_footer", 0)):
+            sheet.cell(row=skip_rows + len(df) + 2 + i, column=1, value="Saldo final")
+    return buffer.getvalue()
+
+
+def generate_statement(bank, account, config, n_rows, fmt="csv", seed=0) -> bytes:
+    df = build_statement_frame(bank, account, config, n_rows, seed)
+    if fmt == "xlsx":
+        return to_xlsx_bytes(df, bank, account, config)
+    return to_csv_bytes(df, bank, account, config)
+
+
+def write_tree(output: Path, configs, n_rows, files, fmt) -> int:
+    written = 0
+    for bank, accounts in configs.items():
+        for account, config in accounts.items():
+            pending = output / bank / account / PENDING_FOLDER
+            pending.mkdir(parents=True, exist_ok=True)
+            for n in range(files):
+                path = pending / f"{bank}_{account}_synthetic_{n}.{fmt}"
+                path.write_bytes(
+                    generate_statement(bank, account, config, n_rows, fmt, seed=n)
+                )
+                written += 1
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--rows", type=int, default=1000, help="Filas por extracto")
+    parser.add_argument("--files", type=int, default=1, help="Extractos por cuenta")
+    parser.add_argument("--format", choices=list(MIME_TYPES), default="csv")
+    args = parser.parse_args()
+
+    total = write_tree(args.output, load_configs(), args.rows, args.files, args.format)
+    print(f"📝 {total} extractos sintéticos en {args.output}")
@@ -12,7 +12,7 @@
 # --- 1. DEFINICIÓN DE PARÁMETROS (OBLIGATORIO: PRIMERA LÍNEA DE CÓDIGO) ---
 param (
     [Parameter(Mandatory=$false)]
-    [ValidateSet("install", "run-ingestion", "clean", "help", "update-seeds", "ai-suggest", "dbt-refresh")]
+    [ValidateSet("install", "run-ingestion", "clean", "help", "update-seeds", "ai-suggest", "dbt-refresh", "rebuild-index", "check-categories", "run-local", "recategorize", "compact")]
     [string]$Command = "help"
 )
 
@@ -59,6 +59,11 @@ function Show-Help {
     Write-Host "  update-seeds    - Descarga el mapeo actualizado desde Google Sheets"
     Write-Host "  ai-suggest      - Usa IA para clasificar gastos pendientes"
     Write-Host "  dbt-refresh     - Reconstruye todas las tablas dbt desde cero (Full Refresh)"
+    Write-Host "  rebuild-index   - Reconstruye el indice de hash_id por cuenta desde GCS"
+    Write-Host "  check-categories - Valida el motor de categorias contra el set dorado"
+    Write-Host "  run-local       - Pipeline completo en local (local_data/ + DuckDB)"
+    Write-Host "  recategorize    - Recategoriza el historico afectado por el ultimo cambio del mapeo"
+    Write-Host "  compact         - Compacta los archivos aterrizados en GCS (uno por cuenta y mes)"
     Write-Host "  clean           - Limpia archivos temporales"
 }
 
@@ -107,6 +112,37 @@ if ($Command -eq "dbt-refresh") {
     }
 }
 
+# --- REBUILD HASH INDEX ---
+if ($Command -eq "rebuild-index") {
+    Write-Host "[INFO] Reconstruyendo indice de hash_id desde GCS..." -ForegroundColor Green
+    $ScriptPath = Join-Path $IngestionDir "hash_index.py"
+    python $ScriptPath rebuild
+}
+
+if ($Command -eq "check-categories") {
+    Write-Host "[INFO] Validando motor de categorias contra el set dorado..." -ForegroundColor Green
+    $ScriptPath = Join-Path $IngestionDir "categorizer.py"
+    python $ScriptPath check
+}
+
+if ($Command -eq "run-local") {
+    Write-Host "[INFO] Ejecutando pipeline local (DuckDB)..." -ForegroundColor Green
+    $ScriptPath = Join-Path $IngestionDir "local_runner.py"
+    python $ScriptPath --keep-pending
+}
+
+if ($Command -eq "recategorize") {
+    Write-Host "[INFO] Recategorizando transacciones afectadas por el cambio de mapeo..." -ForegroundColor Green
+    $ScriptPath = Join-Path $IngestionDir "recategorize.py"
+    python $ScriptPath
+}
+
+if ($Command -eq "compact") {
+    Write-Host "[INFO] Compactando la zona de aterrizaje de GCS..." -ForegroundColor Green
+    $ScriptPath = Join-Path $IngestionDir "compaction.py"
+    python $ScriptPath
+}
+
 # --- AI SUGGEST ---
 if ($Command -eq "ai-suggest") {
     Write-Host "[INFO] Analizando transacciones sin clasificar con IA..." -ForegroundColor Cyan
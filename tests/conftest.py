@@ -0,0 +1,78 @@
+"""
+Fixtures comunes: la ingesta contra los dobles en memoria de Drive y GCS de
+scripts/benchmarks/fake_services.py (sin red ni credenciales).
+"""
+
+import sys
+import logging
+from pathlib import Path
+
+import pytest
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR / "ingestion"))
+sys.path.insert(0, str(BASE_DIR / "scripts" / "benchmarks"))
+
+import main  # noqa: E402
+import scheduler  # noqa: E402
+from fake_services import FakeDrive, FakeStorageClient  # noqa: E402
+from statement_generator import generate_statement  # noqa: E402
+
+BANK, ACCOUNT = "REVOLUT", "ACCOUNT"
+BUCKET = "fake-bucket"
+
+
+class FakeEnv:
+    """Drive con BANCO/CUENTA/{PENDING, PROCESSED, in_progress} y un bucket vacío."""
+
+    def __init__(self):
+        self.configs = {BANK: {ACCOUNT: main.load_configs()[BANK][ACCOUNT]}}
+        self.config = self.configs[BANK][ACCOUNT]
+        self.drive = FakeDrive()
+        self.root = self.drive.add_folder("root")
+        bank = self.drive.add_folder(BANK, self.root)
+        self.account = self.drive.add_folder(ACCOUNT, bank)
+        self.pending = self.drive.add_folder(main.PENDING_FOLDER, self.account)
+        self.processed = self.drive.add_folder(main.PROCESSED_FOLDER, self.account)
+        self.progress = self.drive.add_folder(main.IN_PROGRESS_FOLDER, self.account)
+        self.storage = FakeStorageClient()
+        self.bucket = self.storage.bucket(BUCKET)
+
+    @property
+    def folders(self):
+        return self.pending, self.processed, self.progress
+
+    def add_statement(self, n, rows=20, parent=None):
+        content = generate_statement(BANK, ACCOUNT, self.config, rows, seed=n)
+        return self.drive.add_file(
+            f"{BANK}_{ACCOUNT}_{n}.csv", parent or self.pending, content
+        )
+
+    def metadata(self, fid):
+        return self.drive.metadata(fid)
+
+    def parents(self, fid):
+        return self.drive.items[fid]["parents"]
+
+    def landed(self):
+        return sorted(n for n in self.bucket.objects if not n.startswith("_state/"))
+
+    def run(self, **kwargs):
+        kwargs.setdefault("use_manifest", False)
+        return main.run_ingestion(lambda: self.drive, self.configs, **kwargs)
+
+
+@pytest.fixture
+def fake_env(monkeypatch):
+    env = FakeEnv()
+    monkeypatch.setattr(main, "DRIVE_PARENT_FOLDER_ID", env.root)
+    monkeypatch.setattr(main, "GCS_BUCKET_NAME", BUCKET)
+    monkeypatch.setattr(main, "_storage_client", env.storage)
+    # Sin cuota ni esperas reales: los dobles responden al instante
+    monkeypatch.setattr(scheduler.drive_scheduler, "bucket", None)
+    monkeypatch.setattr(scheduler.time, "sleep", lambda seconds: None)
+    scheduler.drive_scheduler.reset()
+    scheduler.gcs_scheduler.reset()
+    logging.disable(logging.WARNING)
+    yield env
+    logging.disable(logging.NOTSET)
@@ -0,0 +1,158 @@
+"""Bloqueo de archivos en Drive: PENDING -> in_progress -> PROCESSED y leases."""
+
+import time
+
+import leases
+import main
+from fake_services import FakeBlob
+
+
+def test_file_moves_pending_in_progress_processed(fake_env, monkeypatch):
+    fid = fake_env.add_statement(0)
+    seen = {}
+    download = main.download_drive_file_as_bytes
+
+    def spy_download(drive_service, file_id, file_metadata=None):
+        # Durante la descarga el archivo está bloqueado con nuestro lease
+        seen["parents"] = set(fake_env.parents(file_id))
+        seen["lease"] = fake_env.metadata(file_id)["appProperties"]
+        return download(drive_service, file_id, file_metadata)
+
+    monkeypatch.setattr(main, "download_drive_file_as_bytes", spy_download)
+
+    assert fake_env.run(max_workers=2) == 1
+
+    assert seen["parents"] == {fake_env.progress}
+    assert seen["lease"][leases.LEASE_RUN_ID] == leases.RUN_ID
+    moves = [(src, dst) for f, src, dst in fake_env.drive.moves if f == fid]
+    assert moves == [
+        (fake_env.pending, fake_env.progress),
+        (fake_env.progress, fake_env.processed),
+    ]
+    assert fake_env.parents(fid) == {fake_env.processed}
+    assert fake_env.metadata(fid)["appProperties"] == {}
+    assert len(fake_env.landed()) == 1
+
+
+def test_failed_upload_returns_file_to_pending(fake_env, monkeypatch):
+    fid = fake_env.add_statement(0)
+
+    def broken_upload(self, *args, **kwargs):
+        raise ValueError("upload roto")
+
+    monkeypatch.setattr(FakeBlob, "upload_from_file", broken_upload)
+
+    assert fake_env.run(max_workers=2) == 0
+    assert fake_env.parents(fid) == {fake_env.pending}
+    assert fake_env.metadata(fid)["appProperties"] == {}
+    assert fake_env.landed() == []
+
+
+def test_is_expired():
+    now = 1_000_000.0
+    fresh = {"appProperties": leases.new_lease(now - 10)}
+    old = {"appProperties": leases.new_lease(now - 7200)}
+
+    assert not leases.is_expired(fresh, ttl=3600, now=now)
+    assert leases.is_expired(old, ttl=3600, now=now)
+    # Sin lease (ejecuciones antiguas o borrado a mano) o con basura: caducado
+    assert leases.is_expired({}, ttl=3600, now=now)
+    assert leases.is_expired(
+        {"appProperties": {leases.LEASE_CLAIMED_AT: "ayer"}}, ttl=3600, now=now
+    )
+
+
+def test_reclaim_expired_leases(fake_env):
+    stale = fake_env.add_statement(0, parent=fake_env.progress)
+    live = fake_env.add_statement(1, parent=fake_env.progress)
+    drive = fake_env.drive
+    drive.items[stale]["appProperties"] = leases.new_lease(time.time() - 7200)
+    drive.items[live]["appProperties"] = leases.new_lease()
+
+    in_progress = [fake_env.metadata(stale), fake_env.metadata(live)]
+    reclaimed = main.reclaim_expired_leases(
+        drive, fake_env.progress, fake_env.pending, in_progress, ttl=3600
+    )
+
+    assert reclaimed == 1
+    assert fake_env.parents(stale) == {fake_env.pending}
+    assert fake_env.metadata(stale)["appProperties"] == {}
+    assert fake_env.parents(live) == {fake_env.progress}
+
+
+def test_run_reclaims_and_processes_abandoned_file(fake_env):
+    fid = fake_env.add_statement(0, parent=fake_env.progress)
+    fake_env.drive.items[fid]["appProperties"] = leases.new_lease(time.time() - 7200)
+
+    assert fake_env.run(max_workers=2) == 1
+    assert fake_env.parents(fid) == {fake_env.processed}
+    assert len(fake_env.landed()) == 1
+
+
+def test_lease_taken_over_mid_file_is_not_published(fake_env, monkeypatch):
+    """A se queda colgado en la descarga, B reclama el archivo y lo termina."""
+    fid = fake_env.add_statement(0)
+    listing = fake_env.metadata(fid)
+    download = main.download_drive_file_as_bytes
+    results = {}
+
+    def worker(run_id):
+        monkeypatch.setattr(leases, "RUN_ID", run_id)
+        return main.process_file(
+            fake_env.drive,
+            listing,
+            fake_env.folders,
+            "REVOLUT",
+            "ACCOUNT",
+            fake_env.config,
+            output_format="jsonl",
+        )
+
+    def slow_download(drive_service, file_id, file_metadata=None):
+        if "b" not in results:
+            results["b"] = None
+            results["b"] = worker("worker-b")
+            monkeypatch.setattr(leases, "RUN_ID", "worker-a")
+        return download(drive_service, file_id, file_metadata)
+
+    monkeypatch.setattr(main, "download_drive_file_as_bytes", slow_download)
+    results["a"] = worker("worker-a")
+
+    assert results == {"a": False, "b": True}
+    assert fake_env.parents(fid) == {fake_env.processed}
+    assert len(fake_env.landed()) == 1
+
+
+def test_file_archived_by_other_worker_is_not_claimed(fake_env, monkeypatch):
+    """B listó PENDING antes de que A terminara: el bloqueo tardío se deshace."""
+    fid = fake_env.add_statement(0)
+    listing = fake_env.metadata(fid)
+
+    def worker(run_id):
+        monkeypatch.setattr(leases, "RUN_ID", run_id)
+        return main.process_file(
+            fake_env.drive,
+            listing,
+            fake_env.folders,
+            "REVOLUT",
+            "ACCOUNT",
+            fake_env.config,
+            output_format="jsonl",
+        )
+
+    assert worker("worker-a") is True
+    assert worker("worker-b") is False
+    assert fake_env.parents(fid) == {fake_env.processed}
+    assert fake_env.metadata(fid)["appProperties"] == {}
+    assert len(fake_env.landed()) == 1
+
+
+def test_worker_pool_processes_each_file_once(fake_env):
+    files = [fake_env.add_statement(n) for n in range(12)]
+
+    assert fake_env.run(max_workers=8) == len(files)
+
+    claims = [f for f, src, dst in fake_env.drive.moves if dst == fake_env.progress]
+    assert sorted(claims) == sorted(files)
+    assert all(fake_env.parents(f) == {fake_env.processed} for f in files)
+    assert len(fake_env.landed()) == len(files)
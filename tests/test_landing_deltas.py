@@ -0,0 +1,61 @@
+"""Deltas de aterrizaje: nombres por contenido y filtrado con el índice de hash_id."""
+
+import io
+
+import pandas as pd
+
+import main
+from statement_generator import generate_statement
+from conftest import ACCOUNT, BANK
+
+
+def landed_rows(env) -> pd.DataFrame:
+    frames = [
+        pd.read_json(io.BytesIO(env.bucket.objects[name]), lines=True, dtype=False)
+        for name in env.landed()
+    ]
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_extended_statement_keeps_first_delta(fake_env):
+    lines = generate_statement(BANK, ACCOUNT, fake_env.config, 30).splitlines(True)
+    name = f"{BANK}_{ACCOUNT}_extracto.csv"
+    fake_env.drive.add_file(name, fake_env.pending, b"".join(lines[:21]))
+    assert fake_env.run(max_workers=2) == 1
+    first = landed_rows(fake_env)
+
+    # Mismo nombre, 10 filas más: el segundo delta solo lleva las nuevas
+    fake_env.drive.add_file(name, fake_env.pending, b"".join(lines))
+    assert fake_env.run(max_workers=2) == 1
+
+    assert len(fake_env.landed()) == 2
+    rows = landed_rows(fake_env)
+    assert set(first["hash_id"]) <= set(rows["hash_id"])
+    assert rows["hash_id"].is_unique
+
+
+def test_same_content_lands_on_same_path(fake_env):
+    fid = fake_env.add_statement(0)
+    meta = fake_env.metadata(fid)
+    path = main.landing_path(BANK, ACCOUNT, meta, meta["name"], ".jsonl")
+    assert path == main.landing_path(BANK, ACCOUNT, dict(meta), meta["name"], ".jsonl")
+    assert path.startswith(f"{BANK}/{ACCOUNT}/{BANK}_{ACCOUNT}_0_")
+
+    assert fake_env.run(max_workers=2) == 1
+    assert fake_env.landed() == [path]
+
+
+def test_rows_repeated_in_file_are_counted_apart(fake_env):
+    lines = generate_statement(BANK, ACCOUNT, fake_env.config, 10).splitlines(True)
+    # La fila 3 aparece dos veces: mismo hash_id, solo se aterriza una
+    fake_env.drive.add_file(
+        "repetida.csv", fake_env.pending, b"".join(lines + lines[3:4])
+    )
+    report = main.RunReport("test")
+
+    assert fake_env.run(max_workers=2, report=report) == 1
+
+    counters = report.as_dict()["counters"]
+    assert counters["rows_repeated_in_file"] == 1
+    assert counters.get("rows_duplicated", 0) == 0
+    assert landed_rows(fake_env)["hash_id"].is_unique
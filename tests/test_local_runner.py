@@ -0,0 +1,34 @@
+"""Ingesta local: repetir con --keep-pending no borra lo ya aterrizado."""
+
+import logging
+
+import pyarrow.parquet as pq
+
+import local_runner
+import main
+from statement_generator import write_tree
+
+
+def landed(landing_dir):
+    return {
+        path.relative_to(landing_dir): pq.read_table(path).num_rows
+        for path in sorted(landing_dir.glob("*/*.parquet"))
+    }
+
+
+def test_rerun_with_keep_pending_keeps_landed_files(tmp_path):
+    logging.disable(logging.WARNING)
+    configs = {"REVOLUT": {"ACCOUNT": main.load_configs()["REVOLUT"]["ACCOUNT"]}}
+    drive, landing = tmp_path / "drive", tmp_path / "landing"
+    write_tree(drive, configs, 50, 2, "csv")
+
+    first = local_runner.ingest_local(drive, landing, configs, keep_pending=True)
+    before = landed(landing)
+    second = local_runner.ingest_local(drive, landing, configs, keep_pending=True)
+    logging.disable(logging.NOTSET)
+
+    assert first > 0 and second == 0
+    assert len(before) == 2
+    assert sum(before.values()) == first
+    assert landed(landing) == before
+    assert not list(landing.glob("*/*.tmp"))
@@ -0,0 +1,49 @@
+"""Importes: un único separador con tres dígitos detrás es de miles."""
+
+import pandas as pd
+import pytest
+
+import main
+
+
+def parse(*values):
+    return main.parse_importe_column(pd.Series(values, dtype=object))
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("$1,000", 1000.0),
+        ("1,000", 1000.0),
+        ("1.000", 1000.0),
+        ("-1.000", -1000.0),
+        ("1.000,00", 1000.0),
+        ("1,000.00", 1000.0),
+        ("1,5", 1.5),
+        ("12.34", 12.34),
+        ("12,50-", -12.5),
+        ("(12,50)", -12.5),
+        ("0,500", 0.5),
+        ("1234.567", 1234.567),
+    ],
+)
+def test_separators(text, expected):
+    result, invalid, _ = parse(text)
+    assert invalid == 0
+    assert result[0] == pytest.approx(expected)
+
+
+def test_lone_thousands_separator_is_counted_as_ambiguous():
+    result, invalid, ambiguous = parse("1,000", "$1.000", "1.234,56", "12,50", None)
+
+    assert result.tolist()[:4] == [1000.0, 1000.0, 1234.56, 12.5]
+    assert invalid == 0
+    assert ambiguous == 2
+
+
+def test_numeric_cells_are_kept():
+    # Excel: el lector entrega los importes como float en una columna object
+    result, invalid, ambiguous = parse(1.0, 12.5, "abc")
+
+    assert result.tolist()[:2] == [1.0, 12.5]
+    assert (invalid, ambiguous) == (1, 0)
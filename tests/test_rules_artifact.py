@@ -0,0 +1,37 @@
+"""El artefacto de reglas solo sirve si su sha256 coincide con el checksum de dbt."""
+
+import re
+import hashlib
+
+import pytest
+
+from rules_artifact import ENTITIES_CSV, RULES_MACRO, file_sha256
+from categorizer import MAPPING_CSV
+
+SEEDS = {"master_mapping": MAPPING_CSV, "map_entities": ENTITIES_CSV}
+
+
+def artifact_checksums() -> dict:
+    text = RULES_MACRO.read_text(encoding="utf-8")
+    return dict(re.findall(r'"(\w+)": \{"sha256": "([0-9a-f]{64})"', text))
+
+
+def test_checksum_ignores_surrounding_whitespace(tmp_path):
+    seed = tmp_path / "seed.csv"
+    seed.write_bytes(b"keyword,priority\nMERCADONA,10\n")
+    expected = hashlib.sha256(b"keyword,priority\nMERCADONA,10").hexdigest()
+    assert file_sha256(seed) == expected
+
+
+@pytest.mark.parametrize("seed", sorted(SEEDS))
+def test_committed_artifact_matches_seed(seed):
+    # Si falla: python ingestion/rules_artifact.py (o sync_seeds.py) y commit
+    assert artifact_checksums()[seed] == file_sha256(SEEDS[seed])
+
+
+@pytest.mark.parametrize("seed", sorted(SEEDS))
+def test_checksum_matches_dbt(seed):
+    files = pytest.importorskip("dbt.contracts.files")
+    system = pytest.importorskip("dbt.clients.system")
+    contents = system.load_file_contents(str(SEEDS[seed]), strip=True)
+    assert file_sha256(SEEDS[seed]) == files.FileHash.from_contents(contents).checksum
@@ -0,0 +1,124 @@
+"""CallScheduler: reintentos con backoff, Retry-After, cuota y already_done."""
+
+import json
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+import scheduler
+
+
+def http_error(status, retry_after=None, reason=None):
+    headers = {"status": status}
+    if retry_after is not None:
+        headers["retry-after"] = str(retry_after)
+    content = {
+        "error": {"message": "fake", "errors": [{"reason": reason}] if reason else []}
+    }
+    return HttpError(httplib2.Response(headers), json.dumps(content).encode())
+
+
+class Flaky:
+    """Falla con `errors` (en orden) y después devuelve `result`."""
+
+    def __init__(self, errors, result="ok"):
+        self.errors = list(errors)
+        self.result = result
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return self.result
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = []
+    monkeypatch.setattr(scheduler.time, "sleep", delays.append)
+    # Jitter determinista: siempre el máximo del intervalo
+    monkeypatch.setattr(scheduler.random, "uniform", lambda low, high: high)
+    return delays
+
+
+def test_retries_with_exponential_backoff(sleeps):
+    calls = scheduler.CallScheduler("test", max_retries=5)
+    fn = Flaky([http_error(503), http_error(500), ConnectionError()])
+
+    assert calls.call(fn, "op") == "ok"
+    assert fn.calls == 4
+    assert sleeps == [0.5, 1.0, 2.0]
+    metrics = calls.snapshot()
+    assert metrics["retries"] == 3
+    assert metrics["failures"] == 0
+    assert metrics["backoff_seconds"] == pytest.approx(3.5)
+
+
+def test_backoff_is_capped(sleeps):
+    calls = scheduler.CallScheduler("test", max_retries=8)
+    calls.call(Flaky([http_error(503)] * 8), "op")
+    assert max(sleeps) == scheduler.MAX_DELAY
+
+
+def test_retry_after_and_throttling_pause_the_bucket(sleeps):
+    bucket = scheduler.TokenBucket(rate=1000, capacity=10)
+    pauses = []
+    # Con time.sleep anulado, una pausa real dejaría acquire() en espera activa
+    bucket.pause = pauses.append
+    calls = scheduler.CallScheduler("test", bucket, max_retries=3)
+    fn = Flaky([http_error(429, retry_after=40)])
+
+    assert calls.call(fn, "op") == "ok"
+    assert sleeps == [40]
+    assert pauses == [40]
+    assert calls.snapshot()["throttled"] == 1
+
+
+def test_drive_rate_limit_403_is_retried(sleeps):
+    calls = scheduler.CallScheduler("test", max_retries=3)
+    fn = Flaky([http_error(403, reason="userRateLimitExceeded")])
+
+    assert calls.call(fn, "op") == "ok"
+    assert calls.snapshot()["throttled"] == 1
+
+
+def test_non_retryable_errors_fail_fast(sleeps):
+    calls = scheduler.CallScheduler("test", max_retries=5)
+    for error in (ValueError("bug"), http_error(404), http_error(403)):
+        fn = Flaky([error])
+        with pytest.raises(type(error)):
+            calls.call(fn, "op")
+        assert fn.calls == 1
+    assert sleeps == []
+    assert calls.snapshot()["failures"] == 3
+
+
+def test_gives_up_after_max_retries(sleeps):
+    calls = scheduler.CallScheduler("test", max_retries=2)
+    fn = Flaky([http_error(503)] * 5)
+
+    with pytest.raises(HttpError):
+        calls.call(fn, "op")
+    assert fn.calls == 3
+    assert calls.snapshot()["failures"] == 1
+
+
+def test_already_done_skips_the_retry(sleeps):
+    calls = scheduler.CallScheduler("test", max_retries=5)
+    fn = Flaky([TimeoutError()])
+
+    assert calls.call(fn, "op", already_done=lambda: True) is None
+    assert fn.calls == 1
+    assert calls.snapshot()["retries"] == 1
+
+
+def test_already_done_false_retries(sleeps):
+    calls = scheduler.CallScheduler("test", max_retries=5)
+    fn = Flaky([TimeoutError()])
+    checks = []
+
+    assert calls.call(fn, "op", already_done=lambda: checks.append(1)) == "ok"
+    assert fn.calls == 2
+    assert checks == [1]
@@ -0,0 +1,43 @@
+"""Extractos sintéticos: datos distintos por cuenta y fechas recientes."""
+
+import io
+import logging
+
+import pandas as pd
+
+import main
+from statement_generator import HISTORY_DAYS, MIME_TYPES, generate_statement
+
+
+def transformed(bank, account, config, seed, fmt="csv"):
+    data = generate_statement(bank, account, config, 200, fmt, seed=seed)
+    return main.transform_dataframe(
+        io.BytesIO(data), MIME_TYPES[fmt], f"synthetic.{fmt}", config, bank, account
+    )
+
+
+def test_hash_ids_are_unique_across_accounts_and_files():
+    logging.disable(logging.WARNING)
+    frames = [
+        transformed(bank, account, config, n)
+        for bank, accounts in main.load_configs().items()
+        for account, config in accounts.items()
+        for n in range(2)
+    ]
+    logging.disable(logging.NOTSET)
+    hash_ids = pd.concat(frames)["hash_id"]
+
+    assert len(hash_ids) > 0
+    assert hash_ids.is_unique
+
+
+def test_dates_end_today():
+    config = main.load_configs()["REVOLUT"]["ACCOUNT"]
+    fechas = pd.to_datetime(transformed("REVOLUT", "ACCOUNT", config, 0)["fecha"])
+    today = pd.Timestamp.today().normalize()
+
+    assert fechas.max() <= today
+    assert fechas.min() >= today - pd.Timedelta(days=HISTORY_DAYS)
+    # Parte dentro de lookback_days (120 en dbt_project.yml) y parte fuera
+    assert (fechas >= today - pd.Timedelta(days=120)).any()
+    assert (fechas < today - pd.Timedelta(days=120)).any()
@@ -0,0 +1,40 @@
+"""Lectores compilados una vez por banco/cuenta y compartidos entre hilos."""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+import main
+import statement_reader
+
+
+def test_readers_are_compiled_when_configs_load():
+    configs = main.load_configs()
+    for bank, accounts in configs.items():
+        for account, config in accounts.items():
+            reader = statement_reader.get_reader(bank, account, config)
+            assert reader.config is config
+            assert statement_reader.get_reader(bank, account, config) is reader
+
+
+def test_edited_config_gets_its_own_reader():
+    config = main.load_configs()["REVOLUT"]["ACCOUNT"]
+    reader = statement_reader.get_reader("REVOLUT", "ACCOUNT", config)
+    edited = dict(config, skip_rows=3)
+
+    assert statement_reader.get_reader("REVOLUT", "ACCOUNT", edited).skip_rows == 3
+    assert statement_reader.get_reader("REVOLUT", "ACCOUNT", edited) is not reader
+
+
+def test_missing_state_column_warns_once_across_threads(caplog):
+    reader = statement_reader.StatementReader(
+        {"column_mapping": {"Importe": "importe"}, "filter_completed": True}
+    )
+    chunk = pd.DataFrame({"Importe": [1.0, 2.0]})
+
+    with caplog.at_level(logging.WARNING):
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda _: reader.filter_rows(chunk), range(64)))
+
+    assert len([r for r in caplog.records if "filter_completed" in r.message]) == 1
@@ -0,0 +1,123 @@
+"""sync_seeds: el cambio de mapeo se mide contra el último aplicado (GCS _state/)."""
+
+import csv
+import json
+
+import pytest
+
+import sync_seeds
+from fake_services import FakeStorageClient
+
+SEED = sync_seeds.TARGET_CSV.read_bytes()
+
+
+class FakeSheets:
+    """Lo mínimo de spreadsheets().get / values().get para una pestaña."""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return self
+
+    def get(self, spreadsheetId, range=None):
+        self.result = (
+            {"values": self.rows}
+            if range
+            else {"sheets": [{"properties": {"title": "mapping"}}]}
+        )
+        return self
+
+    def execute(self):
+        return self.result
+
+
+def seed_rows():
+    return list(csv.reader(SEED.decode("utf-8").splitlines()))
+
+
+class Pipeline:
+    """Cada run() parte de un checkout limpio, como una ejecución de Actions."""
+
+    def __init__(self, tmp_path, monkeypatch):
+        self.tmp_path = tmp_path
+        self.monkeypatch = monkeypatch
+        self.csv = tmp_path / "master_mapping.csv"
+        self.changes = tmp_path / "mapping_changes.json"
+        self.bucket = FakeStorageClient().bucket("fake-bucket")
+        self.runs = 0
+        monkeypatch.setattr(sync_seeds, "TARGET_CSV", self.csv)
+        monkeypatch.setattr(sync_seeds, "CHANGES_JSON", self.changes)
+        monkeypatch.setattr(sync_seeds, "SHEET_ID", "fake-sheet-id")
+        monkeypatch.setattr(sync_seeds, "SHEET_NAME", "mapping")
+        monkeypatch.setattr(sync_seeds, "state_bucket", lambda: self.bucket)
+        monkeypatch.setattr(sync_seeds, "get_credentials", lambda: None)
+        monkeypatch.setattr(
+            sync_seeds, "write_rules_artifact", lambda mapping_path: None
+        )
+
+    def run(self, rows) -> bool:
+        self.runs += 1
+        self.csv.write_bytes(SEED)
+        if self.changes.exists():
+            self.changes.unlink()
+        output = self.tmp_path / f"github_output_{self.runs}"
+        self.monkeypatch.setenv("GITHUB_OUTPUT", str(output))
+        self.monkeypatch.setattr(
+            sync_seeds, "build", lambda *args, **kwargs: FakeSheets(rows)
+        )
+        sync_seeds.sync_seeds()
+        return output.read_text() == "seeds_changed=true\n"
+
+    def keywords(self):
+        return json.loads(self.changes.read_text(encoding="utf-8"))["keywords"]
+
+
+@pytest.fixture
+def pipeline(tmp_path, monkeypatch):
+    return Pipeline(tmp_path, monkeypatch)
+
+
+def edited_rows():
+    rows = seed_rows()
+    rows.append(["GIMNASIO NUEVO", "20", "Gastos", "Ocio", "Deporte", "Gimnasio"])
+    return rows
+
+
+def test_without_state_the_seed_is_reloaded(pipeline):
+    assert pipeline.run(seed_rows())
+
+
+def test_sheet_edit_is_applied_once(pipeline):
+    pipeline.bucket.blob(sync_seeds.APPLIED_BLOB).upload_from_string(SEED)
+
+    assert pipeline.run(edited_rows())
+    assert pipeline.keywords() == ["GIMNASIO NUEVO"]
+    sync_seeds.mark_applied(pipeline.csv)
+
+    # La siguiente ejecución vuelve a partir del CSV commiteado, pero ya está aplicado
+    assert not pipeline.run(edited_rows())
+    assert not pipeline.changes.exists()
+
+
+def test_unapplied_change_is_retried(pipeline):
+    """Si dbt seed o recategorize fallan no se marca: se repite al día siguiente."""
+    pipeline.bucket.blob(sync_seeds.APPLIED_BLOB).upload_from_string(SEED)
+
+    assert pipeline.run(edited_rows())
+    assert pipeline.run(edited_rows())
+    assert pipeline.keywords() == ["GIMNASIO NUEVO"]
+
+
+def test_sheet_reverted_to_committed_csv_is_a_change(pipeline):
+    pipeline.bucket.blob(sync_seeds.APPLIED_BLOB).upload_from_string(SEED)
+    pipeline.run(edited_rows())
+    sync_seeds.mark_applied(pipeline.csv)
+
+    # La hoja vuelve a coincidir con el repo, pero el warehouse tiene la regla nueva
+    assert pipeline.run(seed_rows())
+    assert pipeline.keywords() == ["GIMNASIO NUEVO"]
+    assert pipeline.csv.read_bytes() == SEED
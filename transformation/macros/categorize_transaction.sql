@@ -1,30 +1,38 @@
-{% macro categorize_transaction(concepto_column, importe_column) %}
+{% macro categorize_transaction(concepto_norm_column, importe_column) %}
+    {#- concepto_norm_column debe venir ya normalizado (ver normalize_concepto) -#}
 
     CASE
+    {% if execute %}
+        {#- Reglas precompiladas si están al día; si no, consulta al seed -#}
+        {% set artifact = mapping_artifact('master_mapping') %}
+    {% endif %}
     {% set mapping_query %}
         SELECT
-            REGEXP_REPLACE(NORMALIZE(UPPER(keyword), NFD), r'\pM', '') as clean_keyword,
+            {{ normalize_concepto('keyword') }} as clean_keyword,
             grupo_categoria,
             categoria,
             subcategoria,
             entity_name,
             priority
         FROM {{ ref('master_mapping') }}
-        ORDER BY priority ASC
+        -- Desempate por keyword: mismo orden que ingestion/categorizer.py
+        ORDER BY priority ASC, keyword ASC
     {% endset %}
 
-    {% set mappings = run_query(mapping_query) %}
+    {% if execute %}
+        {% set mappings = artifact['rules'] if artifact else run_query(mapping_query) %}
+    {% endif %}
 
     {% if execute %}
         {% for row in mappings %}
             -- APLICACIÓN:
-            -- 1. Coincidencia de texto (limpio)
+            -- 1. Coincidencia de texto (concepto y keyword normalizados igual)
             -- 2. Lógica de Signo:
             --    Si la regla es de 'Ingresos', solo aplica si el importe es > 0.
             --    Si la regla es de 'Gastos...', solo aplica si el importe es < 0.
             --    Si no especificamos, aplicamos por defecto.
             WHEN
-                REGEXP_REPLACE(NORMALIZE(UPPER({{ concepto_column }}), NFD), r'\pM', '') LIKE '%{{ row['clean_keyword'] }}%'
+                {{ concepto_norm_column }} LIKE '%{{ row['clean_keyword'] }}%'
                 AND (
                     ('{{ row['grupo_categoria'] }}' = 'Ingresos' AND {{ importe_column }} > 0) OR
                     ('{{ row['grupo_categoria'] }}' != 'Ingresos' AND {{ importe_column }} < 0) OR
@@ -0,0 +1,72 @@
+-- macros/cross_db.sql
+-- Funciones con sintaxis distinta en BigQuery y DuckDB (ejecución local).
+
+{% macro sha256_hex(expression) %}
+    {{- return(adapter.dispatch('sha256_hex')(expression)) -}}
+{%- endmacro %}
+
+{% macro bigquery__sha256_hex(expression) %}TO_HEX(SHA256({{ expression }})){% endmacro %}
+
+{% macro duckdb__sha256_hex(expression) %}SHA256({{ expression }}){% endmacro %}
+
+
+{% macro format_amount(expression) %}
+    {#- Importe con dos decimales, como en generate_hash_id() de la ingesta -#}
+    {{- return(adapter.dispatch('format_amount')(expression)) -}}
+{%- endmacro %}
+
+{% macro bigquery__format_amount(expression) %}FORMAT('%.2f', {{ expression }}){% endmacro %}
+
+{% macro duckdb__format_amount(expression) %}PRINTF('%.2f', {{ expression }}){% endmacro %}
+
+
+{% macro format_year_month(date_column) %}
+    {{- return(adapter.dispatch('format_year_month')(date_column)) -}}
+{%- endmacro %}
+
+{% macro bigquery__format_year_month(date_column) %}FORMAT_DATE('%Y-%m', {{ date_column }}){% endmacro %}
+
+{% macro duckdb__format_year_month(date_column) %}STRFTIME({{ date_column }}, '%Y-%m'){% endmacro %}
+
+
+{% macro initcap(expression) %}
+    {{- return(adapter.dispatch('initcap')(expression)) -}}
+{%- endmacro %}
+
+{% macro bigquery__initcap(expression) %}INITCAP({{ expression }}){% endmacro %}
+
+{% macro duckdb__initcap(expression) -%}
+    ARRAY_TO_STRING(
+        LIST_TRANSFORM(STRING_SPLIT(LOWER({{ expression }}), ' '), w -> UPPER(w[1]) || w[2:]),
+        ' '
+    )
+{%- endmacro %}
+
+
+{% macro try_cast(expression, data_type) %}
+    {#- Cast que devuelve NULL en vez de fallar (SAFE_CAST / TRY_CAST) -#}
+    {{- return(adapter.dispatch('try_cast')(expression, data_type)) -}}
+{%- endmacro %}
+
+{% macro bigquery__try_cast(expression, data_type) %}SAFE_CAST({{ expression }} AS {{ data_type }}){% endmacro %}
+
+{% macro duckdb__try_cast(expression, data_type) %}TRY_CAST({{ expression }} AS {{ data_type }}){% endmacro %}
+
+
+{% macro type_double() %}
+    {{- return(adapter.dispatch('type_double')()) -}}
+{%- endmacro %}
+
+{% macro bigquery__type_double() %}FLOAT64{% endmacro %}
+
+{% macro duckdb__type_double() %}DOUBLE{% endmacro %}
+
+
+{% macro unnest_words(text_column, alias) %}
+    {#- Palabras de `text_column` (separadas por un espacio) como filas, para el FROM -#}
+    {{- return(adapter.dispatch('unnest_words')(text_column, alias)) -}}
+{%- endmacro %}
+
+{% macro bigquery__unnest_words(text_column, alias) %}UNNEST(SPLIT({{ text_column }}, ' ')) AS {{ alias }}{% endmacro %}
+
+{% macro duckdb__unnest_words(text_column, alias) %}UNNEST(STRING_SPLIT({{ text_column }}, ' ')) AS _words({{ alias }}){% endmacro %}
@@ -0,0 +1,382 @@
+-- AUTOGENERADO por ingestion/rules_artifact.py (sync_seeds.py). No editar a mano.
+-- Reglas normalizadas y ordenadas por prioridad; cada seed lleva el sha256
+-- de su CSV y solo se usa si coincide con el que carga dbt (ver mapping_artifact).
+
+{% macro compiled_mapping_rules() %}
+{{ return({"master_mapping": {"sha256": "b26e716c60223e1a6163b938444d70398cf25b9cafff3ca68fd5002b3d36552b", "version": "3de36d8cfa1b573c", "rules": [
+            {"clean_keyword": "A.E.A.T.", "priority": 10, "is_income": true, "grupo_categoria": "Ingresos", "categoria": "Devoluciones", "subcategoria": "Hacienda", "entity_name": "Agencia Tributaria"},
+            {"clean_keyword": "AMAZON PRIME", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Suscripciones", "subcategoria": "Streaming", "entity_name": "Amazon Prime"},
+            {"clean_keyword": "ARRE", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Restaurantes y Bares", "entity_name": "Arre"},
+            {"clean_keyword": "ARVOBILBAO", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Restaurantes y Bares", "entity_name": "Arvo Bilbao"},
+            {"clean_keyword": "ASUABERRI", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Restaurantes y Bares", "entity_name": "Asuaberri"},
+            {"clean_keyword": "BAKELITO", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Restaurantes y Bares", "entity_name": "Bakelito"},
+            {"clean_keyword": "BALUARD", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Restaurantes y Bares", "entity_name": "Baluard"},
+            {"clean_keyword": "BANKINTER SEGUROS", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Seguros", "subcategoria": "Vida/Hogar", "entity_name": "Bankinter Seguros"},
+            {"clean_keyword": "BASE TECHNOLOGY", "priority": 10, "is_income": true, "grupo_categoria": "Ingresos", "categoria": "Nómina", "subcategoria": "Salario Base", "entity_name": "Basetis"},
+            {"clean_keyword": "BELLA CIAO", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Restaurantes y Bares", "entity_name": "Bella Ciao"},
+            {"clean_keyword": "BINANCE", "priority": 10, "is_income": false, "grupo_categoria": "Ahorro e Inversión", "categoria": "Inversión", "subcategoria": "Criptomonedas", "entity_name": "Binance"},
+            {"clean_keyword": "BNEXT", "priority": 10, "is_income": false, "grupo_categoria": "Movimientos Operativos", "categoria": "Transferencias", "subcategoria": "Recarga Tarjeta", "entity_name": "Bnext"},
+            {"clean_keyword": "BOCALINDA", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Restaurantes y Bares", "entity_name": "Bocalinda"},
+            {"clean_keyword": "BOTAVARA", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Restaurantes y Bares", "entity_name": "Botavara"},
+            {"clean_keyword": "BRIDGE BROKER", "priority": 10, "is_income": true, "grupo_categoria": "Ingresos", "categoria": "Nómina", "subcategoria": "Salario Base", "entity_name": "Bridge Broker"},
+            {"clean_keyword": "BUDAPEST COFFEE", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Cafeterías", "entity_name": "Budapest Coffee"},
+            {"clean_keyword": "CAN VILALTA", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Restaurantes y Bares", "entity_name": "Can Vilalta"},
+            {"clean_keyword": "CARISMA NATURAL", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Restaurantes y Bares", "entity_name": "Carisma Natural"},
+            {"clean_keyword": "CASA ELENA", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Restaurantes y Bares", "entity_name": "Casa Elena"},
+            {"clean_keyword": "CASA FRAN", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Restaurantes y Bares", "entity_name": "Casa Fran"},
+            {"clean_keyword": "CASA MINGUITO", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Restaurantes y Bares", "entity_name": "Casa Minguito"},
+            {"clean_keyword": "CASA PATACONA", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Restaurantes y Bares", "entity_name": "Casa Patacona"},
+            {"clean_keyword": "CENTOLLOS", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Restaurantes y Bares", "entity_name": "Centollos Bilbao"},
+            {"clean_keyword": "COINBASE", "priority": 10, "is_income": false, "grupo_categoria": "Ahorro e Inversión", "categoria": "Inversión", "subcategoria": "Criptomonedas", "entity_name": "Coinbase"},
+            {"clean_keyword": "COM APER PT", "priority": 10, "is_income": false, "grupo_categoria": "Movimientos Operativos", "categoria": "Préstamos y Financiación ", "subcategoria": "Disposición de Capital", "entity_name": "Bankinter"},
+            {"clean_keyword": "COM. USO REDES", "priority": 10, "is_income": false, "grupo_categoria": "Movimientos Operativos", "categoria": "Comisiones Bancarias", "subcategoria": "Cambio Divisa y Redes", "entity_name": "Bankinter"},
+            {"clean_keyword": "COMISION MANTENIMIENTO", "priority": 10, "is_income": false, "grupo_categoria": "Movimientos Operativos", "categoria": "Comisiones Bancarias", "subcategoria": "Mantenimiento Cuenta", "entity_name": "Bankinter"},
+            {"clean_keyword": "DEVOLUCIONES TRIBUTARIA", "priority": 10, "is_income": true, "grupo_categoria": "Ingresos", "categoria": "Devoluciones", "subcategoria": "Hacienda", "entity_name": "Agencia Tributaria"},
+            {"clean_keyword": "EL COLMADO", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Restaurantes y Bares", "entity_name": "El Colmado"},
+            {"clean_keyword": "EL MEJILLON", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Restaurantes y Bares", "entity_name": "El Mejillón"},
+            {"clean_keyword": "EL PARRAL", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Restaurantes y Bares", "entity_name": "El Parral"},
+            {"clean_keyword": "FLOR CENT", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Cafeterías", "entity_name": "Flor de la Vall"},
+            {"clean_keyword": "FOGASA", "priority": 10, "is_income": true, "grupo_categoria": "Ingresos", "categoria": "Nómina", "subcategoria": "Indemnizaciones", "entity_name": "FOGASA"},
+            {"clean_keyword": "FINLUX TECH", "priority": 10, "is_income": false, "grupo_categoria": "Ahorro e Inversión", "categoria": "Inversión", "subcategoria": "Criptomonedas", "entity_name": "Kucoin"},
+            {"clean_keyword": "GARCIA GOURMET", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Cafeterías", "entity_name": "Garcia Gourmet"},
+            {"clean_keyword": "GEOTECNIA", "priority": 10, "is_income": false, "grupo_categoria": "Movimientos Operativos", "categoria": "Obras e Inversión Real", "subcategoria": "Obras Grandes", "entity_name": "Geotecnia"},
+            {"clean_keyword": "GEOVAL", "priority": 10, "is_income": false, "grupo_categoria": "Movimientos Operativos", "categoria": "Obras e Inversión Real", "subcategoria": "Obras Grandes", "entity_name": "Geotecnia"},
+            {"clean_keyword": "IMP DISP PT", "priority": 10, "is_income": false, "grupo_categoria": "Movimientos Operativos", "categoria": "Préstamos y Financiación ", "subcategoria": "Disposición de Capital", "entity_name": "Bankinter Hipoteca"},
+            {"clean_keyword": "IMP INIC PT", "priority": 10, "is_income": false, "grupo_categoria": "Movimientos Operativos", "categoria": "Préstamos y Financiación ", "subcategoria": "Disposición de Capital", "entity_name": "Bankinter Hipoteca"},
+            {"clean_keyword": "INTUR", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Restaurantes y Bares", "entity_name": "Intur"},
+            {"clean_keyword": "JALEO", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Ocio Nocturno", "entity_name": "Jaleo"},
+            {"clean_keyword": "KUCOIN", "priority": 10, "is_income": false, "grupo_categoria": "Ahorro e Inversión", "categoria": "Inversión", "subcategoria": "Criptomonedas", "entity_name": "Kucoin"},
+            {"clean_keyword": "LA BELEPOC", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Restaurantes y Bares", "entity_name": "La Belepoc"},
+            {"clean_keyword": "LA DAMA BLANCA", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Cafeterías", "entity_name": "La Dama Blanca"},
+            {"clean_keyword": "LA DOLCE VITA", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Restaurantes y Bares", "entity_name": "La Dolce Vita"},
+            {"clean_keyword": "LA GOLETA", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Restaurantes y Bares", "entity_name": "La Goleta"},
+            {"clean_keyword": "LA REDONA", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Restaurantes y Bares", "entity_name": "La Redona"},
+            {"clean_keyword": "LA SELECTA", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Restaurantes y Bares", "entity_name": "La Selecta"},
+            {"clean_keyword": "LA TERRACITA", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Restaurantes y Bares", "entity_name": "La Terracita"},
+            {"clean_keyword": "LA TOSTADORA", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Cafeterías", "entity_name": "La Tostadora"},
+            {"clean_keyword": "LIQUID. CUOTA", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Vivienda", "subcategoria": "Hipoteca", "entity_name": "Bankinter Hipoteca"},
+            {"clean_keyword": "LIQUID. CUOTA PTMO", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Vivienda", "subcategoria": "Hipoteca", "entity_name": "Bankinter Hipoteca"},
+            {"clean_keyword": "LLEDO AMOROS", "priority": 10, "is_income": false, "grupo_categoria": "Movimientos Operativos", "categoria": "Transferencias", "subcategoria": "Gastos Compartidos", "entity_name": "Lledó"},
+            {"clean_keyword": "LORCA 41", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Restaurantes y Bares", "entity_name": "Lorca 41"},
+            {"clean_keyword": "LYONBURGO", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Fast Food", "entity_name": "Lyonburgo"},
+            {"clean_keyword": "LA MOVIDA", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Restaurantes y Bares", "entity_name": "La Movida"},
+            {"clean_keyword": "MASET", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Restaurantes y Bares", "entity_name": "El Maset"},
+            {"clean_keyword": "MESON", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Restaurantes y Bares", "entity_name": "Mesón"},
+            {"clean_keyword": "NURIA AGUT", "priority": 10, "is_income": false, "grupo_categoria": "Movimientos Operativos", "categoria": "Obras e Inversión Real", "subcategoria": "Obras Grandes", "entity_name": "Nuria Agut"},
+            {"clean_keyword": "PANCHO", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Restaurantes y Bares", "entity_name": "Panchos"},
+            {"clean_keyword": "PROVISION FONDO", "priority": 10, "is_income": false, "grupo_categoria": "Movimientos Operativos", "categoria": "Trámites y Escrituras", "subcategoria": "Provisión de Fondos", "entity_name": "Bankinter"},
+            {"clean_keyword": "PARASZTKONYHA", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Restaurantes y Bares", "entity_name": "Parasztkonyha"},
+            {"clean_keyword": "RECIBO PLATINUM", "priority": 10, "is_income": false, "grupo_categoria": "Movimientos Operativos", "categoria": "Tarjetas", "subcategoria": "Liquidación Tarjeta", "entity_name": "Bankinter"},
+            {"clean_keyword": "RESTORE", "priority": 10, "is_income": false, "grupo_categoria": "Movimientos Operativos", "categoria": "Obras e Inversión Real", "subcategoria": "Obras Grandes", "entity_name": "Restore Edificaciones"},
+            {"clean_keyword": "REVOLUT", "priority": 10, "is_income": false, "grupo_categoria": "Movimientos Operativos", "categoria": "Transferencias", "subcategoria": "Recarga Tarjeta", "entity_name": "Revolut"},
+            {"clean_keyword": "ROBERTS SMASH", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Restaurantes y Bares", "entity_name": "Roberts Smash"},
+            {"clean_keyword": "RETRO LANGOS", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Restaurantes y Bares", "entity_name": "Retro Lángos"},
+            {"clean_keyword": "SABOR ZULIANO", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Restaurantes y Bares", "entity_name": "Sabor Zuliano"},
+            {"clean_keyword": "SALT IN CAKE", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Cafeterías", "entity_name": "Salt in Cake"},
+            {"clean_keyword": "SANTA GLORIA", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Cafeterías", "entity_name": "Santa Gloria"},
+            {"clean_keyword": "SHOKAI", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Restaurantes y Bares", "entity_name": "Shokai Sushi"},
+            {"clean_keyword": "SIROPE", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Cafeterías", "entity_name": "Sirope"},
+            {"clean_keyword": "VENTA GUADALEST", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Restaurantes y Bares", "entity_name": "Venta Guadalest"},
+            {"clean_keyword": "VISA CLASICA", "priority": 10, "is_income": false, "grupo_categoria": "Movimientos Operativos", "categoria": "Tarjetas", "subcategoria": "Liquidación Tarjeta", "entity_name": "Bankinter"},
+            {"clean_keyword": "VIVES 1908", "priority": 10, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Cafeterías", "entity_name": "Cafetería Vives"},
+            {"clean_keyword": "ABRACADABRA", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Juguetes y Juegos", "entity_name": "Abracadabra"},
+            {"clean_keyword": "ADRIVI", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Ropa y Accesorios", "entity_name": "Adrivi"},
+            {"clean_keyword": "AIRBNB", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Viajes", "subcategoria": "Alojamiento", "entity_name": "Airbnb"},
+            {"clean_keyword": "ALCAMPO", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Alimentación", "subcategoria": "Supermercado", "entity_name": "Alcampo"},
+            {"clean_keyword": "ALDI", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Alimentación", "subcategoria": "Supermercado", "entity_name": "Aldi"},
+            {"clean_keyword": "ALIEXPRESS", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Compras Online (Genérico)", "entity_name": "AliExpress"},
+            {"clean_keyword": "ALIPAY", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Compras Online (Genérico)", "entity_name": "AliExpress"},
+            {"clean_keyword": "ANTONIA ALEJANDRA", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Ropa y Accesorios", "entity_name": "Antonia Alejandra"},
+            {"clean_keyword": "AUDITORIO", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Cultura y Espectáculos", "entity_name": "Auditorio"},
+            {"clean_keyword": "AYUNTAMIENTO DE CASTELLON", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Impuestos y Tasas", "subcategoria": "Vivienda (IBI/Basuras)", "entity_name": "Ayuntamiento de Castellón"},
+            {"clean_keyword": "BAUHAUS", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Hogar y Decoración", "entity_name": "Bauhaus"},
+            {"clean_keyword": "BON AREA", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Alimentación", "subcategoria": "Supermercado", "entity_name": "Bon Àrea"},
+            {"clean_keyword": "BOOKING", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Viajes", "subcategoria": "Alojamiento", "entity_name": "Booking.com"},
+            {"clean_keyword": "CAJA", "priority": 20, "is_income": false, "grupo_categoria": "Movimientos Operativos", "categoria": "Efectivo", "subcategoria": "Cajero", "entity_name": "Cajero"},
+            {"clean_keyword": "CAJERO", "priority": 20, "is_income": false, "grupo_categoria": "Movimientos Operativos", "categoria": "Efectivo", "subcategoria": "Cajero", "entity_name": "Cajero"},
+            {"clean_keyword": "CALZEDONIA", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Ropa y Accesorios", "entity_name": "Calzedonia"},
+            {"clean_keyword": "CASH CASTELLON", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Alimentación", "subcategoria": "Supermercado", "entity_name": "Cash Castellón"},
+            {"clean_keyword": "COLEGIO DE REGISTRADORES", "priority": 20, "is_income": false, "grupo_categoria": "Movimientos Operativos", "categoria": "Trámites y Escrituras", "subcategoria": "Registro y Notaría ", "entity_name": "Colegio de Registradores"},
+            {"clean_keyword": "COMPUCENTER", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Tecnología y Electrónica", "entity_name": "Compucenter"},
+            {"clean_keyword": "CONSUM", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Alimentación", "subcategoria": "Supermercado", "entity_name": "Consum"},
+            {"clean_keyword": "COOLMOD", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Tecnología y Electrónica", "entity_name": "Coolmod"},
+            {"clean_keyword": "CUSTOM FIGHTER", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Deportes", "entity_name": "Custom Fighter"},
+            {"clean_keyword": "DECATHLON", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Deportes", "entity_name": "Decathlon"},
+            {"clean_keyword": "DIGI", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Suministros", "subcategoria": "Internet y Teléfono", "entity_name": "Digi"},
+            {"clean_keyword": "DRUNI", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Salud y Cuidado", "subcategoria": "Cosmética e Higiene", "entity_name": "Druni"},
+            {"clean_keyword": "EASYPARK", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Transporte", "subcategoria": "Parking y Peajes", "entity_name": "EasyPark"},
+            {"clean_keyword": "ENDESA", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Suministros", "subcategoria": "Luz", "entity_name": "Endesa"},
+            {"clean_keyword": "ETAM", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Ropa y Accesorios", "entity_name": "Etam"},
+            {"clean_keyword": "FACSA", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Suministros", "subcategoria": "Agua", "entity_name": "Facsa"},
+            {"clean_keyword": "FARMACIA BALLESTER", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Salud y Cuidado", "subcategoria": "Farmacia", "entity_name": "Farmacia Ballester Badenes"},
+            {"clean_keyword": "FARMACIASDIRECT", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Salud y Cuidado", "subcategoria": "Farmacia", "entity_name": "Farmaciasdirect"},
+            {"clean_keyword": "FARMAFEROLES", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Salud y Cuidado", "subcategoria": "Farmacia", "entity_name": "Farmaferoles"},
+            {"clean_keyword": "FARMAFY", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Salud y Cuidado", "subcategoria": "Farmacia", "entity_name": "Farmafy"},
+            {"clean_keyword": "FARMATOP", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Salud y Cuidado", "subcategoria": "Farmacia", "entity_name": "Farmatop"},
+            {"clean_keyword": "FINANCIERA EL CORTE", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Grandes Almacenes", "entity_name": "El Corte Inglés"},
+            {"clean_keyword": "FNAC", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Tecnología y Electrónica", "entity_name": "Fnac"},
+            {"clean_keyword": "G2A", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Compras Online (Genérico)", "entity_name": "G2A"},
+            {"clean_keyword": "G2G", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Compras Online (Genérico)", "entity_name": "G2G"},
+            {"clean_keyword": "GENERALI", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Seguros", "subcategoria": "Vida/Hogar", "entity_name": "Generali Seguros"},
+            {"clean_keyword": "GENERALITAT VALENCIANA", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Impuestos y Tasas", "subcategoria": "Tasas Administrativas", "entity_name": "Generalitat Valenciana"},
+            {"clean_keyword": "GESTOPARK", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Transporte", "subcategoria": "Parking y Peajes", "entity_name": "Gestopark"},
+            {"clean_keyword": "GLOVAL VALUATION", "priority": 20, "is_income": false, "grupo_categoria": "Movimientos Operativos", "categoria": "Trámites y Escrituras", "subcategoria": "Tasación", "entity_name": "Gloval Valuation"},
+            {"clean_keyword": "GOVEE", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Tecnología y Electrónica", "entity_name": "Govee"},
+            {"clean_keyword": "HAZELNUT", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Ropa y Accesorios", "entity_name": "Hazelnut"},
+            {"clean_keyword": "IBERDROLA", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Suministros", "subcategoria": "Luz", "entity_name": "Iberdrola"},
+            {"clean_keyword": "IKEA", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Hogar y Decoración", "entity_name": "Ikea"},
+            {"clean_keyword": "ITV", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Transporte", "subcategoria": "Trámites Vehiculo", "entity_name": "Sitval ITV"},
+            {"clean_keyword": "JACK & JONES", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Ropa y Accesorios", "entity_name": "Jack & Jones"},
+            {"clean_keyword": "JAZZTEL", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Suministros", "subcategoria": "Internet y Teléfono", "entity_name": "Jazztel"},
+            {"clean_keyword": "JYSK", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Hogar y Decoración", "entity_name": "Jysk"},
+            {"clean_keyword": "KIWOKO", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Mascotas", "subcategoria": "Alimentación y Accesorios", "entity_name": "Kiwoko"},
+            {"clean_keyword": "LEROY MERLIN", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Hogar y Decoración", "entity_name": "Leroy Merlin"},
+            {"clean_keyword": "LIDL", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Alimentación", "subcategoria": "Supermercado", "entity_name": "Lidl"},
+            {"clean_keyword": "LUCKIA", "priority": 20, "is_income": false, "grupo_categoria": "Ahorro e Inversión", "categoria": none, "subcategoria": none, "entity_name": "Luckia"},
+            {"clean_keyword": "MAPFRE", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Seguros", "subcategoria": "Vida/Hogar", "entity_name": "Mapfre Seguros"},
+            {"clean_keyword": "MAS Y MAS", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Alimentación", "subcategoria": "Supermercado", "entity_name": "Mas y Mas"},
+            {"clean_keyword": "MEDIA MARKT", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Tecnología y Electrónica", "entity_name": "Media Markt"},
+            {"clean_keyword": "MERCADONA", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Alimentación", "subcategoria": "Supermercado", "entity_name": "Mercadona"},
+            {"clean_keyword": "MI.COM", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Tecnología y Electrónica", "entity_name": "XiaoMi"},
+            {"clean_keyword": "MIRAVIA", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Compras Online (Genérico)", "entity_name": "Miravia"},
+            {"clean_keyword": "MUY MUCHO", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Hogar y Decoración", "entity_name": "Muy Mucho"},
+            {"clean_keyword": "NETFLIX", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Suscripciones", "subcategoria": "Streaming", "entity_name": "Netflix"},
+            {"clean_keyword": "O-BI OINETAKOAK", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Ropa y Accesorios", "entity_name": "O-BI"},
+            {"clean_keyword": "PARKIMETER", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Transporte", "subcategoria": "Parking y Peajes", "entity_name": "Parkimeter"},
+            {"clean_keyword": "PAVAPARK", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Transporte", "subcategoria": "Parking y Peajes", "entity_name": "Pavapark"},
+            {"clean_keyword": "PAYSAFE", "priority": 20, "is_income": false, "grupo_categoria": "Ahorro e Inversión", "categoria": "Inversión", "subcategoria": "Criptomonedas", "entity_name": "Paysafe"},
+            {"clean_keyword": "PCCOMPONENTES", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Tecnología y Electrónica", "entity_name": "PcComponentes"},
+            {"clean_keyword": "PRIMA SEGURO", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Seguros", "subcategoria": "Vida/Hogar", "entity_name": "Prima Seguros"},
+            {"clean_keyword": "PRIMOR", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Salud y Cuidado", "subcategoria": "Cosmética e Higiene", "entity_name": "Primor"},
+            {"clean_keyword": "PROZIS", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Salud y Cuidado", "subcategoria": "Nutrición y Suplementos", "entity_name": "Prozis"},
+            {"clean_keyword": "RENFE", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Viajes", "subcategoria": "Billetes (Avión/Tren)", "entity_name": "Renfe"},
+            {"clean_keyword": "RIOT GAMES", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Compras Online (Genérico)", "entity_name": "Riot Games"},
+            {"clean_keyword": "RYANAIR", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Viajes", "subcategoria": "Billetes (Avión/Tren)", "entity_name": "Ryanair"},
+            {"clean_keyword": "SAMSUNG", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Tecnología y Electrónica", "entity_name": "Samsung"},
+            {"clean_keyword": "SINGULARU", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Ropa y Accesorios", "entity_name": "Singularu"},
+            {"clean_keyword": "SITVAL ITV", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Transporte", "subcategoria": "Trámites Vehiculo", "entity_name": "Sitval ITV"},
+            {"clean_keyword": "SPAR", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Alimentación", "subcategoria": "Supermercado", "entity_name": "Spar"},
+            {"clean_keyword": "SPOTIFY", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Suscripciones", "subcategoria": "Streaming", "entity_name": "Spotify"},
+            {"clean_keyword": "SPRINGFIELD", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Ropa y Accesorios", "entity_name": "Springfield"},
+            {"clean_keyword": "TEATRO OLYMPIA", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Cultura y Espectáculos", "entity_name": "Teatro Olympia"},
+            {"clean_keyword": "TELPARK", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Transporte", "subcategoria": "Parking y Peajes", "entity_name": "Telpark"},
+            {"clean_keyword": "TODOJUGUETE", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Juguetes y Juegos", "entity_name": "Todojuguete"},
+            {"clean_keyword": "TRADINGVIEW", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Suscripciones", "subcategoria": "Software y Apps", "entity_name": "TradingView"},
+            {"clean_keyword": "TREKKINN", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Deportes", "entity_name": "Trekkinn"},
+            {"clean_keyword": "UDEMY", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Formación", "subcategoria": "Cursos Online", "entity_name": "Udemy"},
+            {"clean_keyword": "VICENTE MIRAVETE", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Cafeterías", "entity_name": "Vicente Miravete"},
+            {"clean_keyword": "VERIFICACIONES", "priority": 20, "is_income": false, "grupo_categoria": "Movimientos Operativos", "categoria": "Trámites y Escrituras", "subcategoria": "Tasación", "entity_name": "Verificaciones y Certificaciones"},
+            {"clean_keyword": "WALLAPOP", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Compras Online (Genérico)", "entity_name": "Wallapop"},
+            {"clean_keyword": "XIAOMI", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Tecnología y Electrónica", "entity_name": "XiaoMi"},
+            {"clean_keyword": "ZOOPLUS", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Mascotas", "subcategoria": "Alimentación y Accesorios", "entity_name": "Zooplus"},
+            {"clean_keyword": "ZURICH", "priority": 20, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Seguros", "subcategoria": "Vehículo", "entity_name": "Zurich Seguros"},
+            {"clean_keyword": "SANTANDER CONSUMER", "priority": 25, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Hogar y Decoración", "entity_name": "Bauhaus (Financiación)"},
+            {"clean_keyword": "AEROPORTO", "priority": 30, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Viajes", "subcategoria": "Gastos en Destino", "entity_name": "Aeropuerto"},
+            {"clean_keyword": "AEROPUERTO", "priority": 30, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Viajes", "subcategoria": "Gastos en Destino", "entity_name": "Aeropuerto"},
+            {"clean_keyword": "BABEL LLIBRERIA", "priority": 30, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Libros y Papelería", "entity_name": "Babel"},
+            {"clean_keyword": "BIZKAIBUS", "priority": 30, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Transporte", "subcategoria": "Transporte Público", "entity_name": "Bizkaibus"},
+            {"clean_keyword": "CAFE DROMEDARIO", "priority": 30, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Alimentación", "subcategoria": "Café e Insumos", "entity_name": "Café Dromedario"},
+            {"clean_keyword": "CARNICAS JUGOSA", "priority": 30, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Alimentación", "subcategoria": "Mercado/Tienda local", "entity_name": "Carnicas Jugosa"},
+            {"clean_keyword": "CASTELLON SALERA", "priority": 30, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Grandes Almacenes", "entity_name": "CC Salera"},
+            {"clean_keyword": "EL CORTE INGLES", "priority": 30, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Grandes Almacenes", "entity_name": "El Corte Inglés"},
+            {"clean_keyword": "ELS SARIERS", "priority": 30, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Heladerías y Horchaterías", "entity_name": "Els Sariers"},
+            {"clean_keyword": "ENCURTIDOS JOYA", "priority": 30, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Alimentación", "subcategoria": "Mercado/Tienda local", "entity_name": "Encurtidos Joya"},
+            {"clean_keyword": "EUSKOTREN", "priority": 30, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Viajes", "subcategoria": "Billetes (Avión/Tren)", "entity_name": "Euskotren"},
+            {"clean_keyword": "FERRETERIA ESCRIG", "priority": 30, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Bricolaje y Jardín", "entity_name": "Ferreteria Escrig"},
+            {"clean_keyword": "FRIGORIFICOS SANZ", "priority": 30, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Alimentación", "subcategoria": "Mercado/Tienda local", "entity_name": "Frigorificos Sanz"},
+            {"clean_keyword": "GELSIN", "priority": 30, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Suscripciones", "subcategoria": "Streaming", "entity_name": "Turgame"},
+            {"clean_keyword": "HELADERIA", "priority": 30, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Heladerías y Horchaterías", "entity_name": "Heladería"},
+            {"clean_keyword": "HORCHATERIA", "priority": 30, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Heladerías y Horchaterías", "entity_name": "Horchatería"},
+            {"clean_keyword": "HOTEL", "priority": 30, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Viajes", "subcategoria": "Alojamiento", "entity_name": "Hotel"},
+            {"clean_keyword": "IYZICO", "priority": 30, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Suscripciones", "subcategoria": "Streaming", "entity_name": "Turgame"},
+            {"clean_keyword": "JIJONENCOS", "priority": 30, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Heladerías y Horchaterías", "entity_name": "Jijonencos"},
+            {"clean_keyword": "JUPING WU", "priority": 30, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Bazares y Multiprecio", "entity_name": "Juping Wu"},
+            {"clean_keyword": "KEBAB", "priority": 30, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Fast Food", "entity_name": "Kebab"},
+            {"clean_keyword": "LACOLADACS", "priority": 30, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Servicios Hogar", "subcategoria": "Lavandería y Tintorería", "entity_name": "La Colada CS"},
+            {"clean_keyword": "LEBLANC", "priority": 30, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Salud y Cuidado", "subcategoria": "Cuidado Personal", "entity_name": "Le Blanc Peluquería"},
+            {"clean_keyword": "LEKUE", "priority": 30, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Menaje y Cocina", "entity_name": "Lekué"},
+            {"clean_keyword": "MARKET CASTELLO", "priority": 30, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Alimentación", "subcategoria": "Supermercado", "entity_name": "Market Castelló"},
+            {"clean_keyword": "MAXICOFFEE", "priority": 30, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Menaje y Cocina", "entity_name": "MaxiCoffee"},
+            {"clean_keyword": "METRO", "priority": 30, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Transporte", "subcategoria": "Transporte Público", "entity_name": "Metro"},
+            {"clean_keyword": "MY SWEET", "priority": 30, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Cafeterías", "entity_name": "My Sweet"},
+            {"clean_keyword": "NOVADELTA", "priority": 30, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Alimentación", "subcategoria": "Café e Insumos", "entity_name": "Cafés Delta"},
+            {"clean_keyword": "OH MY BOWL", "priority": 30, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Cafeterías", "entity_name": "Oh My Bowl"},
+            {"clean_keyword": "OMOTON", "priority": 30, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Tecnología y Electrónica", "entity_name": "Omoton"},
+            {"clean_keyword": "PAYBOX", "priority": 30, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Suscripciones", "subcategoria": "Streaming", "entity_name": "Turgame"},
+            {"clean_keyword": "PINGSINS", "priority": 30, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Fast Food", "entity_name": "Pingüins"},
+            {"clean_keyword": "SHADES OF COFFEE", "priority": 30, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Menaje y Cocina", "entity_name": "Shades of Coffee"},
+            {"clean_keyword": "SOUVENIRS", "priority": 30, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Viajes", "subcategoria": "Gastos en Destino", "entity_name": "Souvenirs"},
+            {"clean_keyword": "TOURNE", "priority": 30, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Transporte", "subcategoria": none, "entity_name": "Tourne"},
+            {"clean_keyword": "TURGAME", "priority": 30, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Suscripciones", "subcategoria": "Streaming", "entity_name": "Turgame"},
+            {"clean_keyword": "UDACO", "priority": 30, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Alimentación", "subcategoria": "Supermercado", "entity_name": "Udaco"},
+            {"clean_keyword": "VETERINARIA", "priority": 30, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Mascotas", "subcategoria": "Alimentación y Accesorios", "entity_name": "Veterinario"},
+            {"clean_keyword": "CONVERSION A TRY", "priority": 40, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Suscripciones", "subcategoria": "Streaming", "entity_name": "Disney+"},
+            {"clean_keyword": "FERRETERIA", "priority": 40, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Bricolaje y Jardín", "entity_name": "Ferretería Local"},
+            {"clean_keyword": "FORN", "priority": 40, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Alimentación", "subcategoria": "Mercado/Tienda local", "entity_name": "Panadería Local"},
+            {"clean_keyword": "PANADERIA MATEU", "priority": 40, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Alimentación", "subcategoria": "Mercado/Tienda local", "entity_name": "Els Ibarsos"},
+            {"clean_keyword": "PANADERIA MONICA", "priority": 40, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Alimentación", "subcategoria": "Mercado/Tienda local", "entity_name": "Panadería Mónica"},
+            {"clean_keyword": "PANADERIA VIVES", "priority": 40, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Alimentación", "subcategoria": "Mercado/Tienda local", "entity_name": "Cafetería Vives"},
+            {"clean_keyword": "TERRETA DOLCA", "priority": 40, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Alimentación", "subcategoria": "Mercado/Tienda local", "entity_name": "Terreta Dolça"},
+            {"clean_keyword": "AMAZON", "priority": 50, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Compras Online (Genérico)", "entity_name": "Amazon"},
+            {"clean_keyword": "AMZN", "priority": 50, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Compras Online (Genérico)", "entity_name": "Amazon"},
+            {"clean_keyword": "BAZAR", "priority": 50, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Compras", "subcategoria": "Bazares y Multiprecio", "entity_name": "Bazar"},
+            {"clean_keyword": "CAFETERIA", "priority": 50, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Cafeterías", "entity_name": "Cafetería Genérica"},
+            {"clean_keyword": "FARMACIA", "priority": 50, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Salud y Cuidado", "subcategoria": "Farmacia", "entity_name": "Farmacia"},
+            {"clean_keyword": "LIQ. PROPIA CTA", "priority": 50, "is_income": true, "grupo_categoria": "Ingresos", "categoria": "Ingresos Pasivos", "subcategoria": "Intereses", "entity_name": "Bankinter"},
+            {"clean_keyword": "PANADERIA", "priority": 50, "is_income": false, "grupo_categoria": "Gastos Fijos", "categoria": "Alimentación", "subcategoria": "Mercado/Tienda local", "entity_name": "Panadería Local"},
+            {"clean_keyword": "PELUQUERIA", "priority": 50, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Salud y Cuidado", "subcategoria": "Cuidado Personal", "entity_name": "Peluquería"},
+            {"clean_keyword": "PERK COMPENSATION", "priority": 50, "is_income": true, "grupo_categoria": "Ingresos", "categoria": "Otros Ingresos", "subcategoria": none, "entity_name": "Revolut"},
+            {"clean_keyword": "PROMO I14", "priority": 50, "is_income": true, "grupo_categoria": "Ingresos", "categoria": "Otros Ingresos", "subcategoria": none, "entity_name": "Revolut"},
+            {"clean_keyword": "RESTAURANTE", "priority": 50, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Restaurantes y Bares", "entity_name": "Restaurante Genérico"},
+            {"clean_keyword": "REWARD FOR", "priority": 50, "is_income": true, "grupo_categoria": "Ingresos", "categoria": "Otros Ingresos", "subcategoria": none, "entity_name": "Revolut"},
+            {"clean_keyword": "SALDO A FAVOR", "priority": 50, "is_income": true, "grupo_categoria": "Ingresos", "categoria": "Otros Ingresos", "subcategoria": "Regularización", "entity_name": "Bankinter"},
+            {"clean_keyword": "BAR", "priority": 60, "is_income": false, "grupo_categoria": "Gastos Variables", "categoria": "Ocio y Restauración", "subcategoria": "Cafeterías", "entity_name": "Bar Genérico"},
+            {"clean_keyword": "PAGO BIZUM", "priority": 60, "is_income": false, "grupo_categoria": "Movimientos Operativos", "categoria": "Transferencias", "subcategoria": "Bizum (Ocio/Ajustes)", "entity_name": "Bizum"},
+            {"clean_keyword": "TRANS", "priority": 60, "is_income": false, "grupo_categoria": "Movimientos Operativos", "categoria": "Transferencias", "subcategoria": "Transferencias a terceros", "entity_name": "Transferencia"},
+            {"clean_keyword": "TRANSF", "priority": 60, "is_income": false, "grupo_categoria": "Movimientos Operativos", "categoria": "Transferencias", "subcategoria": "Transferencias a terceros", "entity_name": "Transferencia"},
+            {"clean_keyword": "TRANSFERENCIA", "priority": 60, "is_income": false, "grupo_categoria": "Movimientos Operativos", "categoria": "Transferencias", "subcategoria": "Transferencias a terceros", "entity_name": "Transferencia"}
+        ], "conflicts": [
+            {"type": "shadowed", "keyword": "LIQUID. CUOTA PTMO", "kept": "LIQUID. CUOTA", "dropped": none},
+            {"type": "shadowed", "keyword": "GENERALITAT VALENCIANA", "kept": "GENERALI", "dropped": none},
+            {"type": "shadowed", "keyword": "SITVAL ITV", "kept": "ITV", "dropped": none},
+            {"type": "shadowed", "keyword": "SANTANDER CONSUMER", "kept": "CONSUM", "dropped": none},
+            {"type": "shadowed", "keyword": "TRANSF", "kept": "TRANS", "dropped": none},
+            {"type": "shadowed", "keyword": "TRANSFERENCIA", "kept": "TRANS", "dropped": none}
+        ]}, "map_entities": {"sha256": "0bf7a1de8b6aefe91b7c7c39643d30e7fde8ec8fddc3bea8aa5c2831de88be4b", "rules": [
+            {"clean_keyword": "AMAZON PRIME", "entity_name": "Amazon Prime"},
+            {"clean_keyword": "AMAZON WEB SERVICES", "entity_name": "Amazon AWS"},
+            {"clean_keyword": "AWS", "entity_name": "Amazon AWS"},
+            {"clean_keyword": "CAJA", "entity_name": "Bankinter"},
+            {"clean_keyword": "CAJERO", "entity_name": "Bankinter"},
+            {"clean_keyword": "COLEGIO DE REGISTRA", "entity_name": "Colegio de Registradores"},
+            {"clean_keyword": "LIQ. PROPIA CTA.", "entity_name": "Bankinter"},
+            {"clean_keyword": "AYUNTAMIENTO DE CASTELLON", "entity_name": "Ayuntamiento de Castellón"},
+            {"clean_keyword": "BRIDGE BROKER SL", "entity_name": "Bridge Broker"},
+            {"clean_keyword": "DIGI SPAIN TELECOM", "entity_name": "Digi"},
+            {"clean_keyword": "EUROMID LEVANTE", "entity_name": "Euromid Levante"},
+            {"clean_keyword": "FINANCIERA EL CORTE ING", "entity_name": "Financiera El Corte Inglés"},
+            {"clean_keyword": "IBERDROLA CLIENTES", "entity_name": "Iberdrola"},
+            {"clean_keyword": "SANTANDER CONSUMER", "entity_name": "Bauhaus"},
+            {"clean_keyword": "ABRACADABRA", "entity_name": "Abracadabra"},
+            {"clean_keyword": "ADRIVI", "entity_name": "Adrivi"},
+            {"clean_keyword": "AIRBNB", "entity_name": "Airbnb"},
+            {"clean_keyword": "ALCAMPO", "entity_name": "Alcampo"},
+            {"clean_keyword": "ALDI", "entity_name": "Aldi"},
+            {"clean_keyword": "ALIEXPRESS", "entity_name": "AliExpress"},
+            {"clean_keyword": "ALIPAY", "entity_name": "AliExpress"},
+            {"clean_keyword": "AMAZON", "entity_name": "Amazon"},
+            {"clean_keyword": "AMAZON*", "entity_name": "Amazon"},
+            {"clean_keyword": "AMAZON.ES", "entity_name": "Amazon"},
+            {"clean_keyword": "AMC", "entity_name": "AMC"},
+            {"clean_keyword": "AMZN MKTP", "entity_name": "Amazon"},
+            {"clean_keyword": "ARRE", "entity_name": "Arre"},
+            {"clean_keyword": "BABEL", "entity_name": "Babel"},
+            {"clean_keyword": "BASE TECHNOLOGY", "entity_name": "Basetis"},
+            {"clean_keyword": "BINANCE", "entity_name": "Binance"},
+            {"clean_keyword": "BON AREA", "entity_name": "Bon Àrea"},
+            {"clean_keyword": "BOOKING.COM", "entity_name": "Booking.com"},
+            {"clean_keyword": "BOTAVARA", "entity_name": "Botavara"},
+            {"clean_keyword": "CAFE DROMEDARIO", "entity_name": "Café Dromedario"},
+            {"clean_keyword": "CASA ELENA", "entity_name": "Casa Elena"},
+            {"clean_keyword": "CASA FRAN", "entity_name": "Casa Fran"},
+            {"clean_keyword": "CASA MINGUITO", "entity_name": "Casa Minguito"},
+            {"clean_keyword": "CASA PATACONA", "entity_name": "Casa Patacona"},
+            {"clean_keyword": "COINBASE", "entity_name": "Coinbase"},
+            {"clean_keyword": "COMPUCENTER", "entity_name": "Compucenter"},
+            {"clean_keyword": "CONSUM", "entity_name": "Consum"},
+            {"clean_keyword": "COOLMOD", "entity_name": "Coolmod"},
+            {"clean_keyword": "CUSTOM FIGHTER", "entity_name": "Custom Fighter"},
+            {"clean_keyword": "CONVERSION A TRY", "entity_name": "Disney+"},
+            {"clean_keyword": "DECATHLON", "entity_name": "Decathlon"},
+            {"clean_keyword": "DRUNI", "entity_name": "Druni"},
+            {"clean_keyword": "EASYPARK", "entity_name": "EasyPark"},
+            {"clean_keyword": "EL COLMADO", "entity_name": "El Colmado"},
+            {"clean_keyword": "EL CORTE INGLES", "entity_name": "El Corte Inglés"},
+            {"clean_keyword": "ELS SARIERS", "entity_name": "Els Sariers"},
+            {"clean_keyword": "ENDESA", "entity_name": "Endesa"},
+            {"clean_keyword": "FACSA", "entity_name": "Facsa"},
+            {"clean_keyword": "FARMACIA BALLESTER", "entity_name": "Farmacia Ballester Badenes"},
+            {"clean_keyword": "FARMAFEROLES", "entity_name": "Farmaferoles"},
+            {"clean_keyword": "FERRETERIA ESCRIG", "entity_name": "Ferreteria Escrig"},
+            {"clean_keyword": "FNAC", "entity_name": "Fnac"},
+            {"clean_keyword": "FRIGORIFICOS SANZ", "entity_name": "Frigorificos Sanz"},
+            {"clean_keyword": "FINLUX TECH", "entity_name": "Kucoin"},
+            {"clean_keyword": "G2A.COM", "entity_name": "G2A.com"},
+            {"clean_keyword": "GENERALI SEG", "entity_name": "Generali Seguros"},
+            {"clean_keyword": "GLOVO", "entity_name": "Glovo"},
+            {"clean_keyword": "GEOVAL", "entity_name": "GeoVal"},
+            {"clean_keyword": "GEOTECNIA", "entity_name": "GeoVal"},
+            {"clean_keyword": "GLOVAL VALUATION", "entity_name": " Tasaciones Inmobiliarias"},
+            {"clean_keyword": "GOVEE", "entity_name": "Govee"},
+            {"clean_keyword": "HELADOS LA JIJONENCA", "entity_name": "Helados La Jijonenca"},
+            {"clean_keyword": "HORCHATERIA IMA", "entity_name": "Horchateria Ima"},
+            {"clean_keyword": "IKEA", "entity_name": "Ikea"},
+            {"clean_keyword": "ITV", "entity_name": "Sitval ITV"},
+            {"clean_keyword": "IYZICO", "entity_name": "Turgame"},
+            {"clean_keyword": "JACK & JONES", "entity_name": "Jack & Jones"},
+            {"clean_keyword": "JALEO", "entity_name": "Jaleo"},
+            {"clean_keyword": "JAZZTEL", "entity_name": "Jazztel"},
+            {"clean_keyword": "JYSK", "entity_name": "Jysk"},
+            {"clean_keyword": "KEBAB HOUSE", "entity_name": "Kebab House"},
+            {"clean_keyword": "KEBAB TROYA", "entity_name": "Kebab Troya"},
+            {"clean_keyword": "KIWOKO", "entity_name": "Kiwoko"},
+            {"clean_keyword": "LA DAMA BLANCA", "entity_name": "La Dama Blanca"},
+            {"clean_keyword": "LA DOLCE VITA", "entity_name": "La Dolce Vita"},
+            {"clean_keyword": "LA GOLETA", "entity_name": "La Goleta"},
+            {"clean_keyword": "LA REDONA", "entity_name": "La Redona"},
+            {"clean_keyword": "LA SELECTA", "entity_name": "La Selecta"},
+            {"clean_keyword": "LA TERRACITA", "entity_name": "La Terracita"},
+            {"clean_keyword": "LA TOSTADORA", "entity_name": "La Tostadora"},
+            {"clean_keyword": "LACOLADACS", "entity_name": "La Colada CS"},
+            {"clean_keyword": "LE BLANC PELUQUERIA", "entity_name": "Le Blanc Peluquería"},
+            {"clean_keyword": "LEBLANC", "entity_name": "Le Blanc Peluquería"},
+            {"clean_keyword": "LEKUE", "entity_name": "Lekué"},
+            {"clean_keyword": "LEROY MERLIN", "entity_name": "Leroy Merlin"},
+            {"clean_keyword": "LIDL", "entity_name": "Lidl"},
+            {"clean_keyword": "LUCKIA", "entity_name": "Luckia"},
+            {"clean_keyword": "MAPFRE", "entity_name": "Mapfre Seguros"},
+            {"clean_keyword": "MEDIA MARKT", "entity_name": "Media Markt"},
+            {"clean_keyword": "MERCADONA", "entity_name": "Mercadona"},
+            {"clean_keyword": "MI.COM", "entity_name": "XiaoMi"},
+            {"clean_keyword": "MIRAVIA.ES", "entity_name": "Miravia"},
+            {"clean_keyword": "MUY MUCHO", "entity_name": "Muy Mucho"},
+            {"clean_keyword": "MYS Y MAS", "entity_name": "Mas y Mas"},
+            {"clean_keyword": "NETFLIX", "entity_name": "Netflix"},
+            {"clean_keyword": "NOVADELTA", "entity_name": "Cafés Delta"},
+            {"clean_keyword": "PANADERIA MATEU", "entity_name": "Els Ibarsos"},
+            {"clean_keyword": "PANADERIA MONICA", "entity_name": "Panadería Mónica"},
+            {"clean_keyword": "PCCOMPONENTES", "entity_name": "PcComponentes"},
+            {"clean_keyword": "PINGSINS", "entity_name": "Pingüins"},
+            {"clean_keyword": "PROZIS", "entity_name": "Prozis"},
+            {"clean_keyword": "PAYSAFE", "entity_name": "Binance"},
+            {"clean_keyword": "RENFE", "entity_name": "Renfe"},
+            {"clean_keyword": "RESTORE", "entity_name": "Restore"},
+            {"clean_keyword": "REVOLUT", "entity_name": "Revolut"},
+            {"clean_keyword": "ROAST MARKET", "entity_name": "Roast Market"},
+            {"clean_keyword": "RYANAIR", "entity_name": "Ryanair"},
+            {"clean_keyword": "SALT IN CAKE", "entity_name": "Salt in Cake"},
+            {"clean_keyword": "SAMSUNG", "entity_name": "Samsung"},
+            {"clean_keyword": "SANTA GLORIA", "entity_name": "Santa Gloria"},
+            {"clean_keyword": "SHADES OF COFFEE", "entity_name": "Shades of Coffee"},
+            {"clean_keyword": "SIROPE", "entity_name": "Sirope"},
+            {"clean_keyword": "SPAR", "entity_name": "Spar"},
+            {"clean_keyword": "SPOTIFY", "entity_name": "Spotify"},
+            {"clean_keyword": "TEATRO OLYMPIA", "entity_name": "Teatro Olympia"},
+            {"clean_keyword": "TELPARK", "entity_name": "Telpark"},
+            {"clean_keyword": "UDEMY", "entity_name": "Udemy"},
+            {"clean_keyword": "VETERINARIA R GUALLART", "entity_name": "Veterinaria R Guallart"},
+            {"clean_keyword": "VIVES", "entity_name": "Cafetería Vives"},
+            {"clean_keyword": "VERIFICACIONES", "entity_name": "Verificaciones y Certificaciones"},
+            {"clean_keyword": "WALLAPOP", "entity_name": "Wallapop"},
+            {"clean_keyword": "ZOOPLUS", "entity_name": "Zooplus"},
+            {"clean_keyword": "ZURICH", "entity_name": "Zurich Seguros"},
+            {"clean_keyword": "G2G", "entity_name": "g2g"},
+            {"clean_keyword": "OMOTON", "entity_name": "Omoton"},
+            {"clean_keyword": "BIZUM", "entity_name": "Bizum"}
+        ], "conflicts": [
+            {"type": "duplicate", "keyword": "EL CORTE INGLES", "kept": "El Corte Inglés", "dropped": "El Corte Inglés"},
+            {"type": "duplicate", "keyword": "NOVADELTA", "kept": "Cafés Delta", "dropped": "Cafés Delta"},
+            {"type": "duplicate", "keyword": "SPAR", "kept": "Spar", "dropped": "Spar"},
+            {"type": "duplicate", "keyword": "GOVEE", "kept": "Govee", "dropped": "Govee"}
+        ]}}) }}
+{% endmacro %}
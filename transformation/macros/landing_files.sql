@@ -0,0 +1,60 @@
+-- macros/landing_files.sql
+
+{% macro landing_files(table_name) %}
+    {#-
+        Predicado sobre _FILE_NAME para que un incremental de Bronze solo
+        escanee los objetos de GCS que pueden tener filas de la ventana o
+        filas nuevas: particiones compactadas cuyo max_fecha entra en
+        lookback_days o reescritas desde la última escritura de Bronze (un
+        mes antiguo que recibe un extracto tardío), según
+        bronze_raw.landing_manifest, que escribe ingestion/compaction.py, y
+        todos los deltas aún sin compactar, estén o no en el manifiesto.
+
+        Sin manifiesto, o si la tabla no aparece en él, no filtra nada.
+    -#}
+    {{- return(adapter.dispatch('landing_files')(table_name)) -}}
+{%- endmacro %}
+
+{% macro default__landing_files(table_name) %}1 = 1{% endmacro %}
+
+{% macro bigquery__landing_files(table_name) %}
+    {#- Fuera del if: así dbt registra la dependencia al parsear -#}
+    {%- set manifest = source('bronze_raw', 'landing_manifest') -%}
+    {%- if not execute -%}
+        {{- return('1 = 1') -}}
+    {%- endif -%}
+
+    {%- set relation = adapter.get_relation(
+        database=manifest.database, schema=manifest.schema, identifier=manifest.identifier
+    ) -%}
+    {%- if relation is none -%}
+        {{- return('1 = 1') -}}
+    {%- endif -%}
+
+    {%- set manifest_query -%}
+        SELECT
+            uri,
+            kind = 'compacted' AND (
+                CAST(max_fecha AS DATE) >= DATE_SUB(CURRENT_DATE(), INTERVAL {{ var('lookback_days') }} DAY)
+                OR CAST(updated_at AS TIMESTAMP) > ({{ last_modified_sql(this) }})
+            ) AS selected
+        FROM {{ manifest }}
+        WHERE table_name = '{{ table_name }}'
+    {%- endset -%}
+
+    {%- set rows = run_query(manifest_query).rows -%}
+    {%- if rows | length == 0 -%}
+        {{- return('1 = 1') -}}
+    {%- endif -%}
+
+    {#- Los deltas se leen siempre: los de una ingesta posterior al manifiesto aún no figuran -#}
+    {%- set predicate = "_FILE_NAME NOT LIKE '%/compacted/%'" -%}
+    {%- set uris = [] -%}
+    {%- for row in rows if row['selected'] -%}
+        {%- do uris.append("'" ~ row['uri'] ~ "'") -%}
+    {%- endfor -%}
+    {%- if uris | length == 0 -%}
+        {{- return(predicate) -}}
+    {%- endif -%}
+    {{- return('(' ~ predicate ~ ' OR _FILE_NAME IN (' ~ uris | join(', ') ~ '))') -}}
+{%- endmacro %}
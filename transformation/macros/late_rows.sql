@@ -0,0 +1,95 @@
+-- macros/late_rows.sql
+-- Filas que llegan con fecha anterior a la ventana de lookback (un extracto
+-- antiguo cargado tarde). La ventana solo acota lo que se RECALCULA: una fila
+-- nueva se inserta siempre, sea cual sea su fecha.
+
+{% macro not_in_target(column='hash_id', target_filter='1 = 1') %}
+    {#-
+        Predicado anti-join contra el propio modelo. El merge solo compara con
+        la ventana del destino (incremental_predicates), así que una fila de
+        fuera de ella solo puede entrar si aún no existe.
+    -#}
+    {{ column }} NOT IN (SELECT hash_id FROM {{ this }} WHERE {{ target_filter }})
+{%- endmacro %}
+
+
+{% macro late_months(source_relations) %}
+    {#-
+        Meses anteriores a la ventana en los que `source_relations` puede
+        tener filas que este modelo aún no tiene. Lista de 'YYYY-MM-01' (vacía
+        si no hay ninguno) o none si no se puede acotar: entonces se revisa
+        todo lo anterior a la ventana.
+    -#}
+    {%- if not is_incremental() or not execute -%}
+        {{- return([]) -}}
+    {%- endif -%}
+    {{- return(adapter.dispatch('late_months')(source_relations)) -}}
+{%- endmacro %}
+
+{% macro bigquery__late_months(source_relations) %}
+    {#- Particiones del origen modificadas desde la última escritura de este modelo -#}
+    {{- return(modified_partition_months(source_relations, last_modified_sql(this), before_window=true)) -}}
+{%- endmacro %}
+
+{% macro duckdb__late_months(source_relations) %}
+    {{- return(none) -}}
+{%- endmacro %}
+
+
+{% macro late_rows_filter(date_column, months) %}
+    {#- Filas de `months` fuera de la ventana que el modelo no tiene todavía -#}
+    {{ months_filter(date_column, months) }}
+      AND NOT ({{ lookback_window(date_column) }})
+      AND {{ not_in_target('hash_id', months_filter('fecha', months)) }}
+{%- endmacro %}
+
+
+{% macro partitions_table(relation) -%}
+    `{{ relation.database }}.{{ relation.schema }}.INFORMATION_SCHEMA.PARTITIONS`
+{%- endmacro %}
+
+
+{% macro last_modified_sql(relation) %}
+    {#-
+        Última escritura de `relation` según los metadatos de sus particiones,
+        con una hora de margen por si un objeto cambió mientras corría.
+    -#}
+    SELECT TIMESTAMP_SUB(
+        COALESCE(MAX(last_modified_time), TIMESTAMP '1970-01-02'), INTERVAL 1 HOUR
+    )
+    FROM {{ partitions_table(relation) }}
+    WHERE table_name = '{{ relation.identifier }}'
+{%- endmacro %}
+
+
+{% macro modified_partition_months(relations, since_sql, before_window=false) %}
+    {#-
+        Meses ('YYYY-MM-01') de las particiones mensuales de `relations`
+        modificadas después de `since_sql`. Solo lee INFORMATION_SCHEMA (sin
+        coste). Con before_window, solo los meses que empiezan antes de la
+        ventana de lookback.
+    -#}
+    {%- set partitions_query -%}
+        SELECT DISTINCT partition_id
+        FROM (
+            {%- for relation in relations %}
+            SELECT partition_id, last_modified_time
+            FROM {{ partitions_table(relation) }}
+            WHERE table_name = '{{ relation.identifier }}'
+            {% if not loop.last %}UNION ALL{% endif %}
+            {%- endfor %}
+        )
+        WHERE REGEXP_CONTAINS(partition_id, r'^[0-9]{6}$')
+          AND last_modified_time > ({{ since_sql }})
+          {%- if before_window %}
+          AND PARSE_DATE('%Y%m', partition_id) <= DATE_SUB(CURRENT_DATE(), INTERVAL {{ var('lookback_days') }} DAY)
+          {%- endif %}
+        ORDER BY partition_id
+    {%- endset -%}
+
+    {%- set months = [] -%}
+    {%- for row in run_query(partitions_query).rows -%}
+        {%- do months.append(row['partition_id'][:4] ~ '-' ~ row['partition_id'][4:] ~ '-01') -%}
+    {%- endfor -%}
+    {{- return(months) -}}
+{%- endmacro %}
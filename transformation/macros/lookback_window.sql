@@ -0,0 +1,19 @@
+-- macros/lookback_window.sql
+
+{% macro lookback_window(date_column) %}
+    {#-
+        Ventana de reproceso de los incrementales: solo se leen (y se fusionan)
+        las transacciones de los últimos `lookback_days` días. Para cargar un
+        extracto antiguo basta con ampliarla puntualmente:
+            dbt run --vars '{lookback_days: 3650}'
+    -#}
+    {{- return(adapter.dispatch('lookback_window')(date_column)) -}}
+{%- endmacro %}
+
+{% macro bigquery__lookback_window(date_column) %}
+    {{ date_column }} >= DATE_SUB(CURRENT_DATE(), INTERVAL {{ var('lookback_days') }} DAY)
+{%- endmacro %}
+
+{% macro duckdb__lookback_window(date_column) %}
+    {{ date_column }} >= CURRENT_DATE - INTERVAL {{ var('lookback_days') }} DAY
+{%- endmacro %}
@@ -0,0 +1,72 @@
+-- macros/manual_adjustments.sql
+
+{% macro adjusted_importe_personal(transaction, adjustment) %}
+    {#-
+        importe_personal con el ajuste manual (seed manual_lledo_adjustments)
+        aplicado. Lo usan Gold y sync_manual_adjustments(), así las dos vías
+        calculan lo mismo.
+    -#}
+    CASE
+        -- Caso especial: Ajuste manual en la liquidación de tarjeta compartida
+        -- Fórmula: (Importe Total Absoluto - Ajuste) / 2 * (-1 para que sea gasto)
+        WHEN {{ transaction }}.operativa_interna = 'Liquidación Tarjeta Compartida' AND {{ adjustment }}.hash_id IS NOT NULL
+            THEN (ABS({{ transaction }}.importe) - {{ adjustment }}.adjustment_amount) * 0.5 * -1
+
+        -- Por defecto, nos quedamos con lo que calculó Silver
+        ELSE {{ transaction }}.importe_personal
+    END
+{%- endmacro %}
+
+
+{% macro sync_manual_adjustments() %}
+    {#-
+        Post-hook de Gold. El merge solo recalcula la ventana de lookback; un
+        ajuste añadido, cambiado o borrado sobre una transacción más antigua
+        se aplica aquí con un UPDATE que sella _updated_at, para que los
+        agregados recalculen ese mes. Compara la columna ajuste_manual de Gold
+        con el seed y solo toca las filas que difieren, en sus meses.
+    -#}
+    {%- if not is_incremental() or not execute -%}
+        {{- return('') -}}
+    {%- endif -%}
+
+    {%- set adjustments = ref('manual_lledo_adjustments') -%}
+    {%- set months_query -%}
+        SELECT DISTINCT {{ format_year_month('g.fecha') }} AS anio_mes
+        FROM {{ this }} g
+        LEFT JOIN {{ adjustments }} a ON g.hash_id = a.hash_id
+        WHERE (g.ajuste_manual IS NOT NULL OR a.hash_id IS NOT NULL)
+          AND g.ajuste_manual IS DISTINCT FROM a.adjustment_amount
+          AND NOT ({{ lookback_window('g.fecha') }})
+        ORDER BY anio_mes
+    {%- endset -%}
+
+    {%- set months = [] -%}
+    {%- for row in run_query(months_query).rows -%}
+        {%- do months.append(row['anio_mes'] ~ '-01') -%}
+    {%- endfor -%}
+    {%- if months | length == 0 -%}
+        {{- return('') -}}
+    {%- endif -%}
+
+    {%- set update_sql -%}
+        UPDATE {{ this }} AS t
+        SET ajuste_manual = s.ajuste_manual,
+            importe_personal = s.importe_personal,
+            _updated_at = {{ dbt.current_timestamp() }}
+        FROM (
+            SELECT
+                f.hash_id,
+                a.adjustment_amount AS ajuste_manual,
+                {{ adjusted_importe_personal('f', 'a') }} AS importe_personal
+            FROM {{ ref('fct_transactions') }} f
+            LEFT JOIN {{ adjustments }} a ON f.hash_id = a.hash_id
+            WHERE {{ months_filter('f.fecha', months) }}
+        ) AS s
+        WHERE t.hash_id = s.hash_id
+          AND {{ months_filter('t.fecha', months) }}
+          AND NOT ({{ lookback_window('t.fecha') }})
+          AND t.ajuste_manual IS DISTINCT FROM s.ajuste_manual
+    {%- endset -%}
+    {{- return(update_sql) -}}
+{%- endmacro %}
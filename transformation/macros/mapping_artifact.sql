@@ -0,0 +1,17 @@
+-- macros/mapping_artifact.sql
+
+{% macro mapping_artifact(seed_name) %}
+    {#-
+        Reglas precompiladas (macros/generated/mapping_rules.sql) de un seed, solo
+        si el sha256 del artefacto coincide con el checksum del CSV que carga dbt.
+        Si el seed se editó sin regenerar el artefacto devuelve none y las macros
+        vuelven a consultar el seed en el warehouse.
+    -#}
+    {% set artifact = compiled_mapping_rules().get(seed_name) %}
+    {% set node = graph.nodes.get('seed.' ~ project_name ~ '.' ~ seed_name) %}
+    {% if artifact and node and node.checksum.checksum == artifact.sha256 %}
+        {{ return(artifact) }}
+    {% endif %}
+    {% do log("⚠️ Artefacto de reglas desactualizado para " ~ seed_name ~ ": se consulta el seed (python ingestion/rules_artifact.py)", info=true) %}
+    {{ return(none) }}
+{% endmacro %}
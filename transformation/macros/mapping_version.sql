@@ -0,0 +1,31 @@
+-- macros/mapping_version.sql
+
+{% macro mapping_version() %}
+    {#-
+        Huella del seed master_mapping. Debe coincidir con mapping_version() de
+        ingestion/categorizer.py: si la categoría precalculada en la ingesta se
+        hizo con otro mapeo, Silver la ignora y recalcula con la macro.
+    -#}
+    {% set version_query %}
+        SELECT keyword, priority, grupo_categoria, categoria, subcategoria, entity_name
+        FROM {{ ref('master_mapping') }}
+        ORDER BY priority ASC, keyword ASC
+    {% endset %}
+
+    {% if execute %}
+        {% set artifact = mapping_artifact('master_mapping') %}
+        {% if artifact %}
+            {{ return(artifact['version']) }}
+        {% endif %}
+        {% set lines = [] %}
+        {% for row in run_query(version_query) %}
+            {% set fields = [] %}
+            {% for value in row.values() %}
+                {% do fields.append((value | string | trim) if value is not none else '') %}
+            {% endfor %}
+            {% do lines.append(fields | join('|')) %}
+        {% endfor %}
+        {{ return(local_md5(lines | join('\n'))[:16]) }}
+    {% endif %}
+    {{ return('') }}
+{% endmacro %}
@@ -0,0 +1,24 @@
+-- macros/normalize_concepto.sql
+
+{% macro normalize_concepto(concepto_column) %}
+    {#-
+        Forma canónica para buscar keywords: mayúsculas, sin tildes ni diacríticos
+        y con los espacios colapsados. Se calcula UNA VEZ en Bronze (concepto_norm)
+        y es la misma que clean_text() de ingestion/categorizer.py.
+    -#}
+    {{- return(adapter.dispatch('normalize_concepto')(concepto_column)) -}}
+{%- endmacro %}
+
+{% macro bigquery__normalize_concepto(concepto_column) %}
+    TRIM(REGEXP_REPLACE(
+        REGEXP_REPLACE(NORMALIZE(UPPER({{ concepto_column }}), NFD), r'\pM', ''),
+        r'\s+', ' '
+    ))
+{%- endmacro %}
+
+{% macro duckdb__normalize_concepto(concepto_column) %}
+    TRIM(REGEXP_REPLACE(
+        STRIP_ACCENTS(UPPER({{ concepto_column }})),
+        '[\t\n\f\r ]+', ' ', 'g'
+    ))
+{%- endmacro %}
@@ -0,0 +1,92 @@
+-- macros/rollup_months.sql
+
+{% macro touched_months(source_relation) %}
+    {#-
+        Meses (primer día, 'YYYY-MM-01') con filas nuevas o modificadas en
+        `source_relation` desde la última ejecución del agregado: las que
+        tienen un _updated_at posterior al mayor _source_updated_at del
+        propio modelo. Gold solo sella _updated_at cuando una fila cambia (en
+        el merge de la ventana de lookback) y recategorize.py en las filas que
+        actualiza.
+
+        Devuelve none si el modelo se construye entero (primera ejecución o
+        --full-refresh) y una lista vacía si no hay nada que recalcular.
+    -#}
+    {%- if not is_incremental() -%}
+        {{- return(none) -}}
+    {%- endif -%}
+    {%- if not execute -%}
+        {{- return([]) -}}
+    {%- endif -%}
+    {{- return(adapter.dispatch('touched_months')(source_relation)) -}}
+{%- endmacro %}
+
+{% macro bigquery__touched_months(source_relation) %}
+    {#-
+        Primero los metadatos (sin coste): particiones de `source_relation`
+        modificadas después de la marca de agua. Solo esas se leen después
+        para buscar las filas con _updated_at nuevo.
+    -#}
+    {%- set candidates = modified_partition_months([source_relation], rollup_watermark()) -%}
+    {%- if candidates | length == 0 -%}
+        {{- return([]) -}}
+    {%- endif -%}
+    {{- return(months_with_updates(source_relation, months_filter('fecha', candidates))) -}}
+{%- endmacro %}
+
+{% macro duckdb__touched_months(source_relation) %}
+    {{- return(months_with_updates(source_relation, '1 = 1')) -}}
+{%- endmacro %}
+
+
+{% macro rollup_watermark() %}
+    SELECT COALESCE(MAX(_source_updated_at), CAST('1970-01-01' AS TIMESTAMP))
+    FROM {{ this }}
+{%- endmacro %}
+
+
+{% macro months_with_updates(source_relation, partition_filter) %}
+    {%- set months_query -%}
+        SELECT DISTINCT {{ format_year_month('fecha') }} AS anio_mes
+        FROM {{ source_relation }}
+        WHERE {{ partition_filter }}
+          AND _updated_at > ({{ rollup_watermark() }})
+        ORDER BY anio_mes
+    {%- endset -%}
+
+    {%- set months = [] -%}
+    {%- for row in run_query(months_query).rows -%}
+        {%- do months.append(row['anio_mes'] ~ '-01') -%}
+    {%- endfor -%}
+    {{- return(months) -}}
+{%- endmacro %}
+
+
+{% macro months_filter(date_column, months, through_today=false) %}
+    {#-
+        Predicado sobre `date_column` para los meses de touched_months() con
+        rangos de fechas constantes, para que BigQuery pode las particiones.
+        Con through_today se recalcula desde el primer mes tocado en adelante
+        (saldos acumulados: un mes cambiado arrastra a los siguientes).
+    -#}
+    {%- if months is none -%}
+        {{- return('1 = 1') -}}
+    {%- endif -%}
+    {%- if months | length == 0 -%}
+        {{- return('FALSE') -}}
+    {%- endif -%}
+    {%- if through_today -%}
+        {{- return(date_column ~ " >= DATE '" ~ months[0] ~ "'") -}}
+    {%- endif -%}
+
+    {%- set ranges = [] -%}
+    {%- for month in months -%}
+        {%- set year = month[:4] | int -%}
+        {%- set mon = month[5:7] | int -%}
+        {%- set next_month = '%04d-%02d-01' | format(year + mon // 12, mon % 12 + 1) -%}
+        {%- do ranges.append(
+            "(" ~ date_column ~ " >= DATE '" ~ month ~ "' AND " ~ date_column ~ " < DATE '" ~ next_month ~ "')"
+        ) -%}
+    {%- endfor -%}
+    {{- return('(' ~ ranges | join(' OR ') ~ ')') -}}
+{%- endmacro %}
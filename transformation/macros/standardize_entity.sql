@@ -1,18 +1,24 @@
 -- macros/standardize_entity.sql
 
-{% macro standardize_entity(concepto_column, fallback_value) %}
+{% macro standardize_entity(concepto_norm_column, fallback_value) %}
+    {#- concepto_norm_column debe venir ya normalizado (ver normalize_concepto) -#}
     CASE
+    {% if execute %}
+        {% set artifact = mapping_artifact('map_entities') %}
+    {% endif %}
     {% set entity_mapping_query %}
-        SELECT keyword, entity_name, priority
+        SELECT {{ normalize_concepto('keyword') }} as clean_keyword, entity_name, priority
         FROM {{ ref('map_entities') }}
-        ORDER BY priority ASC
+        ORDER BY priority ASC, keyword ASC
     {% endset %}
 
-    {% set entity_mappings = run_query(entity_mapping_query) %}
+    {% if execute %}
+        {% set entity_mappings = artifact['rules'] if artifact else run_query(entity_mapping_query) %}
+    {% endif %}
 
     {% if execute %}
         {% for row in entity_mappings %}
-            WHEN UPPER({{ concepto_column }}) LIKE '%{{ row['keyword'] | upper }}%' THEN '{{ row['entity_name'] }}'
+            WHEN {{ concepto_norm_column }} LIKE '%{{ row['clean_keyword'] }}%' THEN '{{ row['entity_name'] }}'
         {% endfor %}
     {% endif %}
 
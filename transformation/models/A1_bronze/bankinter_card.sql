@@ -2,22 +2,28 @@
   config(
     materialized = 'incremental',
     unique_key = 'hash_id',
+    partition_by = {'field': 'fecha', 'data_type': 'date', 'granularity': 'month'},
+    cluster_by = ['entidad', 'origen'],
     on_schema_change = 'sync_all_columns'
   )
 }}
 
 SELECT
     hash_id,
-    fecha,
+    CAST(fecha AS DATE) AS fecha,
     concepto,
+    {{ normalize_concepto('concepto') }} AS concepto_norm,
     importe,
     entidad,
-    origen
+    origen,
+    categoria_ingesta,
+    mapping_version
 FROM {{ source('bronze_raw', 'bankinter_card') }}
 
 {% if is_incremental() %}
-  WHERE hash_id NOT IN (
-    SELECT hash_id
-    FROM {{ this }}
-  )
+  -- Solo los objetos de GCS con filas de la ventana o nuevas (manifiesto de
+  -- compactación). La ventana acota lo que se vuelve a fusionar; una fila que
+  -- Bronze no tiene entra aunque su fecha sea anterior (extracto viejo cargado tarde)
+  WHERE {{ landing_files('bankinter_card') }}
+    AND ({{ lookback_window('CAST(fecha AS DATE)') }} OR {{ not_in_target() }})
 {% endif %}
\ No newline at end of file
@@ -2,38 +2,44 @@
   config(
     materialized = 'incremental',
     unique_key = 'hash_id',
+    partition_by = {'field': 'fecha', 'data_type': 'date', 'granularity': 'month'},
+    cluster_by = ['entidad', 'origen'],
     on_schema_change = 'sync_all_columns'
   )
 }}
 
 WITH raw_source AS (
     SELECT
-        SAFE_CAST(fecha AS DATE) as fecha,
+        {{ try_cast('fecha', 'DATE') }} as fecha,
         TRIM(concepto) as concepto,
-        SAFE_CAST(importe AS FLOAT64) as importe
+        {{ try_cast('importe', type_double()) }} as importe
     FROM {{ source('bronze_raw', 'cash') }}
     WHERE fecha IS NOT NULL AND importe IS NOT NULL
 ),
 
 final AS (
     SELECT
-        TO_HEX(SHA256(CONCAT(
-            CAST(fecha AS STRING), '-',
+        {{ sha256_hex("CONCAT(
+            CAST(fecha AS " ~ dbt.type_string() ~ "), '-',
             LOWER(TRIM(concepto)), '-',
-            FORMAT('%.2f', importe)
-        ))) as hash_id,
+            " ~ format_amount('importe') ~ "
+        )") }} as hash_id,
         fecha,
         concepto,
+        {{ normalize_concepto('concepto') }} as concepto_norm,
         importe,
         'Caja' as entidad,
-        'Cash' as origen
+        'Cash' as origen,
+        -- El efectivo no pasa por la ingesta: se categoriza en Silver con la macro
+        CAST(NULL AS {{ dbt.type_string() }}) as categoria_ingesta,
+        CAST(NULL AS {{ dbt.type_string() }}) as mapping_version
     FROM raw_source
 )
 
 SELECT * FROM final
 
 {% if is_incremental() %}
-  WHERE hash_id NOT IN (
-    SELECT hash_id FROM {{ this }}
-  )
+  -- La ventana reciente (el merge por hash_id evita duplicados) y las filas
+  -- anteriores que Bronze aún no tiene (apuntes de efectivo atrasados)
+  WHERE {{ lookback_window('fecha') }} OR {{ not_in_target() }}
 {% endif %}
\ No newline at end of file
@@ -0,0 +1,35 @@
+{{
+  config(
+    materialized = 'incremental',
+    unique_key = ['token', 'hash_id'],
+    partition_by = {'field': 'fecha', 'data_type': 'date', 'granularity': 'month'},
+    cluster_by = ['token'],
+    on_schema_change = 'sync_all_columns'
+  )
+}}
+
+{%- set late = late_months([ref('fct_transactions')]) %}
+
+-- Índice invertido palabra -> hash_id sobre concepto_norm. Lo usa
+-- ingestion/recategorize.py: busca las keywords cambiadas en concepto_vocabulary,
+-- y con las palabras que las contienen lee aquí solo los bloques de esas
+-- palabras (clustering por token) en vez de recorrer todo concepto_norm de Silver.
+-- Una transacción no cambia de concepto: en incremental solo entran las
+-- filas de la ventana y las antiguas que el índice aún no tiene.
+WITH transactions AS (
+    SELECT hash_id, fecha, concepto_norm
+    FROM {{ ref('fct_transactions') }}
+    {% if is_incremental() %}
+    WHERE {{ lookback_window('fecha') }}
+    {%- if late is none or late | length > 0 %}
+       OR ({{ late_rows_filter('fecha', late) }})
+    {%- endif %}
+    {% endif %}
+)
+
+SELECT DISTINCT
+    token,
+    hash_id,
+    fecha
+FROM transactions, {{ unnest_words('transactions.concepto_norm', 'token') }}
+WHERE token <> ''
@@ -0,0 +1,24 @@
+{{
+  config(
+    materialized = 'incremental',
+    unique_key = 'token',
+    incremental_predicates = [],
+    on_schema_change = 'sync_all_columns'
+  )
+}}
+
+{%- set late = late_months([ref('concepto_index')]) %}
+
+-- Palabras distintas de concepto_index. Es pequeña: recategorize.py recorre
+-- esta tabla (no el índice) para encontrar las palabras que contienen cada
+-- keyword, así que una keyword parcial ('MERCADON') también las encuentra.
+-- Sin fecha: el merge no lleva el predicado de ventana del proyecto.
+SELECT DISTINCT token
+FROM {{ ref('concepto_index') }}
+{% if is_incremental() %}
+WHERE ({{ lookback_window('fecha') }}
+    {%- if late is none or late | length > 0 %}
+       OR {{ months_filter('fecha', late) }}
+    {%- endif %})
+  AND token NOT IN (SELECT token FROM {{ this }})
+{% endif %}
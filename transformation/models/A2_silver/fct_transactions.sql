@@ -2,10 +2,18 @@
   config(
     materialized = 'incremental',
     unique_key = 'hash_id',
+    partition_by = {'field': 'fecha', 'data_type': 'date', 'granularity': 'month'},
+    cluster_by = ['entidad', 'origen', 'grupo'],
     on_schema_change = 'sync_all_columns'
   )
 }}
 
+{%- set bronze_models = [
+    ref('bankinter_account'), ref('bankinter_card'), ref('bankinter_shared'),
+    ref('revolut_account'), ref('cash')
+] %}
+{%- set late = late_months(bronze_models) %}
+
 -- 1. Unificar fuentes
 WITH all_sources AS (
     SELECT * FROM {{ ref('bankinter_account') }}
@@ -19,37 +27,59 @@ WITH all_sources AS (
     SELECT * FROM {{ ref('cash') }}
 ),
 
+-- En incremental solo se recalcula la ventana reciente (poda de particiones en Bronze);
+-- el merge actualiza esas filas, así que también recogen cambios del mapeo.
+-- Además entran las filas anteriores a la ventana que Silver aún no tiene
+-- (extractos viejos cargados tarde), buscadas solo en los meses de Bronze que han cambiado
+recent_sources AS (
+    SELECT * FROM all_sources
+    {% if is_incremental() %}
+    WHERE {{ lookback_window('fecha') }}
+    {%- if late is none or late | length > 0 %}
+    UNION ALL
+    SELECT * FROM all_sources
+    WHERE {{ late_rows_filter('fecha', late) }}
+    {%- endif %}
+    {% endif %}
+),
+
 -- 2. Enriquecimiento con Macro y Lógica Operativa
 enriched_transactions AS (
     SELECT
         hash_id,
         CAST(fecha AS DATE) AS fecha,
         concepto,
+        concepto_norm,
         importe,
         entidad,
         origen,
 
-        -- Llamada a la macro maestra UNA VEZ
+        -- Categoría precalculada en la ingesta si se hizo con el mapeo vigente;
+        -- si no (efectivo, histórico o seed cambiado), llamada a la macro maestra UNA VEZ
         -- Nos aseguramos de que importe no sea null para la macro
-        {{ categorize_transaction('concepto', 'COALESCE(importe, 0)') }} as _cat_string,
+        CASE
+            WHEN categoria_ingesta IS NOT NULL AND mapping_version = '{{ mapping_version() }}'
+                THEN categoria_ingesta
+            ELSE {{ categorize_transaction('concepto_norm', 'COALESCE(importe, 0)') }}
+        END as _cat_string,
 
         -- Detectar operativa interna
         CASE
             -- Liquidaciones de tarjeta
-            WHEN entidad = 'Bankinter' AND origen = 'Account' AND UPPER(concepto) LIKE '%RECIBO PLATINUM%' THEN 'Liquidación Tarjeta'
-            WHEN entidad = 'Bankinter' AND origen = 'Shared' AND UPPER(concepto) LIKE '%RECIBO VISA CLASICA%' THEN 'Liquidación Tarjeta Compartida'
+            WHEN entidad = 'Bankinter' AND origen = 'Account' AND concepto_norm LIKE '%RECIBO PLATINUM%' THEN 'Liquidación Tarjeta'
+            WHEN entidad = 'Bankinter' AND origen = 'Shared' AND concepto_norm LIKE '%RECIBO VISA CLASICA%' THEN 'Liquidación Tarjeta Compartida'
 
             -- Aportaciones periódicas
-            WHEN entidad = 'Bankinter' AND origen = 'Shared' AND UPPER(concepto) LIKE '%PABLO%' AND ABS(COALESCE(importe, 0)) IN (500, 750) THEN 'Aportación'
-            WHEN entidad = 'Bankinter' AND origen = 'Shared' AND UPPER(concepto) LIKE '%LLEDO%' AND ABS(COALESCE(importe, 0)) IN (500, 750) THEN 'Aportación Lledó'
+            WHEN entidad = 'Bankinter' AND origen = 'Shared' AND concepto_norm LIKE '%PABLO%' AND ABS(COALESCE(importe, 0)) IN (500, 750) THEN 'Aportación'
+            WHEN entidad = 'Bankinter' AND origen = 'Shared' AND concepto_norm LIKE '%LLEDO%' AND ABS(COALESCE(importe, 0)) IN (500, 750) THEN 'Aportación Lledó'
 
             -- Movimientos internos
-            WHEN UPPER(concepto) LIKE '%TRASPASO%' OR UPPER(concepto) LIKE '%TRANSFERENCIA INTERNA%' THEN 'Traspaso Interno'
-            WHEN UPPER(concepto) LIKE '%BIZUM%' THEN 'Bizum'
+            WHEN concepto_norm LIKE '%TRASPASO%' OR concepto_norm LIKE '%TRANSFERENCIA INTERNA%' THEN 'Traspaso Interno'
+            WHEN concepto_norm LIKE '%BIZUM%' THEN 'Bizum'
             ELSE 'Movimiento Regular'
         END AS operativa_interna
 
-    FROM all_sources
+    FROM recent_sources
 )
 
 -- 3. Proyección Final
@@ -58,24 +88,25 @@ SELECT
     fecha,
     EXTRACT(YEAR FROM fecha) AS anio,
     EXTRACT(MONTH FROM fecha) AS mes,
-    FORMAT_DATE('%Y-%m', fecha) AS anio_mes,
+    {{ format_year_month('fecha') }} AS anio_mes,
     EXTRACT(QUARTER FROM fecha) AS trimestre,
 
     concepto,
+    concepto_norm,
     importe, -- Importe TOTAL original
     entidad,
     origen,
     operativa_interna,
 
     -- Dimensiones Jerárquicas (Parseo seguro del string de la macro)
-    SPLIT(_cat_string, '|')[SAFE_OFFSET(0)] AS grupo,
-    SPLIT(_cat_string, '|')[SAFE_OFFSET(1)] AS categoria,
-    SPLIT(_cat_string, '|')[SAFE_OFFSET(2)] AS subcategoria,
+    {{ dbt.split_part('_cat_string', "'|'", 1) }} AS grupo,
+    {{ dbt.split_part('_cat_string', "'|'", 2) }} AS categoria,
+    {{ dbt.split_part('_cat_string', "'|'", 3) }} AS subcategoria,
 
     -- Nombre Limpio del Comercio
     CASE
-        WHEN SPLIT(_cat_string, '|')[SAFE_OFFSET(3)] = 'Desconocido' THEN INITCAP(concepto)
-        ELSE SPLIT(_cat_string, '|')[SAFE_OFFSET(3)]
+        WHEN {{ dbt.split_part('_cat_string', "'|'", 4) }} = 'Desconocido' THEN {{ initcap('concepto') }}
+        ELSE {{ dbt.split_part('_cat_string', "'|'", 4) }}
     END AS comercio,
 
     -- NUEVA COLUMNA BOOLEANA: ¿Es un gasto compartido?
@@ -101,8 +132,4 @@ SELECT
         ELSE TRUE
     END AS es_movimiento_real
 
-FROM enriched_transactions
-
-{% if is_incremental() %}
-  WHERE hash_id NOT IN (SELECT hash_id FROM {{ this }})
-{% endif %}
\ No newline at end of file
+FROM enriched_transactions
\ No newline at end of file
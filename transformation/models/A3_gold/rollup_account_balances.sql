@@ -0,0 +1,84 @@
+{{
+  config(
+    materialized = 'incremental',
+    incremental_strategy = 'insert_overwrite' if target.type == 'bigquery' else 'delete+insert',
+    unique_key = 'fecha_mes',
+    incremental_predicates = [],
+    partition_by = {'field': 'fecha_mes', 'data_type': 'date', 'granularity': 'month'},
+    cluster_by = ['entidad', 'origen'],
+    on_schema_change = 'sync_all_columns',
+    tags = ['rollup']
+  )
+}}
+
+-- Saldo acumulado por cuenta y mes (suma de movimientos desde el primer extracto).
+-- Un mes modificado cambia el saldo de todos los posteriores: en incremental se
+-- recalcula desde el primer mes tocado, partiendo del saldo ya guardado antes de él
+{% set months = touched_months(ref('transactions')) %}
+
+WITH monthly AS (
+    SELECT
+        CAST({{ dbt.date_trunc('month', 'fecha') }} AS DATE) AS fecha_mes,
+        anio_mes,
+        entidad,
+        origen,
+        COUNT(*) AS num_movimientos,
+        SUM(CASE WHEN importe > 0 THEN importe ELSE 0 END) AS ingresos,
+        SUM(CASE WHEN importe < 0 THEN importe ELSE 0 END) AS gastos,
+        SUM(COALESCE(importe, 0)) AS variacion,
+        MAX(_updated_at) AS _source_updated_at
+    FROM {{ ref('transactions') }}
+    WHERE {{ months_filter('fecha', months, through_today=true) }}
+    GROUP BY fecha_mes, anio_mes, entidad, origen
+),
+
+opening AS (
+    {% if months %}
+    SELECT
+        entidad,
+        origen,
+        saldo_cierre AS saldo_previo
+    FROM {{ this }}
+    WHERE fecha_mes < DATE '{{ months[0] }}'
+    QUALIFY ROW_NUMBER() OVER (PARTITION BY entidad, origen ORDER BY fecha_mes DESC) = 1
+    {% else %}
+    -- Construcción completa: todas las cuentas empiezan en cero
+    SELECT entidad, origen, 0 AS saldo_previo FROM monthly WHERE FALSE
+    {% endif %}
+),
+
+running AS (
+    SELECT
+        m.fecha_mes,
+        m.anio_mes,
+        m.entidad,
+        m.origen,
+        m.num_movimientos,
+        m.ingresos,
+        m.gastos,
+        m.variacion,
+        COALESCE(o.saldo_previo, 0) + SUM(m.variacion) OVER (
+            PARTITION BY m.entidad, m.origen
+            ORDER BY m.fecha_mes
+            ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW
+        ) AS saldo_cierre,
+        m._source_updated_at
+    FROM monthly m
+    LEFT JOIN opening o
+        ON m.entidad = o.entidad
+        AND m.origen = o.origen
+)
+
+SELECT
+    fecha_mes,
+    anio_mes,
+    entidad,
+    origen,
+    num_movimientos,
+    ingresos,
+    gastos,
+    variacion,
+    saldo_cierre - variacion AS saldo_apertura,
+    saldo_cierre,
+    _source_updated_at
+FROM running
@@ -0,0 +1,38 @@
+{{
+  config(
+    materialized = 'incremental',
+    incremental_strategy = 'insert_overwrite' if target.type == 'bigquery' else 'delete+insert',
+    unique_key = 'fecha_mes',
+    incremental_predicates = [],
+    partition_by = {'field': 'fecha_mes', 'data_type': 'date', 'granularity': 'month'},
+    cluster_by = ['grupo', 'categoria', 'origen'],
+    on_schema_change = 'sync_all_columns',
+    tags = ['rollup']
+  )
+}}
+
+-- Totales mensuales para el dashboard: en incremental solo se recalculan (y
+-- se sustituyen enteros) los meses con filas nuevas o modificadas en Gold
+{% set months = touched_months(ref('transactions')) %}
+
+SELECT
+    CAST({{ dbt.date_trunc('month', 'fecha') }} AS DATE) AS fecha_mes,
+    anio_mes,
+
+    grupo,
+    categoria,
+    comercio,
+    entidad,
+    origen,
+    es_movimiento_real, -- Mismo filtro que en Looker (WHERE es_movimiento_real = true)
+    es_compartido,
+
+    COUNT(*) AS num_movimientos,
+    SUM(importe) AS importe_total,
+    SUM(importe_personal) AS importe_personal,
+
+    MAX(_updated_at) AS _source_updated_at
+
+FROM {{ ref('transactions') }}
+WHERE {{ months_filter('fecha', months) }}
+GROUP BY fecha_mes, anio_mes, grupo, categoria, comercio, entidad, origen, es_movimiento_real, es_compartido
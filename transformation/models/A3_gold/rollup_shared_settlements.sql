@@ -0,0 +1,50 @@
+{{
+  config(
+    materialized = 'incremental',
+    incremental_strategy = 'insert_overwrite' if target.type == 'bigquery' else 'delete+insert',
+    unique_key = 'fecha_mes',
+    incremental_predicates = [],
+    partition_by = {'field': 'fecha_mes', 'data_type': 'date', 'granularity': 'month'},
+    on_schema_change = 'sync_all_columns',
+    tags = ['rollup']
+  )
+}}
+
+-- Liquidación mensual de la cuenta compartida: gasto común, la parte de cada uno
+-- (importe_personal ya incluye los ajustes manuales de Gold) y las aportaciones
+{% set months = touched_months(ref('transactions')) %}
+
+WITH monthly AS (
+    SELECT
+        CAST({{ dbt.date_trunc('month', 'fecha') }} AS DATE) AS fecha_mes,
+        anio_mes,
+        SUM(CASE WHEN es_compartido AND es_movimiento_real THEN 1 ELSE 0 END) AS num_gastos_compartidos,
+        SUM(CASE WHEN es_compartido AND es_movimiento_real THEN importe ELSE 0 END) AS gasto_compartido,
+        SUM(CASE WHEN es_compartido AND es_movimiento_real THEN importe_personal ELSE 0 END) AS parte_propia,
+        SUM(CASE WHEN operativa_interna = 'Aportación' THEN importe ELSE 0 END) AS aportacion_propia,
+        SUM(CASE WHEN operativa_interna = 'Aportación Lledó' THEN importe ELSE 0 END) AS aportacion_lledo,
+        MAX(_updated_at) AS _source_updated_at
+    FROM {{ ref('transactions') }}
+    WHERE origen = 'Shared'
+      AND {{ months_filter('fecha', months) }}
+    GROUP BY fecha_mes, anio_mes
+)
+
+SELECT
+    fecha_mes,
+    anio_mes,
+    num_gastos_compartidos,
+    gasto_compartido,
+    parte_propia,
+    gasto_compartido - parte_propia AS parte_lledo,
+    aportacion_propia,
+    aportacion_lledo,
+
+    -- Lo aportado menos la parte del gasto que le toca (los gastos son negativos)
+    aportacion_propia + parte_propia AS balance_propio,
+    aportacion_lledo + (gasto_compartido - parte_propia) AS balance_lledo,
+    -- Positivo: Lledó debe esa cantidad para igualar; negativo: se le debe a ella
+    ((aportacion_propia + parte_propia) - (aportacion_lledo + gasto_compartido - parte_propia)) / 2 AS liquidacion,
+
+    _source_updated_at
+FROM monthly
@@ -1,11 +1,35 @@
 {{
   config(
-    materialized = 'table'
+    materialized = 'incremental',
+    unique_key = 'hash_id',
+    partition_by = {'field': 'fecha', 'data_type': 'date', 'granularity': 'month'},
+    cluster_by = ['entidad', 'origen', 'grupo'],
+    on_schema_change = 'sync_all_columns',
+    post_hook = "{{ sync_manual_adjustments() }}"
   )
 }}
 
+-- Columnas que, si cambian, cuentan como modificación de la fila (_updated_at)
+{%- set tracked_columns = [
+    'fecha', 'anio', 'mes', 'anio_mes', 'trimestre', 'concepto', 'importe', 'comercio',
+    'grupo', 'categoria', 'subcategoria', 'entidad', 'origen', 'operativa_interna',
+    'es_movimiento_real', 'es_compartido', 'importe_personal', 'ajuste_manual'
+] %}
+{%- set late = late_months([ref('fct_transactions')]) %}
+
 WITH base AS (
     SELECT * FROM {{ ref('fct_transactions') }}
+    {% if is_incremental() %}
+    -- Misma ventana que Silver (los ajustes manuales más antiguos los aplica el
+    -- post-hook sync_manual_adjustments) y las filas anteriores a la ventana que
+    -- Gold aún no tiene (extractos tardíos)
+    WHERE {{ lookback_window('fecha') }}
+    {%- if late is none or late | length > 0 %}
+    UNION ALL
+    SELECT * FROM {{ ref('fct_transactions') }}
+    WHERE {{ late_rows_filter('fecha', late) }}
+    {%- endif %}
+    {% endif %}
 ),
 
 adjustments AS (
@@ -17,48 +41,77 @@ final_enrichment AS (
         b.*,
         -- Recalculamos el importe personal SOLO si hay un ajuste manual específico (seed).
         -- Si no hay ajuste, confiamos en el cálculo estándar que ya viene de Silver.
-        CASE
-            -- Caso especial: Ajuste manual en la liquidación de tarjeta compartida
-            -- Fórmula: (Importe Total Absoluto - Ajuste) / 2 * (-1 para que sea gasto)
-            WHEN b.operativa_interna = 'Liquidación Tarjeta Compartida' AND a.hash_id IS NOT NULL
-                THEN (ABS(b.importe) - a.adjustment_amount) * 0.5 * -1
-
-            -- Por defecto, nos quedamos con lo que calculó Silver
-            ELSE b.importe_personal
-        END AS importe_personal_final
+        {{ adjusted_importe_personal('b', 'a') }} AS importe_personal_final,
+        a.adjustment_amount AS ajuste_manual
     FROM base b
     LEFT JOIN adjustments a ON b.hash_id = a.hash_id
-)
+),
 
-SELECT
-    -- Identificadores
-    hash_id,
+enriched AS (
+    SELECT
+        -- Identificadores
+        hash_id,
+
+        -- Dimensiones Temporales (Clave para Time Series)
+        fecha,
+        anio,
+        mes,
+        anio_mes,
+        trimestre,
+
+        -- Detalles de la Transacción
+        concepto,
+        importe,        -- Importe TOTAL original
+        comercio,       -- Nombre limpio (ej: Mercadona)
 
-    -- Dimensiones Temporales (Clave para Time Series)
-    fecha,
-    anio,
-    mes,
-    anio_mes,
-    trimestre,
+        -- Categorización Jerárquica (Tu "Santo Grial" para el Dashboard)
+        grupo,          -- Nivel 1: Gastos Fijos, Variables...
+        categoria,      -- Nivel 2: Supermercado, Vivienda...
+        subcategoria,   -- Nivel 3: Luz, Agua, Hipoteca...
 
-    -- Detalles de la Transacción
-    concepto,
-    importe,        -- Importe TOTAL original
-    comercio,       -- Nombre limpio (ej: Mercadona)
+        -- Dimensiones de Origen
+        entidad,        -- Banco (ej: Bankinter)
+        origen,         -- Producto (ej: Card, Shared)
 
-    -- Categorización Jerárquica (Tu "Santo Grial" para el Dashboard)
-    grupo,          -- Nivel 1: Gastos Fijos, Variables...
-    categoria,      -- Nivel 2: Supermercado, Vivienda...
-    subcategoria,   -- Nivel 3: Luz, Agua, Hipoteca...
+        -- Lógica Operativa
+        operativa_interna,  -- Para saber si es Liquidación, Bizum, etc.
+        es_movimiento_real, -- ¡IMPORTANTE! Usar esto como filtro en Looker (WHERE es_movimiento_real = true)
+        es_compartido,     -- ¿Es un gasto compartido?
+        importe_personal_final AS importe_personal, -- Tu gasto real (Esta es la columna que sumarás en los gráficos)
+        ajuste_manual       -- Ajuste del seed aplicado (NULL si no hay)
 
-    -- Dimensiones de Origen
-    entidad,        -- Banco (ej: Bankinter)
-    origen,         -- Producto (ej: Card, Shared)
+    FROM final_enrichment
+)
 
-    -- Lógica Operativa
-    operativa_interna,  -- Para saber si es Liquidación, Bizum, etc.
-    es_movimiento_real, -- ¡IMPORTANTE! Usar esto como filtro en Looker (WHERE es_movimiento_real = true)
-    es_compartido,     -- ¿Es un gasto compartido?
-    importe_personal_final AS importe_personal -- Tu gasto real (Esta es la columna que sumarás en los gráficos)
+{% if is_incremental() %}
+{#- Columnas nuevas (p. ej. recién añadidas) aún no existen en la tabla: no se comparan -#}
+{%- set existing_columns = adapter.get_columns_in_relation(this) | map(attribute='name') | map('lower') | list %}
+{%- set compared_columns = tracked_columns | select('in', existing_columns) | list %}
+, previous AS (
+    -- Lo ya guardado de la misma ventana (el merge no toca nada fuera de ella)
+    SELECT hash_id, {{ (compared_columns + ['_updated_at']) | join(', ') }}
+    FROM {{ this }}
+    WHERE {{ lookback_window('fecha') }}
+)
+{% endif %}
 
-FROM final_enrichment
\ No newline at end of file
+SELECT
+    e.*,
+    -- Marca de la última modificación: los agregados mensuales recalculan sus meses.
+    -- Una fila que el merge reescribe sin cambios conserva la marca anterior
+    {% if is_incremental() %}
+    CASE
+        WHEN p.hash_id IS NOT NULL
+            {%- for column in compared_columns %}
+            AND e.{{ column }} IS NOT DISTINCT FROM p.{{ column }}
+            {%- endfor %}
+            THEN p._updated_at
+        ELSE {{ dbt.current_timestamp() }}
+    END AS _updated_at
+    {% else %}
+    {{ dbt.current_timestamp() }} AS _updated_at
+    {% endif %}
+FROM enriched e
+{% if is_incremental() %}
+LEFT JOIN previous p ON e.hash_id = p.hash_id
+{% endif %}
\ No newline at end of file
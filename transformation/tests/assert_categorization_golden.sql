@@ -0,0 +1,16 @@
+-- La macro categorize_transaction debe dar exactamente lo esperado en el set
+-- dorado (el mismo que valida `python ingestion/categorizer.py check`).
+-- Cualquier fila devuelta es un fallo.
+
+WITH golden AS (
+    SELECT
+        concepto,
+        CAST(importe AS {{ type_double() }}) AS importe,
+        expected,
+        {{ categorize_transaction(normalize_concepto('concepto'), 'CAST(importe AS ' ~ type_double() ~ ')') }} AS actual
+    FROM {{ ref('categorization_golden') }}
+)
+
+SELECT *
+FROM golden
+WHERE actual != expected